@@ -6,7 +6,10 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('src', 'src'), ('.streamlit', '.streamlit')],
-    hiddenimports=[],
+    # Page modules are imported by src/app.py on first navigation, out of sight of the analysis;
+    # openpyxl is only loaded by pandas when an Excel file is read
+    hiddenimports=['src.ui.dashboard', 'src.ui.client_view', 'src.ui.transaction_view',
+                   'src.ui.calendar_view', 'src.ui.report_view', 'openpyxl'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -6,7 +6,7 @@ rem Check if Python is installed
 python --version >nul 2>&1
 if %ERRORLEVEL% neq 0 (
     echo Error: Python is not installed or not in PATH.
-    echo Please install Python 3.8+ and try again.
+    echo Please install Python 3.10+ and try again.
     pause
     exit /b 1
 )
@@ -14,7 +14,7 @@ if %ERRORLEVEL% neq 0 (
 rem Install all required packages globally
 echo Installing required packages...
 python -m pip install --upgrade pip
-python -m pip install streamlit==1.31.0 streamlit-extras==0.3.6 pyinstaller==6.3.0 importlib-metadata pandas plotly altair openpyxl xlsxwriter
+python -m pip install streamlit==1.65.0 streamlit-extras==0.5.5 pyinstaller==6.3.0 importlib-metadata pandas plotly altair openpyxl xlsxwriter
 
 rem Ensure data directories exist
 if not exist "data\storage" (
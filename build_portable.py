@@ -33,6 +33,11 @@ def create_executable(one_file=False, console=True):
     pyinstaller_cmd.append("--hidden-import=streamlit")
     pyinstaller_cmd.append("--hidden-import=streamlit.runtime")
     
+    # Page modules are imported by src/app.py on first navigation, out of sight of the analysis
+    for module in ["dashboard", "client_view", "transaction_view", "calendar_view", "report_view"]:
+        pyinstaller_cmd.append(f"--hidden-import=src.ui.{module}")
+    pyinstaller_cmd.append("--hidden-import=openpyxl")
+    
     # Get site-packages directory
     site_packages = site.getsitepackages()[0]
     print(f"Using site packages path: {site_packages}")
@@ -13,8 +13,8 @@ import importlib.machinery
 class MetadataFinder(importlib.abc.MetaPathFinder):
     def __init__(self):
         self.packages = {
-            'streamlit': '1.31.0',  # Set this to the version you're using
-            'streamlit-extras': '0.3.6',
+            'streamlit': '1.65.0',  # Set this to the version you're using
+            'streamlit-extras': '0.5.5',
             'altair': '5.2.0',
             'pandas': '2.2.0',
             'numpy': '1.26.3',
@@ -44,7 +44,7 @@ def install_dependencies():
     # Create a temporary requirements file
     with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as temp:
         temp.write("streamlit-extras\n")
-        temp.write("streamlit>=1.12.0\n")
+        temp.write("streamlit>=1.51.0\n")
         temp.write("pandas>=1.3.0\n")
         temp.write("openpyxl>=3.0.0\n")
         temp.write("plotly>=5.3.0\n")
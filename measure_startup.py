@@ -0,0 +1,101 @@
+"""
+Measure the import cost of the Interest Calendar Ledger at startup.
+Every measurement runs in a fresh Python process, so nothing is cached between them.
+The script reports the time to import the app module, the extra time each page
+adds when it is first opened, and the time it would take to import every page at startup.
+The last figure is what startup cost before the pages were loaded lazily.
+
+Usage:
+    python measure_startup.py [--runs N]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Page modules as imported by src/app.py on first navigation
+PAGE_MODULES = {
+    "Dashboard": "src.ui.dashboard",
+    "Clients": "src.ui.client_view",
+    "Transactions": "src.ui.transaction_view",
+    "Calendars": "src.ui.calendar_view",
+    "Reports": "src.ui.report_view",
+}
+
+# Large libraries worth knowing about if they are imported at startup
+HEAVY_LIBRARIES = ["altair", "plotly", "openpyxl", "xlsxwriter"]
+
+TIMING_SCRIPT = """
+import sys, time, json, importlib
+start = time.perf_counter()
+for name in {preload!r}:
+    importlib.import_module(name)
+loaded = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+done = time.perf_counter()
+print(json.dumps({{
+    "preload": loaded - start,
+    "modules": done - loaded,
+    "heavy": [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+
+def time_imports(modules, preload=(), runs=3):
+    """
+    Time importing modules in fresh processes.
+
+    Args:
+        modules: Module names whose import is timed
+        preload: Module names imported first, outside the timing of modules
+        runs: Number of processes to take the median over
+
+    Returns:
+        dict: Median 'preload' and 'modules' seconds, and the 'heavy' libraries loaded
+    """
+    script = TIMING_SCRIPT.format(preload=list(preload), modules=list(modules), heavy=HEAVY_LIBRARIES)
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        "preload": statistics.median(r["preload"] for r in results),
+        "modules": statistics.median(r["modules"] for r in results),
+        "heavy": results[-1]["heavy"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup import cost of the ledger app")
+    parser.add_argument("--runs", type=int, default=3, help="processes per measurement (median is reported)")
+    args = parser.parse_args()
+
+    # Streamlit itself is loaded before the app in any case, so it is timed separately
+    startup = time_imports(["src.app"], preload=["streamlit"], runs=args.runs)
+    print(f"streamlit:                      {startup['preload'] * 1000:8.0f} ms")
+    print(f"src.app (startup):              {startup['modules'] * 1000:8.0f} ms")
+    print(f"  heavy libraries loaded:       {', '.join(startup['heavy']) or 'none'}")
+
+    print("\nFirst navigation to each page, after startup:")
+    for page, module in PAGE_MODULES.items():
+        page_cost = time_imports([module], preload=["streamlit", "src.app"], runs=args.runs)
+        print(f"  {page:<28}  {page_cost['modules'] * 1000:8.0f} ms")
+
+    eager = time_imports(["src.app"] + list(PAGE_MODULES.values()), preload=["streamlit"], runs=args.runs)
+    print(f"\nsrc.app with every page (eager): {eager['modules'] * 1000:6.0f} ms")
+    print(f"  heavy libraries loaded:       {', '.join(eager['heavy']) or 'none'}")
+    print(f"Saved at startup:               {(eager['modules'] - startup['modules']) * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,35 +3,52 @@ Main application module for the Interest Calendar Ledger.
 This module serves as the entry point for the Streamlit application.
 """
 
+import importlib
 import streamlit as st
 from datetime import datetime
 from streamlit_extras.colored_header import colored_header
 
 # Import utility functions
-from .utils.helpers import load_custom_css
+from .utils.styles import page_key, apply_styles
 
 # Import data loaders
-from .data.data_loader import (
-    load_interest_calendars,
-    load_clients,
-    load_transactions,
-    save_transactions
-)
+from .data.data_loader import load_interest_calendars, StaleDataError
 
 # Import services
 from .services.interest_service import InterestService
+from .services.ledger_service import summarize_clients
+from .services.ledger_cache import get_shared_ledger, invalidate_shared_ledger
 
-# Import UI components
-from .ui.dashboard import display_dashboard
-from .ui.client_view import client_management, edit_client
-from .ui.transaction_view import transactions_section
-from .ui.calendar_view import display_interest_calendars_tab
-from .ui.report_view import display_report_view
+# UI components are imported on first navigation to their page, so startup only
+# pays for the page shown first: page -> (module in src.ui, view function)
+PAGE_VIEWS = {
+    "dashboard": ("dashboard", "display_dashboard"),
+    "clients": ("client_view", "client_management"),
+    "transactions": ("transaction_view", "transactions_section"),
+    "calendars": ("calendar_view", "display_interest_calendars_tab"),
+    "reports": ("report_view", "display_report_view"),
+    "edit_client": ("client_view", "edit_client"),
+}
+
+def page_view(page):
+    """
+    Get the view function of a page, importing its module the first time.
+    
+    Args:
+        page: Page name, a key of PAGE_VIEWS
+        
+    Returns:
+        function: The function that renders the page
+    """
+    module_name, function_name = PAGE_VIEWS[page]
+    module = importlib.import_module(f".ui.{module_name}", __package__)
+    return getattr(module, function_name)
 
 def main():
     """Main application entry point."""
-    # Apply custom CSS
-    load_custom_css()
+    # Custom CSS goes in a placeholder at the top; it is added once the page is
+    # rendered, so the fragments registered by the page's module are included
+    styles_slot = st.empty()
     
     # Initialize session state for navigation if not already set
     if 'page' not in st.session_state:
@@ -71,20 +88,14 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Load data
+    # Load data; the clients, transactions and their indexes are shared by all sessions
     interest_calendars = load_interest_calendars()
-    clients_data = load_clients()
-    transactions_data = load_transactions()
     
     # Initialize services
     interest_service = InterestService(interest_calendars)
     
-    # Recalculate all transaction interest values when the app starts
-    with st.spinner("Updating calculations..."):
-        updated_transactions = interest_service.recalculate_all_transaction_interest(transactions_data)
-        if updated_transactions != transactions_data:
-            save_transactions(updated_transactions)
-            transactions_data = updated_transactions
+    # Interest is recalculated on load for transactions whose inputs or calendar dates changed
+    clients_data, transactions_data, ledger = get_shared_ledger(interest_service, interest_calendars)
     
     # Side menu with icon buttons - updated for light theme
     col_menu, col_content = st.columns([1, 5])
@@ -118,7 +129,7 @@ def main():
                     # Remember the client for filter before clearing view_client_transactions
                     if "transaction_filter_client" not in st.session_state:
                         client_id = st.session_state.view_client_transactions
-                        client_name = next((c["name"] for c in clients_data["clients"] if c["id"] == client_id), "All Clients")
+                        client_name = ledger.client_name(client_id, "All Clients")
                         st.session_state.transaction_filter_client = client_name
                         
                     # Clear navigation states but not filter states
@@ -158,24 +169,38 @@ def main():
             st.session_state.nav_changed = False
             st.rerun()
     
-    # Main content area - wrapped in a container for better styling
-    with col_content:
-        if st.session_state.page == "dashboard":
-            display_dashboard(transactions_data, clients_data, interest_calendars)
-        elif st.session_state.page == "clients":
-            client_management(clients_data, transactions_data, interest_calendars)
-        elif st.session_state.page == "transactions":
-            # Set the active tab to "All Transactions" when viewing client transactions
-            if st.session_state.get("view_client_transactions") is not None:
-                st.session_state.active_tab = "all_transactions"
+    # Main content area - wrapped in a container for better styling; its key lets
+    # style fragments be limited to the page
+    with col_content, st.container(key=page_key(st.session_state.page)):
+        try:
+            if st.session_state.page == "dashboard":
+                page_view("dashboard")(transactions_data, clients_data, interest_calendars, ledger)
+            elif st.session_state.page == "clients":
+                page_view("clients")(clients_data, transactions_data, interest_calendars, ledger)
+            elif st.session_state.page == "transactions":
+                # Set the active tab to "All Transactions" when viewing client transactions
+                if st.session_state.get("view_client_transactions") is not None:
+                    st.session_state.active_tab = "all_transactions"
             
-            transactions_section(transactions_data, clients_data, interest_calendars, interest_service)
-        elif st.session_state.page == "calendars":
-            display_interest_calendars_tab(interest_calendars, interest_service)
-        elif st.session_state.page == "reports":
-            display_report_view(transactions_data, clients_data, interest_calendars)
-        elif st.session_state.page == "edit_client":
-            edit_client(clients_data, transactions_data, interest_calendars)
+                page_view("transactions")(transactions_data, clients_data, interest_calendars, interest_service, ledger)
+            elif st.session_state.page == "calendars":
+                page_view("calendars")(interest_calendars, interest_service, ledger)
+            elif st.session_state.page == "reports":
+                # Per-client totals and latest rates for the report, aggregated in one pass
+                client_summary = summarize_clients(clients_data, transactions_data)
+                page_view("reports")(transactions_data, clients_data, interest_calendars, client_summary, ledger)
+            elif st.session_state.page == "edit_client":
+                page_view("edit_client")(clients_data, transactions_data, interest_calendars, ledger)
+        except StaleDataError as e:
+            # Saving over changes made in another session would lose them; the shared
+            # copy may hold the rejected change, so it is reloaded
+            invalidate_shared_ledger()
+            st.error(f"⚠️ {e}")
+            if st.button("🔄 Reload latest data", key="reload_after_conflict"):
+                st.rerun()
+    
+    with styles_slot:
+        apply_styles()
 
 if __name__ == "__main__":
     main()
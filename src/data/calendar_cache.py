@@ -0,0 +1,145 @@
+"""
+Binary sidecar cache for interest calendar CSV files.
+A parsed calendar is stored as a NumPy .npz file next to its CSV, holding
+day ordinals and shadow values as compact integer arrays. The sidecar records
+the hash of the CSV it was built from and is only used while that hash still
+matches, so the CSV remains the source of truth.
+"""
+
+import os
+import io
+import json
+import numpy as np
+import pandas as pd
+
+# Bump when the sidecar layout changes so old sidecars are rebuilt
+SIDECAR_VERSION = 1
+
+SIDECAR_DIR_NAME = ".cache"
+
+
+def sidecar_path(csv_path):
+    """
+    Get the sidecar file for a calendar CSV.
+
+    Args:
+        csv_path: Path to the calendar CSV file
+
+    Returns:
+        str: Path to the .npz sidecar in the .cache folder next to the CSV
+    """
+    directory, filename = os.path.split(csv_path)
+    return os.path.join(directory, SIDECAR_DIR_NAME, f"{filename}.npz")
+
+
+def _pack_column(series):
+    """
+    Convert a column to a compact array that can be stored without pickling.
+
+    Returns:
+        numpy.ndarray: The packed values, or None if the column can't be stored
+    """
+    if series.isna().any():
+        return None
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        ordinals = series.to_numpy(dtype='datetime64[D]').astype(np.int64)
+        return ordinals.astype(np.int32)
+
+    if pd.api.types.is_integer_dtype(series):
+        values = series.to_numpy()
+        for dtype in (np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+                return values.astype(dtype)
+        return values
+
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series.to_numpy()
+
+    if pd.api.types.is_string_dtype(series) and all(isinstance(value, str) for value in series):
+        return series.to_numpy(dtype=str)
+
+    return None
+
+
+def _unpack_column(values, dtype):
+    """Convert a stored array back to column values of the original dtype."""
+    if dtype.startswith('datetime64'):
+        return values.astype('datetime64[D]').astype(dtype)
+    if values.dtype.kind == 'U':
+        return pd.array(values, dtype=dtype)
+    return values.astype(dtype)
+
+
+def load_sidecar(csv_path, digest):
+    """
+    Load a parsed calendar from its sidecar if the sidecar matches the CSV.
+
+    Args:
+        csv_path: Path to the calendar CSV file
+        digest: SHA-1 hex digest of the CSV file's current contents
+
+    Returns:
+        DataFrame: The calendar as parsed from the CSV, or None if there is no fresh sidecar
+    """
+    path = sidecar_path(csv_path)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as sidecar:
+            meta = json.loads(str(sidecar['meta']))
+            if meta.get('version') != SIDECAR_VERSION or meta.get('hash') != digest:
+                return None
+
+            columns = {}
+            for index, (column, dtype) in enumerate(zip(meta['columns'], meta['dtypes'])):
+                columns[column] = _unpack_column(sidecar[f"c{index}"], dtype)
+        return pd.DataFrame(columns)
+    except Exception:
+        # A damaged or unreadable sidecar just means parsing the CSV again
+        return None
+
+
+def write_sidecar(csv_path, digest, df):
+    """
+    Write the sidecar for a parsed calendar.
+    Nothing is written if a column can't be stored exactly, and write failures
+    (e.g. a read-only install folder) are ignored since the sidecar is optional.
+
+    Args:
+        csv_path: Path to the calendar CSV file
+        digest: SHA-1 hex digest of the CSV file the DataFrame was parsed from
+        df: The parsed calendar DataFrame
+
+    Returns:
+        bool: True if the sidecar was written
+    """
+    arrays = {}
+    for index, column in enumerate(df.columns):
+        packed = _pack_column(df[column])
+        if packed is None:
+            return False
+        arrays[f"c{index}"] = packed
+
+    meta = {
+        'version': SIDECAR_VERSION,
+        'hash': digest,
+        'columns': [str(column) for column in df.columns],
+        'dtypes': [str(dtype) for dtype in df.dtypes]
+    }
+    arrays['meta'] = np.array(json.dumps(meta))
+
+    path = sidecar_path(csv_path)
+    temp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        with open(temp_path, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,207 @@
+"""
+Compact columnar layout for the transactions file of the Interest Calendar Ledger application.
+Transactions are stored as one list per field instead of one object per row.
+Dates are stored as day ordinals and calendar types and timestamps as codes
+into a table of their distinct values. Amounts in words are left out: read
+transactions carry no 'amount_in_words' and the text is derived from the
+amount where it is shown. Reading the row-per-object JSON layout keeps
+working, so both layouts can be read whichever one is written.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from . import file_store
+from ..services.calendar_lookup import to_day_ordinals
+from ..utils.helpers import num_to_words_rupees_batch
+
+# Layout transaction files are written in: "json" (default, one object per transaction) or "columnar"
+TRANSACTIONS_FORMAT = os.environ.get("LEDGER_TRANSACTIONS_FORMAT", "json").strip().lower()
+
+FORMAT_NAME = "columnar-transactions"
+FORMAT_VERSION = 1
+
+# Fields stored as columns, in the order transactions are created in
+COLUMNS = ["id", "client_id", "date", "received", "paid", "interest_rate",
+           "calendar_type", "days", "interest", "notes", "timestamp"]
+
+# Derived field, only stored for transactions whose text differs from the derived one
+WORDS_FIELD = "amount_in_words"
+
+# Fields with few distinct values, stored as codes into a table of those values
+CODED_COLUMNS = ("calendar_type", "timestamp")
+
+
+def is_columnar(document):
+    """Check whether a parsed transactions file uses the columnar layout."""
+    return isinstance(document, dict) and document.get("format") == FORMAT_NAME
+
+
+def _derived_words(transactions):
+    """Amounts in words as the app writes them: the received amount, else the paid amount."""
+    received = pd.to_numeric(pd.Series([t.get("received") for t in transactions], dtype=object),
+                             errors="coerce").fillna(0)
+    paid = pd.to_numeric(pd.Series([t.get("paid") for t in transactions], dtype=object),
+                         errors="coerce").fillna(0)
+    amount = received.where(received > 0, paid.where(paid > 0, 0))
+    return num_to_words_rupees_batch(amount)
+
+
+def _encode_coded(values):
+    """Replace values by codes into a table of the distinct values."""
+    table = {}
+    codes = [table.setdefault(value, len(table)) for value in values]
+    return {"values": list(table), "codes": codes}
+
+
+def encode_transactions(data):
+    """
+    Convert transaction data to the columnar layout.
+
+    Values a column can't hold exactly, fields outside the columns and missing
+    fields are recorded per row, so decoding gives back the same transactions
+    apart from amounts in words that match their amount, which are dropped.
+
+    Args:
+        data: Transaction data dictionary with a 'transactions' list
+
+    Returns:
+        dict: The columnar document, ready to be written as JSON
+    """
+    transactions = data.get("transactions", [])
+    overrides = {}
+    missing = {}
+
+    def override(position, key, value):
+        overrides.setdefault(str(position), {})[key] = value
+
+    for position, transaction in enumerate(transactions):
+        for key in transaction.keys() - set(COLUMNS) - {WORDS_FIELD}:
+            override(position, key, transaction[key])
+        for key in COLUMNS:
+            if key not in transaction:
+                missing.setdefault(key, []).append(position)
+
+    columns = {key: [t.get(key) for t in transactions] for key in COLUMNS if key != "date"}
+
+    # Dates as day ordinals; anything but a 'YYYY-MM-DD' string is kept as it is
+    dates = [t.get("date") for t in transactions]
+    ordinals, valid = to_day_ordinals(dates)
+    date_column = []
+    for position, (value, ordinal, is_valid) in enumerate(zip(dates, ordinals.tolist(), valid.tolist())):
+        if is_valid and isinstance(value, str) and len(value) == 10:
+            date_column.append(ordinal)
+        else:
+            date_column.append(None)
+            if "date" in transactions[position]:
+                override(position, "date", value)
+    columns["date"] = date_column
+
+    # Amounts in words are only stored where they differ from the derived text
+    worded = [position for position, t in enumerate(transactions) if WORDS_FIELD in t]
+    if worded:
+        derived = _derived_words([transactions[position] for position in worded])
+        for position, words in zip(worded, derived):
+            if transactions[position][WORDS_FIELD] != words:
+                override(position, WORDS_FIELD, transactions[position][WORDS_FIELD])
+
+    for key in CODED_COLUMNS:
+        columns[key] = _encode_coded(columns[key])
+
+    document = {key: value for key, value in data.items() if key not in ("transactions", "version")}
+    document.update({
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "count": len(transactions),
+        "columns": columns,
+        "overrides": overrides,
+        "missing": missing
+    })
+    return document
+
+
+def decode_transactions(document):
+    """
+    Convert a columnar document back to transaction data.
+
+    Args:
+        document: Parsed columnar transactions file
+
+    Returns:
+        dict: Transaction data dictionary with a 'transactions' list
+    """
+    columns = dict(document["columns"])
+    count = document.get("count", 0)
+
+    for key in CODED_COLUMNS:
+        table = columns[key]["values"]
+        columns[key] = [table[code] for code in columns[key]["codes"]]
+
+    ordinals = columns["date"]
+    known = [ordinal is not None for ordinal in ordinals]
+    date_strings = [None] * count
+    if any(known):
+        days = np.array([ordinal for ordinal in ordinals if ordinal is not None], dtype="datetime64[D]")
+        formatted = iter(np.datetime_as_string(days, unit="D").tolist())
+        date_strings = [next(formatted) if is_known else None for is_known in known]
+    columns["date"] = date_strings
+
+    transactions = [dict(zip(COLUMNS, row)) for row in zip(*(columns[key] for key in COLUMNS))]
+
+    for key, positions in document.get("missing", {}).items():
+        for position in positions:
+            del transactions[position][key]
+    for position, values in document.get("overrides", {}).items():
+        transactions[int(position)].update(values)
+
+    data = {key: value for key, value in document.items()
+            if key not in ("format", "format_version", "count", "columns", "overrides", "missing")}
+    data["transactions"] = transactions
+    return data
+
+
+def read_transactions_document(document):
+    """
+    Get transaction data from a parsed transactions file in either layout.
+
+    Args:
+        document: Parsed JSON of a transactions file
+
+    Returns:
+        dict: Transaction data dictionary with a 'transactions' list
+    """
+    if is_columnar(document):
+        return decode_transactions(document)
+    return document
+
+
+def read_transactions_file(file_path):
+    """
+    Read a transactions file in either layout.
+
+    Args:
+        file_path: Path to the transactions file
+
+    Returns:
+        dict: Transaction data dictionary with a 'transactions' list
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    with open(file_path, "r") as f:
+        return read_transactions_document(json.load(f))
+
+
+def write_transactions_file(file_path, data):
+    """
+    Write transaction data atomically in the configured layout.
+
+    Args:
+        file_path: Path to the transactions file
+        data: Transaction data dictionary to store
+    """
+    if TRANSACTIONS_FORMAT == "columnar":
+        file_store.atomic_write_json(file_path, encode_transactions(data), separators=(",", ":"))
+    else:
+        file_store.atomic_write_json(file_path, data, indent=4)
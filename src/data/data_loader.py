@@ -1,11 +1,21 @@
 import os
 import json
+import hashlib
 import glob
 import pandas as pd
 import streamlit as st
-from datetime import datetime
-import openpyxl
+import io
 import sys
+import threading
+from contextlib import contextmanager
+from ..services.calendar_lookup import CalendarLookup
+from ..services.calendar_intervals import CalendarIntervals
+from . import sqlite_store
+from . import journal_store
+from . import calendar_cache
+from . import file_store
+from . import columnar_store
+from .file_store import StaleDataError
 
 # Get base directory for resolving paths
 def get_base_dir():
@@ -26,17 +36,64 @@ BASE_DIR = get_base_dir()
 INTEREST_CALENDARS_DIR = os.path.join(BASE_DIR, "interest_calendars")
 TRANSACTIONS_FILE = os.path.join(BASE_DIR, "data", "storage", "transactions.json")
 CLIENTS_FILE = os.path.join(BASE_DIR, "data", "storage", "clients.json")
+RECALC_STATE_FILE = os.path.join(BASE_DIR, "data", "storage", "recalc_state.json")
+DATABASE_FILE = os.path.join(BASE_DIR, "data", "storage", "ledger.db")
+
+# Storage backend for clients and transactions: "json" (default), "sqlite", or "journal"
+# ("journal" keeps clients in JSON and appends transaction changes to a journal)
+STORAGE_BACKEND = os.environ.get("LEDGER_STORAGE_BACKEND", "json").strip().lower()
+
+# Process-wide cache of parsed calendar files, shared across Streamlit reruns and sessions.
+# Files are keyed on (mtime, size), so only new or changed files are parsed again.
+_calendar_file_cache = {}
+_merged_calendar_cache = {"key": None, "calendars": None}
+_calendar_cache_lock = threading.Lock()
+
+def invalidate_calendar_cache(file_path=None):
+    """
+    Drop cached calendars so the next load reads them from disk.
+    
+    Args:
+        file_path: Path of the calendar file that changed, or None to drop every calendar
+    """
+    with _calendar_cache_lock:
+        if file_path is None:
+            _calendar_file_cache.clear()
+        else:
+            _calendar_file_cache.pop(os.path.abspath(file_path), None)
+        _merged_calendar_cache["key"] = None
+        _merged_calendar_cache["calendars"] = None
+
+def _file_stamp(file_path):
+    """Get the (mtime, size) stamp used to tell whether a calendar or store file changed."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _copy_calendars(calendars):
+    """
+    Copy the calendar dictionaries so callers can modify them without touching the cache.
+    The DataFrames themselves are shared and must be copied before editing.
+    """
+    copied = dict(calendars)
+    copied['diwali'] = dict(calendars['diwali'])
+    copied['financial'] = dict(calendars['financial'])
+    copied['fingerprints'] = dict(calendars['fingerprints'])
+    return copied
 
 def load_interest_calendars():
     """
     Load interest calendars from CSV files.
+    Unchanged files are served from the process-wide cache.
     Returns a dictionary with calendar data.
     """
     calendars = {
         'diwali': {},
         'financial': {},
         'merged_diwali': None,
-        'merged_financial': None
+        'merged_financial': None,
+        'lookup': None,
+        'intervals': None,
+        'fingerprints': {}
     }
     
     # Ensure the directory exists
@@ -48,19 +105,75 @@ def load_interest_calendars():
         st.warning("No interest calendars found in the interest_calendars directory.")
         return calendars
     
-    for file_path in calendar_files:
-        try:
-            filename = os.path.basename(file_path)
-            
-            # Extract year range differently based on the file naming convention
-            if "Financial_Year" in filename:
-                year_range = filename.replace("Financial_Year_", "").replace(".csv", "")
-                calendar_type = 'financial'
-            else:
-                year_range = filename.split('_')[0]  # Extract year range (e.g., "2023-2024")
-                calendar_type = 'diwali'
+    with _calendar_cache_lock:
+        stamps = []
+        for file_path in calendar_files:
+            try:
+                stamps.append((os.path.abspath(file_path), _file_stamp(file_path)))
+            except OSError:
+                stamps.append((os.path.abspath(file_path), None))
+        cache_key = tuple(stamps)
+        
+        if _merged_calendar_cache["key"] == cache_key:
+            return _copy_calendars(_merged_calendar_cache["calendars"])
+        
+        complete = True
+        for file_path, stamp in stamps:
+            cached = _calendar_file_cache.get(file_path)
+            if cached is None or cached["stamp"] != stamp:
+                cached = _load_calendar_file(file_path, stamp)
+                if cached is None:
+                    complete = False
+                    _calendar_file_cache.pop(file_path, None)
+                    continue
+                _calendar_file_cache[file_path] = cached
             
-            df = pd.read_csv(file_path)
+            calendars[cached["type"]][cached["year_range"]] = cached["df"]
+            calendars['fingerprints'][cached["filename"]] = cached["fingerprint"]
+        
+        # Forget files that were removed from the directory
+        for file_path in set(_calendar_file_cache) - {path for path, _ in stamps}:
+            del _calendar_file_cache[file_path]
+        
+        merge_interest_calendars(calendars)
+        
+        # Don't cache a result with load errors, so the errors keep being reported
+        if complete:
+            _merged_calendar_cache["key"] = cache_key
+            _merged_calendar_cache["calendars"] = calendars
+            return _copy_calendars(calendars)
+        return calendars
+
+def _load_calendar_file(file_path, stamp):
+    """
+    Parse a single calendar CSV file, or load it from its binary sidecar when the
+    sidecar was built from the same file contents.
+    
+    Args:
+        file_path: Path to the calendar CSV file
+        stamp: The (mtime, size) stamp of the file when it was listed
+        
+    Returns:
+        dict: Cache entry with the parsed DataFrame and its fingerprint, or None on error
+    """
+    try:
+        filename = os.path.basename(file_path)
+        
+        # Extract year range differently based on the file naming convention
+        if "Financial_Year" in filename:
+            year_range = filename.replace("Financial_Year_", "").replace(".csv", "")
+            calendar_type = 'financial'
+        else:
+            year_range = filename.split('_')[0]  # Extract year range (e.g., "2023-2024")
+            calendar_type = 'diwali'
+        
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        
+        df = calendar_cache.load_sidecar(file_path, digest)
+        if df is None:
+            df = pd.read_csv(io.BytesIO(raw))
             
             # Determine the date format based on calendar type
             if calendar_type == 'diwali':
@@ -75,78 +188,395 @@ def load_interest_calendars():
             if 'Tithi' in df.columns:
                 df = df.drop(columns=['Tithi'])
             
-            # Add a source_file column to track which file each row came from
-            df['source_file'] = filename
-            calendars[calendar_type][year_range] = df
-            
-        except Exception as e:
-            st.error(f"Error loading calendar {file_path}: {e}")
+            # Store the parsed calendar so the next cold start can skip parsing
+            calendar_cache.write_sidecar(file_path, digest, df)
+        
+        # Add a source_file column to track which file each row came from
+        df['source_file'] = filename
+        
+        return {
+            "stamp": stamp,
+            "filename": filename,
+            "type": calendar_type,
+            "year_range": year_range,
+            "df": df,
+            # Fingerprint the file so recalculation can tell which date ranges changed
+            "fingerprint": fingerprint_calendar_file(file_path, calendar_type, df, digest)
+        }
+        
+    except Exception as e:
+        st.error(f"Error loading calendar {file_path}: {e}")
+        return None
+
+def fingerprint_calendar_file(file_path, calendar_type, df, digest=None):
+    """
+    Fingerprint a calendar file by content hash and covered date range.
+    
+    Args:
+        file_path: Path to the calendar CSV file
+        calendar_type: 'diwali' or 'financial'
+        df: The calendar DataFrame loaded from the file
+        digest: SHA-1 hex digest of the file, if already computed
+        
+    Returns:
+        dict: Fingerprint with 'type', 'hash', 'start' and 'end' keys
+    """
+    if digest is None:
+        with open(file_path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+    
+    dates = df['Date'].dropna()
+    return {
+        "type": calendar_type,
+        "hash": digest,
+        "start": dates.min().strftime('%Y-%m-%d') if not dates.empty else None,
+        "end": dates.max().strftime('%Y-%m-%d') if not dates.empty else None
+    }
+
+def merge_interest_calendars(calendars):
+    """
+    Rebuild the merged calendars, the date lookup and the calendar intervals from the per-year calendars.
+    Call this after changing a per-year calendar in memory so lookups see the change.
+    
+    Args:
+        calendars: Dictionary containing calendar data
+        
+    Returns:
+        dict: The same dictionary with 'merged_diwali', 'merged_financial', 'lookup' and 'intervals' refreshed
+    """
+    for calendar_type in ('diwali', 'financial'):
+        if calendars[calendar_type]:
+            calendars[f'merged_{calendar_type}'] = pd.concat(
+                [df for df in calendars[calendar_type].values()], ignore_index=True
+            )
+        else:
+            calendars[f'merged_{calendar_type}'] = None
     
-    # Create merged calendars for each type
-    if calendars['diwali']:
-        merged_diwali = pd.concat([df for df in calendars['diwali'].values()], ignore_index=True)
-        calendars['merged_diwali'] = merged_diwali
+    # Index the merged calendars by date so lookups don't have to scan them
+    calendars['lookup'] = CalendarLookup.from_calendars(calendars)
     
-    if calendars['financial']:
-        merged_financial = pd.concat([df for df in calendars['financial'].values()], ignore_index=True)
-        calendars['merged_financial'] = merged_financial
+    # Register each calendar's date range for overlap and coverage checks
+    calendars['intervals'] = CalendarIntervals.from_calendars(calendars)
     
     return calendars
 
+def use_sqlite():
+    """Return True if clients and transactions are stored in the SQLite database."""
+    return STORAGE_BACKEND == "sqlite"
+
+def use_journal():
+    """Return True if transaction changes are appended to the transaction journal."""
+    return STORAGE_BACKEND == "journal"
+
+def ensure_database():
+    """
+    Make sure the SQLite database exists, migrating the JSON files into it on first use.
+    """
+    if not sqlite_store.is_migrated(DATABASE_FILE):
+        migrate_json_to_sqlite()
+
+def migrate_json_to_sqlite():
+    """
+    Copy the clients and transactions from the JSON files into the SQLite database.
+    
+    Returns:
+        tuple: (clients_migrated, transactions_migrated) counts
+    """
+    return sqlite_store.migrate_from_json(DATABASE_FILE, CLIENTS_FILE, TRANSACTIONS_FILE)
+
+def _without_version(data):
+    """The data to write to a JSON store; the version is kept next to the file."""
+    return {key: value for key, value in data.items() if key != "version"}
+
+def _read_json_store(file_path, key):
+    """
+    Read a JSON store file.
+    A damaged file is moved aside and reported instead of being silently
+    treated as empty, so the next save doesn't overwrite what is left of it.
+    
+    Args:
+        file_path: Path to the JSON file
+        key: Key of the record list, e.g. 'clients'
+        
+    Returns:
+        dict: The stored data, or an empty record list if there is no readable file
+    """
+    if not os.path.exists(file_path):
+        return {key: []}
+    
+    with open(file_path, "r") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            pass
+    
+    damaged_path = file_store.set_aside(file_path)
+    st.error(f"{os.path.basename(file_path)} could not be read and was moved to {damaged_path}. "
+             f"Starting with no {key}; restore a backup to get them back.")
+    return {key: []}
+
+def storage_versions():
+    """
+    Get the current versions of the stores.
+    
+    Returns:
+        tuple: (clients_version, transactions_version)
+    """
+    return file_store.read_version(CLIENTS_FILE), file_store.read_version(TRANSACTIONS_FILE)
+
+def storage_stamps():
+    """
+    Get the (mtime, size) stamps of the files holding the clients and transactions,
+    so changes made outside the app can be noticed.
+    
+    Returns:
+        tuple: One stamp per file, None for files that don't exist
+    """
+    if use_sqlite():
+        paths = [DATABASE_FILE, f"{DATABASE_FILE}-wal"]
+    elif use_journal():
+        paths = [CLIENTS_FILE, TRANSACTIONS_FILE, journal_store.journal_path(TRANSACTIONS_FILE)]
+    else:
+        paths = [CLIENTS_FILE, TRANSACTIONS_FILE]
+    
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append(_file_stamp(path))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+@contextmanager
+def _versioned_write(file_path, data, name):
+    """
+    Hold a store's lock around a write, refusing data that is older than the store
+    and bumping the store's version.
+    
+    Args:
+        file_path: Path of the store's data file
+        data: Data dictionary being written, with the 'version' it was loaded at
+        name: Name of the store for the conflict message
+        
+    Raises:
+        StaleDataError: If another session saved the store after the data was loaded
+    """
+    with file_store.file_lock(file_path):
+        file_store.check_version(file_path, data, name)
+        file_store.bump_version(file_path, data)
+        yield
+
 def load_clients():
     """
-    Load client data from JSON file.
-    Returns a dictionary with a 'clients' key containing a list of client dictionaries.
+    Load client data from the configured storage backend.
+    Returns a dictionary with a 'clients' key containing a list of client dictionaries
+    and a 'version' key with the store version the clients were loaded at.
     """
+    if use_sqlite():
+        ensure_database()
+    
     # Ensure the directory exists
     os.makedirs(os.path.dirname(CLIENTS_FILE), exist_ok=True)
     
-    if os.path.exists(CLIENTS_FILE):
-        with open(CLIENTS_FILE, "r") as f:
-            try:
-                data = json.load(f)
-                # Initialize opening_balance if not present
-                for client in data["clients"]:
-                    if "opening_balance" not in client:
-                        client["opening_balance"] = 0.0
-                return data
-            except json.JSONDecodeError:
-                return {"clients": []}
-    else:
-        return {"clients": []}
+    with file_store.file_lock(CLIENTS_FILE, shared=True):
+        if use_sqlite():
+            data = {"clients": sqlite_store.load_clients(DATABASE_FILE)}
+        else:
+            data = _read_json_store(CLIENTS_FILE, "clients")
+        data["version"] = file_store.read_version(CLIENTS_FILE)
+    
+    # Initialize opening_balance if not present
+    for client in data.get("clients", []):
+        if "opening_balance" not in client:
+            client["opening_balance"] = 0.0
+    return data
 
 def save_clients(data):
-    """Save client data to JSON file."""
-    # Ensure the directory exists
-    os.makedirs(os.path.dirname(CLIENTS_FILE), exist_ok=True)
+    """
+    Save client data to the configured storage backend.
     
-    with open(CLIENTS_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    Raises:
+        StaleDataError: If another session saved the clients after this data was loaded
+    """
+    if use_sqlite():
+        ensure_database()
+    
+    with _versioned_write(CLIENTS_FILE, data, "clients"):
+        if use_sqlite():
+            sqlite_store.save_clients(DATABASE_FILE, data.get("clients", []))
+        else:
+            file_store.atomic_write_json(CLIENTS_FILE, _without_version(data), indent=4)
 
 def load_transactions():
     """
-    Load transaction data from JSON file.
-    Returns a dictionary with a 'transactions' key containing a list of transaction dictionaries.
+    Load transaction data from the configured storage backend.
+    Returns a dictionary with a 'transactions' key containing a list of transaction dictionaries
+    and a 'version' key with the store version the transactions were loaded at.
     """
+    if use_sqlite():
+        ensure_database()
+    
     # Ensure the directory exists
     os.makedirs(os.path.dirname(TRANSACTIONS_FILE), exist_ok=True)
     
-    if os.path.exists(TRANSACTIONS_FILE):
-        with open(TRANSACTIONS_FILE, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return {"transactions": []}
-    else:
-        return {"transactions": []}
+    # Loading the journal may compact it, which writes, so it needs the exclusive lock
+    with file_store.file_lock(TRANSACTIONS_FILE, shared=not use_journal()):
+        if use_sqlite():
+            data = {"transactions": sqlite_store.load_transactions(DATABASE_FILE)}
+        elif use_journal():
+            data = journal_store.load_transactions(TRANSACTIONS_FILE)
+        else:
+            data = columnar_store.read_transactions_document(_read_json_store(TRANSACTIONS_FILE, "transactions"))
+        data["version"] = file_store.read_version(TRANSACTIONS_FILE)
+    return data
 
 def save_transactions(data):
-    """Save transaction data to JSON file."""
-    # Ensure the directory exists
-    os.makedirs(os.path.dirname(TRANSACTIONS_FILE), exist_ok=True)
+    """
+    Save transaction data to the configured storage backend.
+    With SQLite or the journal only the transactions that changed are written.
+    
+    Raises:
+        StaleDataError: If another session saved the transactions after this data was loaded
+    """
+    if use_sqlite():
+        ensure_database()
+    
+    with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+        if use_sqlite():
+            sqlite_store.save_transactions(DATABASE_FILE, data.get("transactions", []))
+        elif use_journal():
+            journal_store.save_transactions(TRANSACTIONS_FILE, data)
+        else:
+            columnar_store.write_transactions_file(TRANSACTIONS_FILE, _without_version(data))
+
+def add_transactions(data, new_transactions):
+    """
+    Append new transactions to the ledger and persist them.
     
-    with open(TRANSACTIONS_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    Args:
+        data: Transaction data dictionary with a 'transactions' list
+        new_transactions: List of transaction dictionaries to add
+    """
+    data.setdefault("transactions", []).extend(new_transactions)
+    
+    if use_sqlite():
+        ensure_database()
+        with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+            sqlite_store.insert_transactions(DATABASE_FILE, new_transactions)
+    elif use_journal():
+        with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+            journal_store.put_transactions(TRANSACTIONS_FILE, new_transactions)
+    else:
+        save_transactions(data)
+
+def update_transaction(data, transaction_id, changes):
+    """
+    Apply changes to one transaction and persist it.
+    
+    Args:
+        data: Transaction data dictionary with a 'transactions' list
+        transaction_id: ID of the transaction to update
+        changes: Dictionary of fields to update
+        
+    Returns:
+        dict: The updated transaction, or None if no transaction has that ID
+    """
+    transaction = next((t for t in data.get("transactions", []) if t.get("id") == transaction_id), None)
+    if transaction is None:
+        return None
+    
+    transaction.update(changes)
+    
+    if use_sqlite():
+        ensure_database()
+        with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+            sqlite_store.update_transaction(DATABASE_FILE, transaction)
+    elif use_journal():
+        with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+            journal_store.put_transactions(TRANSACTIONS_FILE, [transaction])
+    else:
+        save_transactions(data)
+    return transaction
+
+def update_transactions(data, changes_by_id):
+    """
+    Apply changes to several transactions and persist them together.
+    
+    Args:
+        data: Transaction data dictionary with a 'transactions' list
+        changes_by_id: Dictionary mapping transaction IDs to dictionaries of fields to update
+        
+    Returns:
+        list: The updated transactions; IDs that don't exist are ignored
+    """
+    updated = []
+    for transaction in data.get("transactions", []):
+        changes = changes_by_id.get(transaction.get("id"))
+        if changes is not None:
+            transaction.update(changes)
+            updated.append(transaction)
+    
+    if not updated:
+        return updated
+    
+    if use_sqlite():
+        ensure_database()
+        with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+            sqlite_store.insert_transactions(DATABASE_FILE, updated)
+    elif use_journal():
+        with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+            journal_store.put_transactions(TRANSACTIONS_FILE, updated)
+    else:
+        save_transactions(data)
+    return updated
+
+def delete_transactions(data, transaction_ids):
+    """
+    Remove transactions from the ledger by ID and persist the deletion.
+    
+    Args:
+        data: Transaction data dictionary with a 'transactions' list
+        transaction_ids: IDs of the transactions to delete
+    """
+    transaction_ids = set(transaction_ids)
+    data["transactions"] = [t for t in data.get("transactions", []) if t.get("id") not in transaction_ids]
+    
+    if use_sqlite():
+        ensure_database()
+        with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+            sqlite_store.delete_transactions(DATABASE_FILE, transaction_ids)
+    elif use_journal():
+        with _versioned_write(TRANSACTIONS_FILE, data, "transactions"):
+            journal_store.delete_transactions(TRANSACTIONS_FILE, transaction_ids)
+    else:
+        save_transactions(data)
+
+def compact_transaction_journal():
+    """Fold the transaction journal into a new transactions.json snapshot."""
+    if use_journal():
+        with file_store.file_lock(TRANSACTIONS_FILE):
+            journal_store.compact(TRANSACTIONS_FILE)
+
+def load_recalc_state():
+    """
+    Load the fingerprints recorded by the last interest recalculation.
+    Returns a dictionary with 'calendars' and 'transactions' keys.
+    """
+    if os.path.exists(RECALC_STATE_FILE):
+        with open(RECALC_STATE_FILE, "r") as f:
+            try:
+                state = json.load(f)
+                state.setdefault("calendars", {})
+                state.setdefault("transactions", {})
+                return state
+            except json.JSONDecodeError:
+                pass
+    return {"calendars": {}, "transactions": {}}
+
+def save_recalc_state(state):
+    """Save the recalculation fingerprints to JSON file."""
+    with file_store.file_lock(RECALC_STATE_FILE):
+        file_store.atomic_write_json(RECALC_STATE_FILE, state)
 
 def get_interest_value(date_str, interest_calendars):
     """
@@ -160,49 +590,11 @@ def get_interest_value(date_str, interest_calendars):
         tuple: (diwali_days, financial_days)
     """
     try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        year = date_obj.year
-        
-        # Initialize return values
-        diwali_days = None
-        financial_days = None
-        
-        # Check in Diwali calendar
-        if interest_calendars['merged_diwali'] is not None:
-            merged_diwali = interest_calendars['merged_diwali']
-            date_match = merged_diwali[merged_diwali['Date'].dt.date == date_obj.date()]
-            
-            if not date_match.empty:
-                diwali_days = float(date_match['Shadow Value'].iloc[0])
-        
-        # Check in Financial calendar
-        if interest_calendars['merged_financial'] is not None:
-            merged_financial = interest_calendars['merged_financial']
-            date_match = merged_financial[merged_financial['Date'].dt.date == date_obj.date()]
-            
-            if not date_match.empty:
-                financial_days = float(date_match['Shadow Value'].iloc[0])
-        
-        # If we didn't find values in merged calendars, try by year range
-        if diwali_days is None and interest_calendars['diwali']:
-            for year_range, calendar in interest_calendars['diwali'].items():
-                start_year, end_year = map(int, year_range.split('-'))
-                if start_year <= year <= end_year:
-                    date_match = calendar[calendar['Date'].dt.date == date_obj.date()]
-                    if not date_match.empty:
-                        diwali_days = float(date_match['Shadow Value'].iloc[0])
-                        break
-        
-        if financial_days is None and interest_calendars['financial']:
-            for year_range, calendar in interest_calendars['financial'].items():
-                start_year, end_year = map(int, year_range.split('-'))
-                if start_year <= year <= end_year:
-                    date_match = calendar[calendar['Date'].dt.date == date_obj.date()]
-                    if not date_match.empty:
-                        financial_days = float(date_match['Shadow Value'].iloc[0])
-                        break
-        
-        return diwali_days, financial_days
+        lookup = interest_calendars.get('lookup')
+        if lookup is None:
+            lookup = CalendarLookup.from_calendars(interest_calendars)
+            interest_calendars['lookup'] = lookup
+        return lookup.lookup(date_str)
     except Exception as e:
         st.error(f"Error getting shadow days value: {e}")
         return None, None
@@ -232,84 +624,9 @@ def save_interest_calendar(calendar_df):
             # Save to file with full path
             file_path = os.path.join(INTEREST_CALENDARS_DIR, source_file)
             save_df.to_csv(file_path, index=False)
+            invalidate_calendar_cache(file_path)
         
         return True
     except Exception as e:
         st.error(f"Error saving calendar: {e}")
         return False
-
-def import_transactions_from_excel(file, client_id, interest_calendars, interest_service):
-    """
-    Import transactions from an Excel file.
-    The function processes a specific Excel format and converts it to the application's
-    transaction format.
-    
-    Args:
-        file: The uploaded Excel file
-        client_id: The ID of the client for these transactions
-        interest_calendars: Dictionary containing calendar data
-        interest_service: InterestService instance for calculations
-        
-    Returns:
-        list: A list of transaction dictionaries that can be added to the transactions data
-    """
-    try:
-        # Read the Excel file
-        df = pd.read_excel(file, header=0)
-        
-        # Drop any completely empty rows and reset index
-        df = df.dropna(how='all').reset_index(drop=True)
-        
-        # Initialize list for new transactions
-        new_transactions = []
-        
-        # Get current transactions to determine next ID
-        current_transactions = load_transactions().get("transactions", [])
-        next_id = max([t.get("id", 0) for t in current_transactions], default=0) + 1
-        
-        # Process each row
-        for idx, row in df.iterrows():
-            # Skip rows that don't have a date
-            if pd.isna(row.iloc[0]):
-                continue
-                
-            # Extract date and convert to proper format
-            try:
-                date = pd.to_datetime(row.iloc[0]).strftime('%Y-%m-%d')
-            except:
-                st.warning(f"Skipping row {idx + 1} due to invalid date format")
-                continue
-            
-            # Extract paid (Issue) and received (Receipt) amounts
-            paid = float(row['Issue']) if not pd.isna(row['Issue']) else 0.0
-            received = float(row['Receipt']) if not pd.isna(row['Receipt']) else 0.0
-            
-            # Get interest days from the row
-            interest_days = float(row['No of Days']) if not pd.isna(row['No of Days']) else 0.0
-            
-            # Process interest
-            interest = float(row['Interset'].iloc[0]) if not pd.isna(row['Interset'].iloc[0]) else 0.0
-            if row['Type'].iloc[0].lower() == 'paid':
-                interest = -interest  # Make interest negative for paid transactions
-            
-            # Create transaction record
-            transaction = {
-                "id": next_id,
-                "client_id": client_id,
-                "date": date,
-                "received": received,
-                "paid": paid,
-                "interest": interest,
-                "interest_days": interest_days,
-                "notes": f"Imported from Excel on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            new_transactions.append(transaction)
-            next_id += 1
-        
-        return new_transactions
-        
-    except Exception as e:
-        st.error(f"Error importing transactions: {str(e)}")
-        return []
@@ -0,0 +1,224 @@
+"""
+Safe file writes for the Interest Calendar Ledger application.
+Files are written to a temporary file, flushed to disk and renamed over the
+target, so a crash never leaves a truncated file behind. Advisory locks make
+concurrent writers from several sessions queue up, and a version counter next
+to each store lets a session detect that it is about to overwrite newer data.
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class StaleDataError(Exception):
+    """Raised when saving data that was loaded before another session saved newer data."""
+
+
+# Locks held by the current thread: lock path -> [open lock file, depth]
+_held_locks = threading.local()
+
+
+def _lock_file(f, shared):
+    """Block until the lock on an open lock file is acquired."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        return
+
+    # msvcrt has no shared locks and gives up after 10 seconds, so keep retrying
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+def _unlock_file(f):
+    """Release the lock on an open lock file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+    Hold an advisory lock on a file while the block runs.
+
+    The lock is taken on a separate '.lock' file next to the target, so the
+    target itself can be replaced while the lock is held. The lock is re-entrant
+    within a thread; a nested request runs under the lock already held.
+
+    Args:
+        path: Path of the file to lock
+        shared: Take a shared (read) lock instead of an exclusive one, where supported
+    """
+    lock_path = os.path.abspath(f"{path}.lock")
+    held = getattr(_held_locks, "locks", None)
+    if held is None:
+        held = _held_locks.locks = {}
+
+    if lock_path in held:
+        held[lock_path][1] += 1
+        try:
+            yield
+        finally:
+            held[lock_path][1] -= 1
+        return
+
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    f = open(lock_path, "a+")
+    try:
+        _lock_file(f, shared)
+        held[lock_path] = [f, 1]
+        try:
+            yield
+        finally:
+            del held[lock_path]
+            _unlock_file(f)
+    finally:
+        f.close()
+
+
+def _fsync_directory(directory):
+    """Flush a rename to disk; not possible (or needed) on Windows."""
+    if fcntl is None:
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, write, mode="w"):
+    """
+    Write a file through a temporary file that replaces the target in one step.
+
+    Args:
+        path: Path of the file to write
+        write: Function called with the open temporary file to write the contents
+        mode: File mode for the temporary file, "w" or "wb"
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def atomic_write_json(path, data, **dump_options):
+    """
+    Write data as JSON through atomic_write.
+
+    Args:
+        path: Path of the JSON file
+        data: JSON-serializable data
+        **dump_options: Options passed to json.dump, e.g. indent
+    """
+    atomic_write(path, lambda f: json.dump(data, f, **dump_options))
+
+
+def set_aside(path):
+    """
+    Move an unreadable file out of the way so it isn't overwritten.
+
+    Args:
+        path: Path of the damaged file
+
+    Returns:
+        str: The path the file was moved to
+    """
+    damaged_path = f"{path}.damaged-{time.strftime('%Y%m%d-%H%M%S')}"
+    os.replace(path, damaged_path)
+    return damaged_path
+
+
+def version_path(path):
+    """Get the file holding the version counter of a store."""
+    return f"{path}.version"
+
+
+def read_version(path):
+    """
+    Read the version counter of a store.
+
+    Args:
+        path: Path of the store's data file
+
+    Returns:
+        int: The number of saves recorded for the store, 0 if none
+    """
+    try:
+        with open(version_path(path), "r") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def bump_version(path, data=None):
+    """
+    Increase the version counter of a store for a save.
+
+    Call this while holding the store's lock, before writing the data, so a
+    crash part way through makes other sessions reload rather than overwrite.
+
+    Args:
+        path: Path of the store's data file
+        data: The data dictionary being saved; its 'version' is moved to the new version
+
+    Returns:
+        int: The new version
+    """
+    version = read_version(path) + 1
+    atomic_write(version_path(path), lambda f: f.write(str(version)))
+    if data is not None:
+        data["version"] = version
+    return version
+
+
+def check_version(path, data, name):
+    """
+    Make sure data is not older than the stored version before overwriting the store.
+
+    Call this while holding the store's lock. Data without a 'version' was not
+    loaded from the store and is not checked.
+
+    Args:
+        path: Path of the store's data file
+        data: Data dictionary with the 'version' it was loaded at
+        name: Name of the store for the error message
+
+    Raises:
+        StaleDataError: If the store was saved since the data was loaded
+    """
+    loaded = data.get("version")
+    current = read_version(path)
+    if loaded is not None and loaded != current:
+        raise StaleDataError(
+            f"The {name} were changed in another session since this page was loaded. "
+            "Reload to see the latest data and apply your change again."
+        )
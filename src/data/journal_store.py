@@ -0,0 +1,240 @@
+"""
+Append-only journal storage for transactions in the Interest Calendar Ledger application.
+Every add, edit or delete is appended to a JSON-lines journal next to the
+transactions snapshot. Loading replays the journal on top of the snapshot, and
+compaction folds the journal back into a new snapshot.
+"""
+
+import os
+import json
+from . import columnar_store
+
+# Fold the journal into the snapshot once it grows beyond this size
+COMPACT_THRESHOLD_BYTES = 1024 * 1024
+
+
+def journal_path(snapshot_file):
+    """
+    Get the journal file that belongs to a snapshot file.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot (transactions.json)
+
+    Returns:
+        str: Path to the journal file
+    """
+    root, _ = os.path.splitext(snapshot_file)
+    return f"{root}.journal.jsonl"
+
+
+def read_snapshot(snapshot_file):
+    """
+    Read the transactions snapshot.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+
+    Returns:
+        dict: Transaction data with a 'transactions' key
+    """
+    if os.path.exists(snapshot_file):
+        try:
+            return columnar_store.read_transactions_file(snapshot_file)
+        except json.JSONDecodeError:
+            pass
+    return {"transactions": []}
+
+
+def read_journal(snapshot_file):
+    """
+    Read the journal records in the order they were written.
+    Partially written lines, left behind by a crash, are skipped.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+
+    Returns:
+        list: Journal record dictionaries
+    """
+    path = journal_path(snapshot_file)
+    if not os.path.exists(path):
+        return []
+
+    records = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def replay(transactions, records):
+    """
+    Apply journal records to a list of transactions.
+
+    'put' records insert or replace whole transactions by ID, 'delete' records
+    remove transactions by ID. Both are idempotent, so replaying a journal over a
+    snapshot that already contains some of its changes is safe.
+
+    Args:
+        transactions: List of transaction dictionaries from the snapshot
+        records: Journal records to apply
+
+    Returns:
+        list: The resulting list of transactions
+    """
+    by_id = {t.get("id"): t for t in transactions}
+
+    for record in records:
+        if record.get("op") == "put":
+            for transaction in record.get("transactions", []):
+                by_id[transaction.get("id")] = transaction
+        elif record.get("op") == "delete":
+            for transaction_id in record.get("ids", []):
+                by_id.pop(transaction_id, None)
+
+    return list(by_id.values())
+
+
+def load_transactions(snapshot_file):
+    """
+    Load the transactions by replaying the journal over the last snapshot.
+    The journal is compacted first if it has grown beyond the threshold.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+
+    Returns:
+        dict: Transaction data with a 'transactions' key
+    """
+    data = read_snapshot(snapshot_file)
+    records = read_journal(snapshot_file)
+    if records:
+        data["transactions"] = replay(data.get("transactions", []), records)
+        if _journal_size(snapshot_file) > COMPACT_THRESHOLD_BYTES:
+            write_snapshot(snapshot_file, data)
+    return data
+
+
+def append(snapshot_file, records):
+    """
+    Append records to the journal and flush them to disk.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+        records: Journal record dictionaries to append
+    """
+    if not records:
+        return
+
+    path = journal_path(snapshot_file)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "a") as f:
+        # Start on a fresh line if a crash left a partial record at the end
+        if not _ends_with_newline(path):
+            f.write("\n")
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    if _journal_size(snapshot_file) > COMPACT_THRESHOLD_BYTES:
+        compact(snapshot_file)
+
+
+def put_transactions(snapshot_file, transactions):
+    """
+    Record new or updated transactions in the journal.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+        transactions: Complete transaction dictionaries to store
+    """
+    if transactions:
+        append(snapshot_file, [{"op": "put", "transactions": list(transactions)}])
+
+
+def delete_transactions(snapshot_file, transaction_ids):
+    """
+    Record deleted transactions in the journal.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+        transaction_ids: IDs of the deleted transactions
+    """
+    if transaction_ids:
+        append(snapshot_file, [{"op": "delete", "ids": list(transaction_ids)}])
+
+
+def save_transactions(snapshot_file, data):
+    """
+    Journal the difference between the stored ledger and the given transaction data.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+        data: Transaction data dictionary with the complete 'transactions' list
+    """
+    stored = {t.get("id"): t for t in load_transactions(snapshot_file).get("transactions", [])}
+    transactions = data.get("transactions", [])
+
+    changed = [t for t in transactions if stored.get(t.get("id")) != t]
+    kept_ids = {t.get("id") for t in transactions}
+    removed_ids = [transaction_id for transaction_id in stored if transaction_id not in kept_ids]
+
+    records = []
+    if changed:
+        records.append({"op": "put", "transactions": changed})
+    if removed_ids:
+        records.append({"op": "delete", "ids": removed_ids})
+    append(snapshot_file, records)
+
+
+def write_snapshot(snapshot_file, data):
+    """
+    Write a new snapshot and clear the journal.
+    The snapshot is replaced atomically before the journal is truncated, so a crash
+    in between only leaves records that replay to the same state.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+        data: Transaction data dictionary to store
+    """
+    columnar_store.write_transactions_file(snapshot_file, data)
+
+    path = journal_path(snapshot_file)
+    if os.path.exists(path):
+        open(path, "w").close()
+
+
+def compact(snapshot_file):
+    """
+    Fold the journal into a new snapshot.
+
+    Args:
+        snapshot_file: Path to the transactions snapshot
+    """
+    data = read_snapshot(snapshot_file)
+    data["transactions"] = replay(data.get("transactions", []), read_journal(snapshot_file))
+    write_snapshot(snapshot_file, data)
+
+
+def _journal_size(snapshot_file):
+    """Size of the journal file in bytes."""
+    path = journal_path(snapshot_file)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _ends_with_newline(path):
+    """Check whether a file is empty or ends with a newline."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
@@ -0,0 +1,276 @@
+"""
+SQLite storage backend for the Interest Calendar Ledger application.
+Clients and transactions are kept one row per record, so adding, editing or
+deleting a single transaction touches only that row instead of rewriting the
+whole ledger file.
+"""
+
+import os
+import json
+import sqlite3
+from . import columnar_store
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    client_id INTEGER,
+    date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_client_id ON transactions (client_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def connect(db_path):
+    """
+    Open a connection to the ledger database, creating the schema if needed.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: An open connection
+    """
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _dump(record):
+    """Serialize a record for the data column."""
+    return json.dumps(record, separators=(",", ":"))
+
+
+def _client_row(client):
+    """Build the (id, name, data) row for a client."""
+    return (client.get("id"), client.get("name"), _dump(client))
+
+
+def _transaction_row(transaction):
+    """Build the (id, client_id, date, data) row for a transaction."""
+    return (transaction.get("id"), transaction.get("client_id"), transaction.get("date"), _dump(transaction))
+
+
+def is_migrated(db_path):
+    """
+    Check whether the JSON files have already been migrated into the database.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        bool: True if the migration has run for this database
+    """
+    if not os.path.exists(db_path):
+        return False
+    conn = connect(db_path)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+    finally:
+        conn.close()
+    return row is not None
+
+
+def migrate_from_json(db_path, clients_file, transactions_file):
+    """
+    One-shot migration of the JSON storage files into the database.
+    Existing rows with the same IDs are replaced. The JSON files are left untouched.
+
+    Args:
+        db_path: Path to the SQLite database file
+        clients_file: Path to clients.json
+        transactions_file: Path to transactions.json
+
+    Returns:
+        tuple: (clients_migrated, transactions_migrated) counts
+    """
+    def read_records(file_path, key):
+        if not os.path.exists(file_path):
+            return []
+        with open(file_path, "r") as f:
+            try:
+                return columnar_store.read_transactions_document(json.load(f)).get(key, [])
+            except json.JSONDecodeError:
+                return []
+
+    clients = read_records(clients_file, "clients")
+    transactions = read_records(transactions_file, "transactions")
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO clients (id, name, data) VALUES (?, ?, ?)",
+                             [_client_row(c) for c in clients])
+            conn.executemany("INSERT OR REPLACE INTO transactions (id, client_id, date, data) VALUES (?, ?, ?, ?)",
+                             [_transaction_row(t) for t in transactions])
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                         (json.dumps({"clients": len(clients), "transactions": len(transactions)}),))
+    finally:
+        conn.close()
+
+    return len(clients), len(transactions)
+
+
+def load_clients(db_path):
+    """
+    Load all clients ordered by ID.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        list: Client dictionaries
+    """
+    conn = connect(db_path)
+    try:
+        return [json.loads(data) for (data,) in conn.execute("SELECT data FROM clients ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def load_transactions(db_path):
+    """
+    Load all transactions ordered by ID.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        list: Transaction dictionaries
+    """
+    conn = connect(db_path)
+    try:
+        return [json.loads(data) for (data,) in conn.execute("SELECT data FROM transactions ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def _sync_table(conn, table, records, to_row, placeholders):
+    """
+    Write only the rows that differ from what is stored and delete the ones that are gone.
+
+    Returns:
+        int: Number of rows inserted, updated or deleted
+    """
+    stored = dict(conn.execute(f"SELECT id, data FROM {table}"))
+    rows = [to_row(record) for record in records]
+
+    changed_rows = [row for row in rows if stored.get(row[0]) != row[-1]]
+    kept_ids = {row[0] for row in rows}
+    removed_ids = [(record_id,) for record_id in stored if record_id not in kept_ids]
+
+    if changed_rows:
+        conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", changed_rows)
+    if removed_ids:
+        conn.executemany(f"DELETE FROM {table} WHERE id = ?", removed_ids)
+    return len(changed_rows) + len(removed_ids)
+
+
+def save_clients(db_path, clients):
+    """
+    Bring the clients table in line with the given list, touching only changed rows.
+
+    Args:
+        db_path: Path to the SQLite database file
+        clients: Complete list of client dictionaries
+
+    Returns:
+        int: Number of rows written or deleted
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            return _sync_table(conn, "clients", clients, _client_row, "?, ?, ?")
+    finally:
+        conn.close()
+
+
+def save_transactions(db_path, transactions):
+    """
+    Bring the transactions table in line with the given list, touching only changed rows.
+
+    Args:
+        db_path: Path to the SQLite database file
+        transactions: Complete list of transaction dictionaries
+
+    Returns:
+        int: Number of rows written or deleted
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            return _sync_table(conn, "transactions", transactions, _transaction_row, "?, ?, ?, ?")
+    finally:
+        conn.close()
+
+
+def insert_transactions(db_path, transactions):
+    """
+    Insert transactions, replacing any stored transaction with the same ID.
+
+    Args:
+        db_path: Path to the SQLite database file
+        transactions: Transaction dictionaries to insert
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO transactions (id, client_id, date, data) VALUES (?, ?, ?, ?)",
+                             [_transaction_row(t) for t in transactions])
+    finally:
+        conn.close()
+
+
+def update_transaction(db_path, transaction):
+    """
+    Update a single transaction in place.
+
+    Args:
+        db_path: Path to the SQLite database file
+        transaction: The updated transaction dictionary
+
+    Returns:
+        bool: True if a row with the transaction's ID existed
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            cursor = conn.execute("UPDATE transactions SET client_id = ?, date = ?, data = ? WHERE id = ?",
+                                  _transaction_row(transaction)[1:] + (transaction.get("id"),))
+        return cursor.rowcount > 0
+    finally:
+        conn.close()
+
+
+def delete_transactions(db_path, transaction_ids):
+    """
+    Delete transactions by ID.
+
+    Args:
+        db_path: Path to the SQLite database file
+        transaction_ids: IDs of the transactions to delete
+
+    Returns:
+        int: Number of rows deleted
+    """
+    conn = connect(db_path)
+    try:
+        with conn:
+            cursor = conn.executemany("DELETE FROM transactions WHERE id = ?",
+                                      [(transaction_id,) for transaction_id in transaction_ids])
+        return cursor.rowcount
+    finally:
+        conn.close()
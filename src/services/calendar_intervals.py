@@ -0,0 +1,147 @@
+"""
+Date ranges of the interest calendars for the Interest Calendar Ledger application.
+Each calendar is registered as a (start, end) interval per calendar type, so
+overlap checks, finding the calendar that covers a date and finding the days
+no calendar covers are binary searches instead of scans over calendar dates.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from .calendar_lookup import CALENDAR_TYPES, EPOCH_ORDINAL, to_day_ordinal
+
+
+def _to_date(ordinal):
+    """Convert a day ordinal back to a date."""
+    return date.fromordinal(ordinal + EPOCH_ORDINAL)
+
+
+class CalendarIntervals:
+    """
+    Interval index over the calendars of each type.
+
+    A calendar's interval runs from its first to its last date. Intervals are
+    kept sorted by start together with the running maximum of their ends, and
+    the covered days of each type are merged into disjoint runs for gap checks.
+    """
+
+    def __init__(self, intervals=None):
+        """
+        Initialize a CalendarIntervals object.
+
+        Args:
+            intervals: Dictionary mapping calendar type to a list of (start_ordinal, end_ordinal, name) tuples
+        """
+        self._starts = {}
+        self._ends = {}
+        self._max_ends = {}
+        self._names = {}
+        self._run_starts = {}
+        self._run_ends = {}
+
+        for calendar_type, entries in (intervals or {}).items():
+            entries = sorted(entries)
+            self._starts[calendar_type] = [start for start, _, _ in entries]
+            self._ends[calendar_type] = [end for _, end, _ in entries]
+            self._names[calendar_type] = [name for _, _, name in entries]
+
+            max_ends = []
+            runs = []
+            for start, end, _ in entries:
+                max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+                # Calendars that overlap or meet on consecutive days form one covered run
+                if runs and start <= runs[-1][1] + 1:
+                    runs[-1][1] = max(runs[-1][1], end)
+                else:
+                    runs.append([start, end])
+            self._max_ends[calendar_type] = max_ends
+            self._run_starts[calendar_type] = [run_start for run_start, _ in runs]
+            self._run_ends[calendar_type] = [run_end for _, run_end in runs]
+
+    @classmethod
+    def from_calendars(cls, interest_calendars):
+        """
+        Build the intervals from the per-year calendars.
+
+        Args:
+            interest_calendars: Dictionary containing calendar data
+
+        Returns:
+            CalendarIntervals: A new index with one interval per loaded calendar
+        """
+        intervals = {}
+        for calendar_type in CALENDAR_TYPES:
+            entries = []
+            for name, calendar_df in (interest_calendars.get(calendar_type) or {}).items():
+                dates = calendar_df['Date'].dropna()
+                if not dates.empty:
+                    entries.append((to_day_ordinal(dates.min()), to_day_ordinal(dates.max()), name))
+            intervals[calendar_type] = entries
+        return cls(intervals)
+
+    def overlapping(self, calendar_type, start_date, end_date):
+        """
+        Find the calendars whose date range overlaps a date range.
+
+        Args:
+            calendar_type: 'diwali' or 'financial'
+            start_date: First date of the range, as 'YYYY-MM-DD' or a date object
+            end_date: Last date of the range, as 'YYYY-MM-DD' or a date object
+
+        Returns:
+            list: Names of the overlapping calendars, in order of their start dates
+        """
+        starts = self._starts.get(calendar_type, [])
+        ends = self._ends.get(calendar_type, [])
+        start, end = to_day_ordinal(start_date), to_day_ordinal(end_date)
+
+        # Intervals before low all end before the range; those from high on start after it
+        low = bisect_left(self._max_ends.get(calendar_type, []), start)
+        high = bisect_right(starts, end)
+        return [self._names[calendar_type][i] for i in range(low, high) if ends[i] >= start]
+
+    def covering(self, calendar_type, date_value):
+        """
+        Find the calendars that cover a date.
+
+        Args:
+            calendar_type: 'diwali' or 'financial'
+            date_value: Date string in format 'YYYY-MM-DD' or a date object
+
+        Returns:
+            list: Names of the calendars whose date range includes the date
+        """
+        return self.overlapping(calendar_type, date_value, date_value)
+
+    def gaps(self, calendar_type, start_date=None, end_date=None):
+        """
+        Find the date ranges no calendar of a type covers.
+
+        Args:
+            calendar_type: 'diwali' or 'financial'
+            start_date: First date to check, or None for the start of the first calendar
+            end_date: Last date to check, or None for the end of the last calendar
+
+        Returns:
+            list: (start, end) date tuples of the uncovered ranges, in order
+        """
+        run_starts = self._run_starts.get(calendar_type, [])
+        run_ends = self._run_ends.get(calendar_type, [])
+        if not run_starts and (start_date is None or end_date is None):
+            return []
+
+        start = run_starts[0] if start_date is None else to_day_ordinal(start_date)
+        end = run_ends[-1] if end_date is None else to_day_ordinal(end_date)
+
+        # Runs are disjoint and sorted, so their ends are sorted too
+        low = bisect_left(run_ends, start)
+        high = bisect_right(run_starts, end)
+
+        gaps = []
+        cursor = start
+        for run_start, run_end in zip(run_starts[low:high], run_ends[low:high]):
+            if run_start > cursor:
+                gaps.append((_to_date(cursor), _to_date(run_start - 1)))
+            cursor = max(cursor, run_end + 1)
+        if cursor <= end:
+            gaps.append((_to_date(cursor), _to_date(end)))
+        return gaps
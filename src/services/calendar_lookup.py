@@ -0,0 +1,176 @@
+"""
+Date-indexed shadow value lookup for the Interest Calendar Ledger application.
+The lookup is built once when the calendars are loaded and answers
+date -> (diwali_days, financial_days) queries without scanning the calendars.
+"""
+
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+
+# Day ordinals are counted from the Unix epoch so they line up with datetime64[D]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+CALENDAR_TYPES = ('diwali', 'financial')
+
+
+def to_day_ordinal(date_value):
+    """
+    Convert a single date to a day ordinal (days since 1970-01-01).
+
+    Args:
+        date_value: Date string in format 'YYYY-MM-DD', date, datetime or Timestamp
+
+    Returns:
+        int: The day ordinal
+    """
+    if isinstance(date_value, str):
+        date_value = datetime.strptime(date_value, "%Y-%m-%d")
+    return date_value.toordinal() - EPOCH_ORDINAL
+
+
+def to_day_ordinals(dates):
+    """
+    Convert an array of dates to day ordinals in one call.
+
+    Args:
+        dates: Iterable of 'YYYY-MM-DD' strings or datetime-like values
+
+    Returns:
+        tuple: (ordinals, valid) where ordinals is an int64 array and valid is a
+        boolean array marking the entries that could be parsed
+    """
+    parsed = pd.to_datetime(pd.Index(dates), format='%Y-%m-%d', errors='coerce')
+    valid = ~np.asarray(parsed.isna())
+    ordinals = np.zeros(len(parsed), dtype=np.int64)
+    ordinals[valid] = parsed[valid].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return ordinals, valid
+
+
+class CalendarLookup:
+    """
+    Constant-time shadow value lookup over the interest calendars.
+
+    Each calendar type is stored as a dense array of shadow values indexed by
+    day ordinal, with NaN marking the days no calendar covers.
+    """
+
+    def __init__(self, tables=None):
+        """
+        Initialize a CalendarLookup object.
+
+        Args:
+            tables: Dictionary mapping calendar type to a (first_ordinal, values) tuple
+        """
+        self.tables = tables or {}
+
+    @classmethod
+    def from_calendars(cls, interest_calendars):
+        """
+        Build the lookup from the merged calendars.
+
+        Args:
+            interest_calendars: Dictionary containing calendar data
+
+        Returns:
+            CalendarLookup: A new lookup covering every loaded calendar
+        """
+        tables = {}
+        for calendar_type in CALENDAR_TYPES:
+            merged = interest_calendars.get(f"merged_{calendar_type}")
+            if merged is not None and not merged.empty:
+                table = cls._build_table(merged)
+                if table is not None:
+                    tables[calendar_type] = table
+        return cls(tables)
+
+    @staticmethod
+    def _build_table(calendar_df):
+        """Build the (first_ordinal, values) table for one merged calendar."""
+        frame = calendar_df[['Date', 'Shadow Value']].dropna(subset=['Date'])
+        if frame.empty:
+            return None
+
+        ordinals = frame['Date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        values = pd.to_numeric(frame['Shadow Value'], errors='coerce').to_numpy(dtype=float)
+
+        # Keep the first row for each date, matching the order the calendars were merged in
+        unique_ordinals, first_rows = np.unique(ordinals, return_index=True)
+        first_ordinal = int(unique_ordinals[0])
+
+        table = np.full(int(unique_ordinals[-1]) - first_ordinal + 1, np.nan)
+        table[unique_ordinals - first_ordinal] = values[first_rows]
+        return first_ordinal, table
+
+    def get(self, calendar_type, date_value):
+        """
+        Get the shadow value of one calendar type for a specific date.
+
+        Args:
+            calendar_type: 'diwali' or 'financial'
+            date_value: Date string in format 'YYYY-MM-DD' or a date object
+
+        Returns:
+            float: Shadow value for the date, or None if no calendar covers it
+        """
+        table = self.tables.get(calendar_type)
+        if table is None:
+            return None
+
+        first_ordinal, values = table
+        position = to_day_ordinal(date_value) - first_ordinal
+        if 0 <= position < len(values) and not np.isnan(values[position]):
+            return float(values[position])
+        return None
+
+    def get_many(self, calendar_type, dates):
+        """
+        Get the shadow values of one calendar type for an array of dates.
+
+        Args:
+            calendar_type: 'diwali' or 'financial'
+            dates: Iterable of 'YYYY-MM-DD' strings or datetime-like values
+
+        Returns:
+            numpy.ndarray: Float array of shadow values with NaN where no calendar covers the date
+        """
+        ordinals, valid = to_day_ordinals(dates)
+        return self._take(calendar_type, ordinals, valid)
+
+    def _take(self, calendar_type, ordinals, valid):
+        """Gather shadow values for pre-computed day ordinals."""
+        result = np.full(len(ordinals), np.nan)
+        table = self.tables.get(calendar_type)
+        if table is None:
+            return result
+
+        first_ordinal, values = table
+        positions = ordinals - first_ordinal
+        in_range = valid & (positions >= 0) & (positions < len(values))
+        result[in_range] = values[positions[in_range]]
+        return result
+
+    def lookup(self, date_value):
+        """
+        Get the shadow values of both calendar types for a specific date.
+
+        Args:
+            date_value: Date string in format 'YYYY-MM-DD' or a date object
+
+        Returns:
+            tuple: (diwali_days, financial_days), either of which may be None
+        """
+        return self.get('diwali', date_value), self.get('financial', date_value)
+
+    def lookup_many(self, dates):
+        """
+        Get the shadow values of both calendar types for an array of dates.
+
+        Args:
+            dates: Iterable of 'YYYY-MM-DD' strings or datetime-like values
+
+        Returns:
+            tuple: (diwali_days, financial_days) float arrays with NaN for missing values
+        """
+        ordinals, valid = to_day_ordinals(dates)
+        return self._take('diwali', ordinals, valid), self._take('financial', ordinals, valid)
@@ -0,0 +1,349 @@
+"""
+Bulk transaction import for the Interest Calendar Ledger application.
+A bank statement is converted to transactions column by column: dates are
+parsed once per column, Issue/Receipt amounts are split into paid and received
+transactions with array operations, and interest is computed for all rows at
+once. Rows that can't be imported are reported in a rejected-rows table.
+Large statements can be read and converted in fixed-size chunks.
+"""
+
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from ..utils.helpers import num_to_words_rupees_batch
+
+# Statement columns the import reads by name; the monthly rate is the last column
+REQUIRED_COLUMNS = ['Issue', 'Receipt', 'No of Days']
+
+# Date formats tried, in order, before falling back to day-first parsing.
+# ISO dates read the same either way, so they are parsed in bulk as well.
+STATEMENT_DATE_FORMATS = ('%d-%m-%Y', '%d/%m/%Y', '%Y-%m-%d')
+
+# Number of summary rows at the end of a statement that are not transactions
+SUMMARY_ROWS = 2
+
+REJECTED_COLUMNS = ['row', 'value', 'reason']
+
+# Statement rows converted and stored at a time by the streaming import
+IMPORT_CHUNK_SIZE = 5000
+
+
+def _parse_date_fallback(value):
+    """Parse a single date that matched none of the statement formats."""
+    try:
+        return pd.to_datetime(value, dayfirst=True)
+    except (ValueError, TypeError, OverflowError):
+        try:
+            return pd.to_datetime(value)
+        except (ValueError, TypeError, OverflowError):
+            return pd.NaT
+
+
+def parse_statement_dates(values):
+    """
+    Parse a column of statement dates, reading ambiguous dates day-first.
+
+    Date cells Excel already typed as dates are used as they are. Text is parsed
+    against each statement format for the whole column at once, and only the
+    values matching none of them are parsed individually.
+
+    Args:
+        values: Series of date cells
+
+    Returns:
+        Series: datetime64 values, NaT where the date could not be parsed
+    """
+    values = pd.Series(values, dtype=object)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+    is_datetime = values.map(lambda value: isinstance(value, (datetime, date, np.datetime64)))
+    if is_datetime.any():
+        parsed[is_datetime] = pd.to_datetime(values[is_datetime])
+
+    text = values[~is_datetime].astype(str).str.strip()
+    for date_format in STATEMENT_DATE_FORMATS:
+        remaining = parsed.isna() & ~is_datetime
+        if not remaining.any():
+            break
+        parsed[remaining] = pd.to_datetime(text[remaining], format=date_format, errors='coerce')
+
+    remaining = parsed.isna() & ~is_datetime
+    if remaining.any():
+        parsed[remaining] = pd.to_datetime(text[remaining], format='mixed', dayfirst=True, errors='coerce')
+
+    remaining = parsed.isna() & ~is_datetime
+    if remaining.any():
+        parsed[remaining] = pd.to_datetime(values[remaining].map(_parse_date_fallback))
+
+    return parsed
+
+
+def _to_number(values):
+    """
+    Convert a column to floats, treating blanks as 0.
+
+    Returns:
+        tuple: (numbers, invalid) where invalid marks the values that aren't numbers
+    """
+    numbers = pd.to_numeric(values, errors='coerce')
+    invalid = numbers.isna() & values.notna()
+    return numbers.fillna(0.0).astype(float), invalid
+
+
+def convert_statement(df, client_id, interest_service, next_id, timestamp=None, calendar_type=None):
+    """
+    Convert statement rows to transactions.
+
+    Each row becomes a paid transaction for its Issue amount and a received
+    transaction for its Receipt amount, in that order. The monthly rate in the
+    last column is converted to an annual rate.
+
+    Args:
+        df: Statement rows, without the trailing summary rows
+        client_id: The ID of the client for these transactions
+        interest_service: InterestService instance for calculations
+        next_id: ID for the first new transaction
+        timestamp: Timestamp recorded on the transactions; defaults to now
+        calendar_type: Calendar type to use; if None it is chosen from the first valid row
+
+    Returns:
+        tuple: (transactions, rejected, calendar_type) where transactions is a list of
+        transaction dictionaries, rejected a DataFrame of rows that could not be imported
+        with 'row', 'value' and 'reason' columns, and calendar_type the type used
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    # Rows without a date are blank lines, not errors
+    df = df[df.iloc[:, 0].notna()]
+
+    dates = parse_statement_dates(df.iloc[:, 0])
+    paid, invalid_paid = _to_number(df['Issue'])
+    received, invalid_received = _to_number(df['Receipt'])
+    days, invalid_days = _to_number(df['No of Days'])
+    monthly_rate, invalid_rate = _to_number(df.iloc[:, -1])
+
+    days = np.trunc(days)
+    annual_rate = monthly_rate * 12
+
+    # Each rejected row reports the first problem found, in column order
+    reasons = pd.Series('', index=df.index, dtype=object)
+    for invalid, reason in reversed([
+        (dates.isna(), "Invalid date"),
+        (invalid_paid, "Invalid Issue amount"),
+        (invalid_received, "Invalid Receipt amount"),
+        (invalid_days, "Invalid number of days"),
+        (invalid_rate, "Invalid interest rate")
+    ]):
+        reasons[invalid] = reason
+    rejected_mask = reasons != ''
+
+    rejected = pd.DataFrame({
+        'row': df.index[rejected_mask] + 1,
+        'value': df.iloc[:, 0][rejected_mask].astype(str),
+        'reason': reasons[rejected_mask]
+    }, columns=REJECTED_COLUMNS).reset_index(drop=True)
+
+    valid = ~rejected_mask
+    if calendar_type is None and valid.any():
+        # Diwali calendars use a base of 360 days, Financial calendars 365
+        calendar_type = "Diwali" if days[valid].iloc[0] <= 360 else "Financial"
+
+    rows = pd.DataFrame({
+        'position': np.arange(len(df)),
+        'date': dates.dt.strftime('%Y-%m-%d'),
+        'paid': paid,
+        'received': received,
+        'days': days,
+        'interest_rate': annual_rate
+    })[valid.to_numpy()]
+
+    # One transaction per non-zero amount: Issue (paid) first, then Receipt (received)
+    paid_rows = rows[rows['paid'] > 0].assign(side=0, amount=lambda r: r['paid'], received=0.0)
+    received_rows = rows[rows['received'] > 0].assign(side=1, amount=lambda r: r['received'], paid=0.0)
+    entries = pd.concat([paid_rows, received_rows]).sort_values(['position', 'side'], kind='mergesort')
+
+    if entries.empty:
+        return [], rejected, calendar_type
+
+    # Interest for all rows at once; negative for paid, positive for received
+    amount = entries['amount'].to_numpy()
+    interest = np.abs(interest_service.calculate_interest(
+        amount,
+        entries['interest_rate'].to_numpy(),
+        entries['days'].to_numpy(),
+        calendar_type
+    ))
+    interest = np.where(entries['side'].to_numpy() == 0, -interest, interest)
+
+    words = num_to_words_rupees_batch(amount)
+    timestamp = timestamp or datetime.now().isoformat()
+
+    transactions = [
+        {
+            "id": next_id + offset,
+            "client_id": client_id,
+            "date": date_str,
+            "received": received_value,
+            "paid": paid_value,
+            "amount_in_words": amount_words,
+            "interest_rate": rate,
+            "calendar_type": calendar_type,
+            "days": int(day_count),
+            "interest": interest_value,
+            "notes": "",
+            "timestamp": timestamp
+        }
+        for offset, (date_str, received_value, paid_value, amount_words, rate, day_count, interest_value) in enumerate(zip(
+            entries['date'].tolist(),
+            entries['received'].tolist(),
+            entries['paid'].tolist(),
+            words,
+            entries['interest_rate'].tolist(),
+            entries['days'].tolist(),
+            interest.tolist()
+        ))
+    ]
+    return transactions, rejected, calendar_type
+
+
+def read_statement(uploaded_file):
+    """
+    Read a statement file and drop blank rows and the trailing summary rows.
+
+    Args:
+        uploaded_file: Uploaded Excel or CSV file
+
+    Returns:
+        DataFrame: The statement rows
+    """
+    if uploaded_file.name.endswith('.csv'):
+        df = pd.read_csv(uploaded_file, header=0)
+    else:
+        df = pd.read_excel(uploaded_file, header=0)
+
+    df = df.dropna(how='all')
+    return df.iloc[:-SUMMARY_ROWS]
+
+
+def _hold_back_summary_rows(frames):
+    """
+    Drop blank rows from a stream of statement frames and hold back the last
+    summary rows, which are only known to be the last once the stream ends.
+    """
+    pending = None
+    for frame in frames:
+        frame = frame.dropna(how='all')
+        if pending is not None:
+            frame = pd.concat([pending, frame])
+        pending = frame.iloc[-SUMMARY_ROWS:]
+        rows = frame.iloc[:-SUMMARY_ROWS]
+        if not rows.empty:
+            yield rows
+
+
+def _read_csv_chunks(uploaded_file, chunk_size):
+    """Read a CSV statement in chunks, yielding (frame, progress) pairs."""
+    total = getattr(uploaded_file, 'size', None)
+    for frame in pd.read_csv(uploaded_file, header=0, chunksize=chunk_size):
+        progress = uploaded_file.tell() / total if total else None
+        yield frame, progress
+
+
+def _read_xlsx_chunks(uploaded_file, chunk_size):
+    """Read an XLSX statement row by row with openpyxl, yielding (frame, progress) pairs."""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+        total = worksheet.max_row - 1 if worksheet.max_row else None
+
+        def frame(batch, start):
+            return pd.DataFrame(batch, columns=columns, index=pd.RangeIndex(start, start + len(batch)))
+
+        start = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunk_size:
+                yield frame(batch, start), min(1.0, (start + len(batch)) / total) if total else None
+                start += len(batch)
+                batch = []
+        if batch:
+            yield frame(batch, start), 1.0
+    finally:
+        workbook.close()
+
+
+def iter_statement_chunks(uploaded_file, chunk_size=None):
+    """
+    Read a statement file in fixed-size chunks without loading it all at once.
+
+    CSV files are read with pandas in chunks and XLSX files row by row with openpyxl
+    in read-only mode. Other Excel formats are read whole and then split. Row labels
+    continue across chunks, so row numbers in rejected-row tables match the file.
+
+    Args:
+        uploaded_file: Uploaded Excel or CSV file
+        chunk_size: Number of statement rows per chunk
+
+    Yields:
+        tuple: (rows, progress) with a DataFrame of statement rows, without blank rows and
+        the trailing summary rows, and the fraction of the file read so far (or None)
+    """
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    progress = {'value': None}
+
+    def frames(source):
+        for frame, value in source:
+            progress['value'] = value
+            yield frame
+
+    name = uploaded_file.name.lower()
+    if name.endswith('.csv'):
+        source = _read_csv_chunks(uploaded_file, chunk_size)
+    elif name.endswith('.xlsx'):
+        source = _read_xlsx_chunks(uploaded_file, chunk_size)
+    else:
+        df = pd.read_excel(uploaded_file, header=0)
+        source = ((df.iloc[start:start + chunk_size], min(1.0, (start + chunk_size) / len(df)))
+                  for start in range(0, len(df), chunk_size))
+
+    for rows in _hold_back_summary_rows(frames(source)):
+        yield rows, progress['value']
+
+
+def convert_statement_chunks(uploaded_file, client_id, interest_service, next_id, chunk_size=None):
+    """
+    Convert a statement to transactions chunk by chunk.
+
+    The calendar type chosen from the first valid row and the next transaction ID
+    are carried from one chunk to the next, so the result is the same as converting
+    the whole statement at once.
+
+    Args:
+        uploaded_file: Uploaded Excel or CSV file
+        client_id: The ID of the client for these transactions
+        interest_service: InterestService instance for calculations
+        next_id: ID for the first new transaction
+        chunk_size: Number of statement rows per chunk
+
+    Yields:
+        tuple: (transactions, rejected, calendar_type, progress) for each chunk
+    """
+    calendar_type = None
+    timestamp = datetime.now().isoformat()
+
+    for rows, progress in iter_statement_chunks(uploaded_file, chunk_size):
+        transactions, rejected, calendar_type = convert_statement(
+            rows, client_id, interest_service, next_id, timestamp=timestamp, calendar_type=calendar_type
+        )
+        next_id += len(transactions)
+        yield transactions, rejected, calendar_type, progress
@@ -1,6 +1,7 @@
-from datetime import datetime
+import numpy as np
 import pandas as pd
 import streamlit as st
+from .calendar_lookup import CalendarLookup
 
 class InterestService:
     """Service for interest-related calculations and operations."""
@@ -9,56 +10,35 @@ class InterestService:
         """Initialize with interest calendars data."""
         self.interest_calendars = interest_calendars or {}
     
+    @property
+    def calendar_lookup(self):
+        """Date-indexed shadow value lookup, built on first use if the loader did not provide one."""
+        lookup = self.interest_calendars.get('lookup')
+        if lookup is None:
+            lookup = CalendarLookup.from_calendars(self.interest_calendars)
+            self.interest_calendars['lookup'] = lookup
+        return lookup
+    
     def get_interest_value(self, date_str):
         """Get interest value from calendar for a specific date."""
         try:
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            year = date_obj.year
-            
-            # Initialize return values
-            diwali_days = None
-            financial_days = None
-            
-            # Check in Diwali calendar
-            if self.interest_calendars['merged_diwali'] is not None:
-                merged_diwali = self.interest_calendars['merged_diwali']
-                date_match = merged_diwali[merged_diwali['Date'].dt.date == date_obj.date()]
-                
-                if not date_match.empty:
-                    diwali_days = float(date_match['Shadow Value'].iloc[0])
-            
-            # Check in Financial calendar
-            if self.interest_calendars['merged_financial'] is not None:
-                merged_financial = self.interest_calendars['merged_financial']
-                date_match = merged_financial[merged_financial['Date'].dt.date == date_obj.date()]
-                
-                if not date_match.empty:
-                    financial_days = float(date_match['Shadow Value'].iloc[0])
-            
-            # If we didn't find values in merged calendars, try by year range
-            if diwali_days is None and self.interest_calendars['diwali']:
-                for year_range, calendar in self.interest_calendars['diwali'].items():
-                    start_year, end_year = map(int, year_range.split('-'))
-                    if start_year <= year <= end_year:
-                        date_match = calendar[calendar['Date'].dt.date == date_obj.date()]
-                        if not date_match.empty:
-                            diwali_days = float(date_match['Shadow Value'].iloc[0])
-                            break
-            
-            if financial_days is None and self.interest_calendars['financial']:
-                for year_range, calendar in self.interest_calendars['financial'].items():
-                    start_year, end_year = map(int, year_range.split('-'))
-                    if start_year <= year <= end_year:
-                        date_match = calendar[calendar['Date'].dt.date == date_obj.date()]
-                        if not date_match.empty:
-                            financial_days = float(date_match['Shadow Value'].iloc[0])
-                            break
-            
-            return diwali_days, financial_days
+            return self.calendar_lookup.lookup(date_str)
         except Exception as e:
             st.error(f"Error getting shadow days value: {e}")
             return None, None
     
+    def get_interest_values(self, dates):
+        """
+        Get interest values from the calendars for an array of dates in one call.
+        
+        Args:
+            dates: Iterable of date strings in format 'YYYY-MM-DD'
+            
+        Returns:
+            tuple: (diwali_days, financial_days) float arrays with NaN where no calendar covers the date
+        """
+        return self.calendar_lookup.lookup_many(dates)
+    
     def calculate_interest(self, amount, rate, days, calendar_type="Diwali"):
         """Calculate interest based on amount, rate, days and calendar type."""
         # Formula: (amount * rate * days) / (shadow value on first day of year)
@@ -81,39 +61,92 @@ class InterestService:
         if not transactions_data.get("transactions"):
             return transactions_data
         
-        for transaction in transactions_data["transactions"]:
-            date_str = transaction["date"]
-            diwali_days, financial_days = self.get_interest_value(date_str)
+        self.recalculate_transaction_interest(transactions_data["transactions"])
+        return transactions_data
+    
+    def calculate_interest_batch(self, dates, received, paid, interest_rates, calendar_types):
+        """
+        Calculate days and interest for a whole set of transactions at once.
+        
+        Shadow values are gathered for all dates in one lookup and the interest is
+        computed with array expressions, in the same order of operations as
+        calculate_interest so the results match the per-transaction path exactly.
+        
+        Args:
+            dates: Sequence of date strings in format 'YYYY-MM-DD'
+            received: Sequence of received amounts
+            paid: Sequence of paid amounts
+            interest_rates: Sequence of interest rates in percent
+            calendar_types: Sequence of calendar types ('Diwali' or 'Financial')
+            
+        Returns:
+            dict: 'days' and 'interest' float arrays, and a boolean 'valid' array marking
+            the transactions a calendar covers (days and interest are NaN elsewhere)
+        """
+        received = np.asarray(received, dtype=float)
+        paid = np.asarray(paid, dtype=float)
+        rates = np.asarray(interest_rates, dtype=float)
+        calendar_types = np.asarray(calendar_types, dtype=object)
+        
+        diwali_days, financial_days = self.get_interest_values(dates)
+        is_diwali = calendar_types == "Diwali"
+        is_financial = calendar_types == "Financial"
+        
+        days = np.where(is_diwali, diwali_days, np.where(is_financial, financial_days, np.nan))
+        valid = ~np.isnan(days)
+        first_day_value = np.where(is_financial, 365.0, 360.0)
+        
+        # Received entries earn interest, paid entries are charged it
+        is_paid = (received <= 0) & (paid > 0)
+        amount = np.abs(np.where(received > 0, received, -paid))
+        interest = (amount * (rates / 100.0) * days) / first_day_value
+        interest = np.where(is_paid, -interest, interest)
+        
+        # Python's round() is correctly rounded, np.round is not, so round per value
+        interest = np.array([round(value, 2) for value in interest.tolist()], dtype=float)
+        
+        return {"days": days, "interest": interest, "valid": valid}
+    
+    def recalculate_transaction_interest(self, transactions):
+        """
+        Recalculate days and interest in place for the given transactions.
+        
+        Args:
+            transactions: List of transaction dictionaries to update
             
-            if transaction["calendar_type"] == "Diwali" and diwali_days is not None:
-                transaction["days"] = float(diwali_days)
-                # Recalculate interest
-                amount = transaction["received"] if transaction["received"] > 0 else -transaction["paid"]
-                interest = self.calculate_interest(
-                    abs(amount),
-                    transaction["interest_rate"],
-                    diwali_days,
-                    "Diwali"
-                )
-                if amount < 0:  # For paid entries
-                    interest = -interest
-                transaction["interest"] = round(float(interest), 2)
+        Returns:
+            int: Number of transactions whose days or interest changed
+        """
+        if not transactions:
+            return 0
+        
+        try:
+            result = self.calculate_interest_batch(
+                [transaction["date"] for transaction in transactions],
+                [transaction["received"] for transaction in transactions],
+                [transaction["paid"] for transaction in transactions],
+                [transaction["interest_rate"] for transaction in transactions],
+                [transaction["calendar_type"] for transaction in transactions]
+            )
+        except Exception as e:
+            st.error(f"Error recalculating interest: {e}")
+            return 0
+        
+        changed = 0
+        days_column = result["days"].tolist()
+        interest_column = result["interest"].tolist()
+        
+        for index in np.flatnonzero(result["valid"]).tolist():
+            transaction = transactions[index]
+            days = days_column[index]
+            interest = interest_column[index]
             
-            elif transaction["calendar_type"] == "Financial" and financial_days is not None:
-                transaction["days"] = float(financial_days)
-                # Recalculate interest
-                amount = transaction["received"] if transaction["received"] > 0 else -transaction["paid"]
-                interest = self.calculate_interest(
-                    abs(amount),
-                    transaction["interest_rate"],
-                    financial_days,
-                    "Financial"
-                )
-                if amount < 0:  # For paid entries
-                    interest = -interest
-                transaction["interest"] = round(float(interest), 2)
+            if transaction.get("days") != days or transaction.get("interest") != interest:
+                changed += 1
+            transaction["days"] = days
+            transaction["interest"] = interest
         
-        return transactions_data
+        return changed
     
     def format_calendar_for_display(self, calendar_df):
         """Format calendar dataframe for display in the UI."""
@@ -166,3 +199,52 @@ class InterestService:
                 pivot_df[col] = pivot_df[col].astype(float)
                 
         return pivot_df
+    
+    def apply_calendar_matrix(self, calendar_df, matrix):
+        """
+        Merge an edited day x month matrix back into a calendar.
+        
+        The matrix is melted to (date, value) pairs in one step and matched to
+        the calendar by date, so only cells whose value differs are written.
+        
+        Args:
+            calendar_df: Calendar DataFrame with 'Date', 'Shadow Value' and 'source_file' columns
+            matrix: DataFrame in the layout returned by format_calendar_for_display
+            
+        Returns:
+            tuple: (updated calendar DataFrame sorted by date, set of changed dates as Timestamps)
+        """
+        cells = matrix.rename_axis('day').reset_index().melt(
+            id_vars='day', var_name='month_year', value_name='value'
+        )
+        cells = cells.dropna(subset=['day', 'value'])
+        
+        # Days that don't exist in a month (e.g. 30 Feb) come out as NaT and are dropped
+        dates = pd.to_datetime(
+            cells['month_year'].astype(str) + '-' + cells['day'].astype(int).astype(str),
+            format='%b-%Y-%d', errors='coerce'
+        )
+        edits = pd.Series(cells['value'].astype(float).astype(int).to_numpy(), index=dates.to_numpy())
+        edits = edits[edits.index.notna()]
+        edits = edits[~edits.index.duplicated(keep='last')]
+        
+        updated_df = calendar_df.copy()
+        calendar_dates = updated_df['Date'].dt.normalize()
+        new_values = calendar_dates.map(edits)
+        changed = new_values.notna() & (new_values != updated_df['Shadow Value'])
+        updated_df.loc[changed, 'Shadow Value'] = new_values[changed].astype(int)
+        changed_dates = set(calendar_dates[changed])
+        
+        # Dates the calendar doesn't have yet are added in one go
+        added = edits[~edits.index.isin(calendar_dates)]
+        if not added.empty:
+            source_file = updated_df['source_file'].iloc[0] if not updated_df.empty else None
+            new_rows = pd.DataFrame({
+                'Date': added.index,
+                'Shadow Value': added.to_numpy(),
+                'source_file': source_file
+            })
+            updated_df = pd.concat([updated_df, new_rows], ignore_index=True)
+            changed_dates.update(added.index)
+        
+        return updated_df.sort_values('Date', kind='mergesort'), changed_dates
@@ -0,0 +1,141 @@
+"""
+Process-wide ledger cache for the Interest Calendar Ledger application.
+All Streamlit sessions share one parsed copy of the clients, the transactions
+and their LedgerIndex. The copy is reloaded only when the stores' version
+counters show that another process saved, or when the files were changed
+outside the app; saves made through the shared copy keep it current.
+"""
+
+import threading
+import streamlit as st
+from ..data.data_loader import (
+    load_clients, load_transactions, save_transactions,
+    load_recalc_state, save_recalc_state, storage_versions, storage_stamps,
+    StaleDataError
+)
+from .recalculation import RecalculationTracker, recalculate_ledger_transactions
+from .ledger_index import LedgerIndex
+
+
+class LedgerCache:
+    """
+    Holds the shared ledger and decides when it has to be reloaded.
+
+    Loaded data carries the store versions it was read at, and every save
+    through it moves those versions on, so the copy is current exactly when
+    its versions match the stores'.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients_data = None
+        self._transactions_data = None
+        self._ledger = None
+        self._calendar_fingerprints = None
+        # Store versions and file stamps as of the last load or save seen here
+        self._versions = None
+        self._stamps = None
+
+    def _data_versions(self):
+        return self._clients_data.get("version"), self._transactions_data.get("version")
+
+    def _is_current(self):
+        """Check whether the shared copy still matches what is stored."""
+        if self._ledger is None or storage_versions() != self._data_versions():
+            return False
+
+        stamps = storage_stamps()
+        if stamps != self._stamps:
+            # Files change with every save; only changes without a save through this copy are foreign
+            if self._data_versions() == self._versions:
+                return False
+            self._versions = self._data_versions()
+            self._stamps = stamps
+        return True
+
+    def _recalculate(self, interest_service, calendar_fingerprints):
+        """
+        Recalculate interest for transactions whose inputs or calendar dates changed.
+
+        Before the shared ledger is built the loaded transactions are updated in
+        place; once sessions read it, changes go through the ledger instead.
+        """
+        tracker = RecalculationTracker(load_recalc_state())
+        if self._ledger is None:
+            transactions = self._transactions_data.get("transactions", [])
+        else:
+            transactions = self._ledger.transactions_between()
+        dirty_transactions = tracker.find_dirty_transactions(transactions, calendar_fingerprints)
+
+        if dirty_transactions:
+            with st.spinner("Updating calculations..."):
+                try:
+                    if self._ledger is None:
+                        if interest_service.recalculate_transaction_interest(dirty_transactions):
+                            save_transactions(self._transactions_data)
+                    else:
+                        dirty_transactions, _ = recalculate_ledger_transactions(
+                            self._ledger, interest_service, dirty_transactions
+                        )
+                except StaleDataError:
+                    # Another process saved first; nothing is recorded, so its ledger is
+                    # recalculated on the next load
+                    return
+        if tracker.record(dirty_transactions, calendar_fingerprints):
+            save_recalc_state(tracker.state)
+        self._calendar_fingerprints = dict(calendar_fingerprints)
+
+    def get(self, interest_service, calendar_fingerprints):
+        """
+        Get the shared ledger, loading or recalculating it first if needed.
+
+        Args:
+            interest_service: InterestService with the current calendars
+            calendar_fingerprints: Fingerprints of the calendars loaded now
+
+        Returns:
+            tuple: (clients_data, transactions_data, ledger)
+        """
+        with self._lock:
+            if not self._is_current():
+                self._ledger = None
+                self._clients_data = load_clients()
+                self._transactions_data = load_transactions()
+                self._recalculate(interest_service, calendar_fingerprints)
+                self._ledger = LedgerIndex(self._clients_data, self._transactions_data)
+                self._versions = self._data_versions()
+                self._stamps = storage_stamps()
+            elif calendar_fingerprints != self._calendar_fingerprints:
+                # A calendar changed; updates go through the shared ledger, which keeps its totals in step
+                self._recalculate(interest_service, calendar_fingerprints)
+            return self._clients_data, self._transactions_data, self._ledger
+
+    def clear(self):
+        """Drop the shared copy, e.g. after a failed save left it with unsaved changes."""
+        with self._lock:
+            self._ledger = None
+
+
+@st.cache_resource(show_spinner=False)
+def ledger_cache():
+    """The LedgerCache shared by every session of this server process."""
+    return LedgerCache()
+
+
+def get_shared_ledger(interest_service, interest_calendars):
+    """
+    Get the ledger shared by all sessions.
+
+    Args:
+        interest_service: InterestService with the current calendars
+        interest_calendars: Dictionary containing calendar data
+
+    Returns:
+        tuple: (clients_data, transactions_data, ledger)
+    """
+    return ledger_cache().get(interest_service, interest_calendars.get('fingerprints', {}))
+
+
+def invalidate_shared_ledger():
+    """Make the next request reload the ledger from storage."""
+    ledger_cache().clear()
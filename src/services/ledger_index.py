@@ -0,0 +1,427 @@
+"""
+In-memory indexes over the loaded ledger for the Interest Calendar Ledger application.
+Transactions are indexed by ID, by client and by date, and clients by ID and
+name, so lookups don't scan the whole ledger. Ledger and per-client totals are
+kept alongside the indexes, and a columnar grid of the transactions is built
+when first needed. Changes made through the index are persisted with
+the row-level storage functions and update the indexes and totals in place
+instead of rebuilding them.
+"""
+
+import math
+import threading
+from bisect import bisect_left, bisect_right, insort
+from .transaction_grid import TransactionGrid
+from ..data.data_loader import (
+    save_clients, save_transactions, add_transactions, update_transactions, delete_transactions
+)
+
+
+# Summed transaction fields
+_AMOUNT_FIELDS = ("received", "paid", "interest")
+
+
+def _empty_totals():
+    """Running totals: each amount as the partials of an exact sum, and the transaction count."""
+    return {"received": [], "paid": [], "interest": [], "count": 0}
+
+
+def _add_exact(partials, value):
+    """
+    Add a value to a sum kept as non-overlapping partials, as math.fsum does.
+
+    The partials hold the sum without rounding error, so adding and later
+    taking away a transaction's amounts leaves the sum exactly as it was.
+    """
+    i = 0
+    for partial in partials:
+        if abs(value) < abs(partial):
+            value, partial = partial, value
+        high = value + partial
+        low = partial - (high - value)
+        if low:
+            partials[i] = low
+            i += 1
+        value = high
+    partials[i:] = [value]
+
+
+def _to_paisa(partials):
+    """Round an exact sum to 2 decimals; adding 0.0 turns -0.0 into 0.0."""
+    return round(math.fsum(partials), 2) + 0.0
+
+
+def _with_balance(totals):
+    """Running totals rounded to the paisa, with the principal and balance added."""
+    paid = [-partial for partial in totals["paid"]]
+    result = {field: _to_paisa(totals[field]) for field in _AMOUNT_FIELDS}
+    result["count"] = totals["count"]
+    result["principal"] = _to_paisa(totals["received"] + paid)
+    result["balance"] = _to_paisa(totals["received"] + paid + totals["interest"])
+    return result
+
+
+class LedgerIndex:
+    """
+    Hash indexes by transaction ID, client ID and client name, a sorted
+    (date, id) index for date range queries, monotonic ID counters, and
+    running totals for the whole ledger and for each client.
+
+    The index wraps the clients_data and transactions_data dictionaries it was
+    built from; all changes should go through its methods to keep it in step.
+    Changes and queries are serialized, since one index can be shared by
+    several sessions; queries wait for a change being saved to finish.
+    """
+
+    def __init__(self, clients_data, transactions_data):
+        """
+        Build the indexes.
+
+        Args:
+            clients_data: Client data dictionary with a 'clients' list
+            transactions_data: Transaction data dictionary with a 'transactions' list
+        """
+        self.clients_data = clients_data
+        self.transactions_data = transactions_data
+        self._lock = threading.RLock()
+
+        self._clients_by_id = {}
+        self._clients_by_name = {}
+        for client in clients_data.get("clients", []):
+            self._index_client(client)
+        self._reset_transaction_indexes()
+        for transaction in transactions_data.get("transactions", []):
+            self._index_transaction(transaction)
+        self._date_keys.sort()
+
+        self._next_client_id = max(self._clients_by_id, default=0) + 1
+        self._next_transaction_id = max(self._transactions_by_id, default=0) + 1
+
+    # Index maintenance
+
+    @staticmethod
+    def _date_key(transaction):
+        """Key of a transaction in the date index."""
+        return (transaction.get("date") or "", transaction.get("id"))
+
+    def _reset_transaction_indexes(self):
+        self._transactions_by_id = {}
+        self._transaction_ids_by_client = {}
+        self._date_keys = []
+        self._totals = _empty_totals()
+        self._client_totals = {}
+        self._grid = None
+
+    def _index_client(self, client):
+        self._clients_by_id[client.get("id")] = client
+        self._clients_by_name[client.get("name")] = client
+
+    def _unindex_client(self, client):
+        self._clients_by_id.pop(client.get("id"), None)
+        if self._clients_by_name.get(client.get("name")) is client:
+            del self._clients_by_name[client.get("name")]
+
+    def _index_transaction(self, transaction, keep_sorted=False):
+        transaction_id = transaction.get("id")
+        self._transactions_by_id[transaction_id] = transaction
+        # A dict keeps each client's transactions in insertion order with O(1) removal
+        self._transaction_ids_by_client.setdefault(transaction.get("client_id"), {})[transaction_id] = None
+        if keep_sorted:
+            insort(self._date_keys, self._date_key(transaction))
+        else:
+            self._date_keys.append(self._date_key(transaction))
+        self._count(transaction, 1)
+        self._grid = None
+
+    def _unindex_transaction(self, transaction):
+        transaction_id = transaction.get("id")
+        self._transactions_by_id.pop(transaction_id, None)
+        self._transaction_ids_by_client.get(transaction.get("client_id"), {}).pop(transaction_id, None)
+        key = self._date_key(transaction)
+        position = bisect_left(self._date_keys, key)
+        if position < len(self._date_keys) and self._date_keys[position] == key:
+            del self._date_keys[position]
+        self._count(transaction, -1)
+        self._grid = None
+
+    def _count(self, transaction, sign):
+        """Add a transaction to (sign 1) or take it out of (sign -1) the running totals."""
+        client_totals = self._client_totals.setdefault(transaction.get("client_id"), _empty_totals())
+        for totals in (self._totals, client_totals):
+            for field in _AMOUNT_FIELDS:
+                _add_exact(totals[field], sign * float(transaction.get(field) or 0.0))
+            totals["count"] += sign
+
+    # Client queries
+
+    @property
+    def clients(self):
+        """All clients in their stored order."""
+        return self.clients_data.get("clients", [])
+
+    def client(self, client_id):
+        """Get a client by ID, or None."""
+        with self._lock:
+            return self._clients_by_id.get(client_id)
+
+    def client_by_name(self, name):
+        """Get a client by name, or None."""
+        with self._lock:
+            return self._clients_by_name.get(name)
+
+    def client_name(self, client_id, default=None):
+        """Get a client's name by ID, or the default if there is no such client."""
+        with self._lock:
+            client = self._clients_by_id.get(client_id)
+            return client.get("name") if client else default
+
+    def client_names(self):
+        """Dictionary mapping client IDs to names."""
+        with self._lock:
+            return {client_id: client.get("name") for client_id, client in self._clients_by_id.items()}
+
+    def next_client_id(self):
+        """ID for the next new client; IDs are never reused while the index lives."""
+        with self._lock:
+            return self._next_client_id
+
+    # Transaction queries
+
+    @property
+    def transactions(self):
+        """All transactions in their stored order."""
+        return self.transactions_data.get("transactions", [])
+
+    def transaction(self, transaction_id):
+        """Get a transaction by ID, or None."""
+        with self._lock:
+            return self._transactions_by_id.get(transaction_id)
+
+    def client_transaction_ids(self, client_id):
+        """IDs of a client's transactions."""
+        with self._lock:
+            return list(self._transaction_ids_by_client.get(client_id, ()))
+
+    def client_transactions(self, client_id):
+        """A client's transactions."""
+        with self._lock:
+            return [self._transactions_by_id[i] for i in self._transaction_ids_by_client.get(client_id, ())]
+
+    def transactions_between(self, start_date=None, end_date=None):
+        """
+        Get the transactions in a date range, in (date, id) order.
+
+        Args:
+            start_date: First date to include as 'YYYY-MM-DD', or None
+            end_date: Last date to include as 'YYYY-MM-DD', or None
+
+        Returns:
+            list: Transaction dictionaries
+        """
+        with self._lock:
+            low = 0 if start_date is None else bisect_left(self._date_keys, (start_date,))
+            # Every (end_date, id) key sorts before (end_date + '\uffff',)
+            high = len(self._date_keys) if end_date is None else bisect_right(self._date_keys, (end_date + "\uffff",))
+            return [self._transactions_by_id[transaction_id] for _, transaction_id in self._date_keys[low:high]]
+
+    def transactions_on(self, dates):
+        """
+        Get the transactions on any of the given dates.
+
+        Args:
+            dates: Iterable of 'YYYY-MM-DD' strings
+
+        Returns:
+            list: Transaction dictionaries in (date, id) order
+        """
+        with self._lock:
+            result = []
+            for date in sorted(set(dates)):
+                low = bisect_left(self._date_keys, (date,))
+                high = bisect_right(self._date_keys, (date + "\uffff",))
+                result.extend(self._transactions_by_id[transaction_id] for _, transaction_id in self._date_keys[low:high])
+            return result
+
+    def date_bounds(self):
+        """
+        Get the first and last transaction dates.
+
+        Returns:
+            tuple: (first, last) as 'YYYY-MM-DD' strings, or None if there are no dated transactions
+        """
+        with self._lock:
+            # Transactions without a date sort first, before every (date, id) key
+            first = bisect_left(self._date_keys, ("\x00",))
+            if first == len(self._date_keys):
+                return None
+            return self._date_keys[first][0], self._date_keys[-1][0]
+
+    def totals(self):
+        """
+        Get the ledger totals without adding up the transactions.
+
+        Returns:
+            dict: 'received', 'paid', 'interest', 'count', 'principal' and 'balance'
+        """
+        with self._lock:
+            return _with_balance(self._totals)
+
+    def client_totals(self, client_id):
+        """
+        Get a client's totals without adding up their transactions.
+
+        Returns:
+            dict: 'received', 'paid', 'interest', 'count', 'principal' and 'balance'
+        """
+        with self._lock:
+            return _with_balance(self._client_totals.get(client_id, _empty_totals()))
+
+    def grid(self):
+        """
+        Get the columnar grid of the transactions for filtering and paging.
+
+        The grid is built on first use and kept until a transaction is added,
+        changed or deleted; it is only read, so sessions can share it.
+
+        Returns:
+            TransactionGrid: Grid over all transactions
+        """
+        with self._lock:
+            if self._grid is None:
+                self._grid = TransactionGrid(self.transactions)
+            return self._grid
+
+    def next_transaction_id(self):
+        """ID for the next new transaction; IDs are never reused while the index lives."""
+        with self._lock:
+            return self._next_transaction_id
+
+    def recent_transactions(self, count):
+        """The latest transactions by date, newest first."""
+        with self._lock:
+            return [self._transactions_by_id[transaction_id] for _, transaction_id in reversed(self._date_keys[-count:])]
+
+    def latest_transaction(self):
+        """The transaction with the latest date, or None."""
+        with self._lock:
+            return self._transactions_by_id[self._date_keys[-1][1]] if self._date_keys else None
+
+    # Changes
+
+    def add_client(self, client):
+        """
+        Add a client and save the clients.
+
+        Args:
+            client: Client dictionary; an 'id' is assigned if it has none
+        """
+        with self._lock:
+            if client.get("id") is None:
+                client["id"] = self._next_client_id
+            self.clients_data.setdefault("clients", []).append(client)
+            self._index_client(client)
+            self._next_client_id = max(self._next_client_id, client["id"] + 1)
+            save_clients(self.clients_data)
+
+    def update_client(self, client_id, changes):
+        """
+        Apply changes to a client and save the clients.
+
+        Returns:
+            dict: The updated client, or None if there is no such client
+        """
+        with self._lock:
+            client = self._clients_by_id.get(client_id)
+            if client is None:
+                return None
+            self._unindex_client(client)
+            client.update(changes)
+            self._index_client(client)
+            save_clients(self.clients_data)
+            return client
+
+    def delete_client(self, client_id):
+        """Delete a client and all of their transactions."""
+        with self._lock:
+            self.delete_client_transactions(client_id)
+            client = self._clients_by_id.get(client_id)
+            if client is not None:
+                self._unindex_client(client)
+            self.clients_data["clients"] = [c for c in self.clients if c.get("id") != client_id]
+            save_clients(self.clients_data)
+
+    def add_transactions(self, new_transactions):
+        """
+        Add and persist new transactions.
+
+        Args:
+            new_transactions: Transaction dictionaries; IDs are assigned to those without
+                one, or whose ID was taken in the meantime by another session
+        """
+        with self._lock:
+            for transaction in new_transactions:
+                if transaction.get("id") is None or transaction["id"] in self._transactions_by_id:
+                    transaction["id"] = self._next_transaction_id
+                self._next_transaction_id = max(self._next_transaction_id, transaction["id"] + 1)
+            add_transactions(self.transactions_data, new_transactions)
+            for transaction in new_transactions:
+                self._index_transaction(transaction, keep_sorted=True)
+
+    def update_transactions(self, changes_by_id):
+        """
+        Apply and persist changes to several transactions.
+
+        Args:
+            changes_by_id: Dictionary mapping transaction IDs to dictionaries of fields to update
+
+        Returns:
+            list: The updated transactions
+        """
+        with self._lock:
+            changed = [self._transactions_by_id[i] for i in changes_by_id if i in self._transactions_by_id]
+            for transaction in changed:
+                self._unindex_transaction(transaction)
+            try:
+                return update_transactions(self.transactions_data, changes_by_id)
+            finally:
+                # Changes are applied before they are saved, so index them even if the save fails
+                for transaction in changed:
+                    self._index_transaction(transaction, keep_sorted=True)
+
+    def update_transaction(self, transaction_id, changes):
+        """
+        Apply and persist changes to one transaction.
+
+        Returns:
+            dict: The updated transaction, or None if there is no such transaction
+        """
+        updated = self.update_transactions({transaction_id: changes})
+        return updated[0] if updated else None
+
+    def delete_transactions(self, transaction_ids):
+        """Delete and persist the removal of transactions by ID."""
+        with self._lock:
+            transaction_ids = [i for i in transaction_ids if i in self._transactions_by_id]
+            for transaction_id in transaction_ids:
+                self._unindex_transaction(self._transactions_by_id[transaction_id])
+            delete_transactions(self.transactions_data, transaction_ids)
+
+    def delete_client_transactions(self, client_id):
+        """Delete all transactions of a client."""
+        self.delete_transactions(self.client_transaction_ids(client_id))
+
+    def delete_all_transactions(self):
+        """Delete every transaction."""
+        with self._lock:
+            self.transactions_data["transactions"] = []
+            self._reset_transaction_indexes()
+            save_transactions(self.transactions_data)
+
+    def delete_all_clients(self):
+        """Delete every client and all transactions."""
+        with self._lock:
+            self.delete_all_transactions()
+            self.clients_data["clients"] = []
+            self._clients_by_id = {}
+            self._clients_by_name = {}
+            save_clients(self.clients_data)
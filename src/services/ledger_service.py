@@ -0,0 +1,187 @@
+"""
+Ledger balance calculations for the Interest Calendar Ledger application.
+Running balances and per-client totals are computed with vectorized pandas
+operations so they stay fast on large ledgers.
+"""
+
+import pandas as pd
+
+
+def _movement(df, include_interest=True):
+    """Net effect of each transaction on the balance, treating missing amounts as 0."""
+    movement = df['received'].fillna(0) - df['paid'].fillna(0)
+    if include_interest and 'interest' in df.columns:
+        movement = movement + df['interest'].fillna(0)
+    return movement
+
+
+def calculate_running_balance(df, include_interest=True, per_client=False, column='running_balance'):
+    """
+    Add a running balance column to a transactions DataFrame.
+
+    Transactions are put in chronological order, with the transaction ID breaking
+    ties between transactions on the same date, and the balance is the cumulative
+    sum of received - paid (+ interest).
+
+    Args:
+        df: DataFrame of transactions with 'date', 'received' and 'paid' columns
+        include_interest: Whether interest counts towards the balance
+        per_client: Whether to keep a separate running balance for each client
+        column: Name of the running balance column to add
+
+    Returns:
+        DataFrame: A sorted copy of df with the 'date' column as datetime and the running balance added
+    """
+    result = df.copy()
+    result['date'] = pd.to_datetime(result['date'])
+
+    sort_columns = ['date', 'id'] if 'id' in result.columns else ['date']
+    result = result.sort_values(sort_columns, kind='mergesort')
+
+    movement = _movement(result, include_interest)
+    if per_client:
+        result[column] = movement.groupby(result['client_id']).cumsum()
+    else:
+        result[column] = movement.cumsum()
+    return result
+
+
+def get_client_stats(client_id, transactions_data, ledger=None):
+    """
+    Get the transaction totals and balance for a client.
+
+    Args:
+        client_id: ID of the client
+        transactions_data: Transaction data dictionary with a 'transactions' list
+        ledger: Optional LedgerIndex to read the client's running totals from instead
+
+    Returns:
+        dict: 'total_received', 'total_paid', 'total_interest', 'balance' and 'transaction_count'
+    """
+    if ledger is not None:
+        totals = ledger.client_totals(client_id)
+        return {
+            "total_received": totals["received"],
+            "total_paid": totals["paid"],
+            "total_interest": totals["interest"],
+            "balance": totals["balance"],
+            "transaction_count": totals["count"]
+        }
+
+    transactions = [t for t in transactions_data.get("transactions", []) if t.get("client_id") == client_id]
+    if not transactions:
+        return {
+            "total_received": 0.0,
+            "total_paid": 0.0,
+            "total_interest": 0.0,
+            "balance": 0.0,
+            "transaction_count": 0
+        }
+
+    df = pd.DataFrame(transactions, columns=['received', 'paid', 'interest'])
+    totals = df.fillna(0).sum()
+    return {
+        "total_received": float(totals['received']),
+        "total_paid": float(totals['paid']),
+        "total_interest": float(totals['interest']),
+        "balance": float(_movement(df).sum()),
+        "transaction_count": len(df)
+    }
+
+
+def calculate_client_balance(client_id, transactions_data, ledger=None):
+    """
+    Get the current balance of a client, including interest.
+
+    Args:
+        client_id: ID of the client
+        transactions_data: Transaction data dictionary with a 'transactions' list
+        ledger: Optional LedgerIndex to read the client's running totals from instead
+
+    Returns:
+        float: The client's balance
+    """
+    return get_client_stats(client_id, transactions_data, ledger)["balance"]
+
+
+SUMMARY_COLUMNS = ['client_id', 'client_name', 'received', 'paid', 'interest',
+                   'principal', 'balance', 'interest_rate', 'transaction_count']
+
+
+def summarize_clients(clients_data, transactions_data):
+    """
+    Aggregate the transactions of every client in a single grouped pass.
+
+    Every client appears in the summary, with zeros if they have no transactions.
+    Transactions whose client no longer exists are kept as rows without a name,
+    so totals over the summary still cover the whole ledger.
+
+    Args:
+        clients_data: Client data dictionary with a 'clients' list
+        transactions_data: Transaction data dictionary with a 'transactions' list
+
+    Returns:
+        DataFrame: One row per client with 'client_id', 'client_name', 'received', 'paid',
+        'interest', 'principal' (received - paid), 'balance' (principal + interest),
+        'interest_rate' (rate of the most recent transaction) and 'transaction_count'
+    """
+    clients = clients_data.get("clients", [])
+    transactions = transactions_data.get("transactions", [])
+
+    summary = pd.DataFrame({
+        'client_id': [c.get("id") for c in clients],
+        'client_name': [c.get("name") for c in clients]
+    })
+
+    if transactions:
+        df = pd.DataFrame(transactions)
+        for column in ('received', 'paid', 'interest', 'interest_rate'):
+            if column not in df.columns:
+                df[column] = 0.0
+        df[['received', 'paid', 'interest']] = df[['received', 'paid', 'interest']].fillna(0)
+
+        grouped = df.groupby('client_id', sort=False)
+        totals = grouped[['received', 'paid', 'interest']].sum()
+        totals['transaction_count'] = grouped.size()
+
+        # The latest transaction by date sets the rate; on equal dates the earlier entry wins
+        latest = (df.sort_values('date', ascending=False, kind='mergesort')
+                    .drop_duplicates('client_id', keep='first')
+                    .set_index('client_id')['interest_rate'])
+        totals['interest_rate'] = latest
+
+        summary = summary.merge(totals, how='left', left_on='client_id', right_index=True)
+
+        # Keep transactions of removed clients at the end, in ledger order
+        orphans = totals[~totals.index.isin(summary['client_id'])]
+        if not orphans.empty:
+            orphans = orphans.rename_axis('client_id').reset_index()
+            orphans['client_name'] = None
+            summary = pd.concat([summary, orphans], ignore_index=True)
+
+    for column in ('received', 'paid', 'interest', 'interest_rate', 'transaction_count'):
+        if column not in summary.columns:
+            summary[column] = 0
+        summary[column] = summary[column].fillna(0)
+
+    summary['transaction_count'] = summary['transaction_count'].astype(int)
+    summary['principal'] = summary['received'] - summary['paid']
+    summary['balance'] = summary['principal'] + summary['interest']
+    return summary[SUMMARY_COLUMNS].reset_index(drop=True)
+
+
+def get_summary_row(client_summary, client_id):
+    """
+    Get the summary of one client.
+
+    Args:
+        client_summary: DataFrame returned by summarize_clients
+        client_id: ID of the client
+
+    Returns:
+        dict: The client's summary row, or None if the client is not in the summary
+    """
+    rows = client_summary[client_summary['client_id'] == client_id]
+    if rows.empty:
+        return None
+    return rows.iloc[0].to_dict()
@@ -0,0 +1,191 @@
+"""
+Dirty tracking for interest recalculation in the Interest Calendar Ledger application.
+Only transactions whose inputs changed, or whose date falls in a calendar range
+that changed since the last run, need their interest recalculated.
+After a calendar edit, only the transactions on the edited dates are recalculated.
+"""
+
+import hashlib
+
+
+def transaction_fingerprint(transaction):
+    """
+    Fingerprint the fields that determine a transaction's interest.
+
+    The last computed days and interest are included as well, so a row edited
+    elsewhere is brought back in line exactly as a full recalculation would.
+
+    Args:
+        transaction: Transaction dictionary
+
+    Returns:
+        str: Short hex digest of the transaction's interest inputs
+    """
+    key = (
+        transaction.get("date"),
+        transaction.get("received"),
+        transaction.get("paid"),
+        transaction.get("interest_rate"),
+        transaction.get("calendar_type"),
+        transaction.get("days"),
+        transaction.get("interest"),
+    )
+    return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+
+
+def changed_calendar_ranges(previous, current):
+    """
+    Find the date ranges covered by calendar files that were added, removed or edited.
+
+    Args:
+        previous: Calendar fingerprints recorded by the last recalculation
+        current: Calendar fingerprints of the calendars loaded now
+
+    Returns:
+        dict: Calendar type ('diwali' or 'financial') to a list of (start, end) date strings
+    """
+    ranges = {}
+    for filename in set(previous) | set(current):
+        old = previous.get(filename)
+        new = current.get(filename)
+        if old and new and old == new:
+            continue
+
+        # Both the old and the new extent of a changed file may have moved values
+        for fingerprint in (old, new):
+            if fingerprint and fingerprint.get("start") and fingerprint.get("end"):
+                ranges.setdefault(fingerprint["type"], []).append(
+                    (fingerprint["start"], fingerprint["end"])
+                )
+    return ranges
+
+
+def recalculate_calendar_dates(ledger, interest_service, changed_dates):
+    """
+    Recalculate the transactions on edited calendar dates and persist the ones that changed.
+
+    Args:
+        ledger: LedgerIndex of the loaded ledger
+        interest_service: InterestService with the edited calendars loaded
+        changed_dates: Dictionary mapping calendar type ('diwali' or 'financial') to the
+            edited dates, as 'YYYY-MM-DD' strings or datetime-like values
+
+    Returns:
+        int: Number of transactions whose days or interest changed
+    """
+    affected = []
+    for calendar_type, dates in changed_dates.items():
+        dates = [d if isinstance(d, str) else d.strftime("%Y-%m-%d") for d in dates]
+        affected.extend(
+            t for t in ledger.transactions_on(dates)
+            if str(t.get("calendar_type", "")).lower() == calendar_type.lower()
+        )
+    _, changed = recalculate_ledger_transactions(ledger, interest_service, affected)
+    return changed
+
+
+def recalculate_ledger_transactions(ledger, interest_service, transactions):
+    """
+    Recalculate transactions of a ledger and persist the ones whose days or interest changed.
+
+    The recalculation runs on copies, and the results go in through the ledger's
+    update, so sessions reading the ledger meanwhile see either the old or the new
+    values, with matching totals.
+
+    Args:
+        ledger: LedgerIndex the transactions belong to
+        interest_service: InterestService with the current calendars
+        transactions: Transaction dictionaries of the ledger to recalculate
+
+    Returns:
+        tuple: (recalculated, changed) with the recalculated copies and the number
+        of transactions whose days or interest changed
+
+    Raises:
+        StaleDataError: If another session saved the transactions since they were loaded
+    """
+    recalculated = [dict(t) for t in transactions]
+    if not recalculated or not interest_service.recalculate_transaction_interest(recalculated):
+        return recalculated, 0
+
+    changes = {
+        new["id"]: {"days": new["days"], "interest": new["interest"]}
+        for old, new in zip(transactions, recalculated)
+        if (old.get("days"), old.get("interest")) != (new.get("days"), new.get("interest"))
+    }
+    ledger.update_transactions(changes)
+    return recalculated, len(changes)
+
+
+class RecalculationTracker:
+    """
+    Tracks which transactions need their interest recalculated.
+    Holds the fingerprints recorded by the last recalculation run.
+    """
+
+    def __init__(self, state=None):
+        """
+        Initialize a RecalculationTracker object.
+
+        Args:
+            state: Dictionary with 'calendars' and 'transactions' fingerprints
+        """
+        state = state or {}
+        self.calendars = dict(state.get("calendars", {}))
+        self.transactions = dict(state.get("transactions", {}))
+        self._fingerprints = {}
+
+    @property
+    def state(self):
+        """Dictionary representation of the tracker, suitable for saving."""
+        return {"calendars": self.calendars, "transactions": self.transactions}
+
+    def find_dirty_transactions(self, transactions, calendar_fingerprints):
+        """
+        Find the transactions whose interest has to be recalculated.
+
+        Args:
+            transactions: List of transaction dictionaries
+            calendar_fingerprints: Fingerprints of the calendars loaded now
+
+        Returns:
+            list: The transactions that need recalculation
+        """
+        ranges = changed_calendar_ranges(self.calendars, calendar_fingerprints)
+
+        dirty = []
+        self._fingerprints = {}
+        for transaction in transactions:
+            key = str(transaction.get("id"))
+            fingerprint = transaction_fingerprint(transaction)
+            self._fingerprints[key] = fingerprint
+
+            if self.transactions.get(key) != fingerprint:
+                dirty.append(transaction)
+                continue
+
+            calendar_type = str(transaction.get("calendar_type", "")).lower()
+            date_str = transaction.get("date", "")
+            if any(start <= date_str <= end for start, end in ranges.get(calendar_type, ())):
+                dirty.append(transaction)
+
+        return dirty
+
+    def record(self, dirty_transactions, calendar_fingerprints):
+        """
+        Record the state after the dirty transactions were recalculated.
+
+        Args:
+            dirty_transactions: Transactions returned by find_dirty_transactions, now recalculated
+            calendar_fingerprints: Fingerprints of the calendars used for the recalculation
+
+        Returns:
+            bool: True if the recorded state changed and should be saved
+        """
+        for transaction in dirty_transactions:
+            self._fingerprints[str(transaction.get("id"))] = transaction_fingerprint(transaction)
+
+        changed = (self._fingerprints != self.transactions or calendar_fingerprints != self.calendars)
+        self.transactions = self._fingerprints
+        self.calendars = dict(calendar_fingerprints)
+        return changed
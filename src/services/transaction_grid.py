@@ -0,0 +1,200 @@
+"""
+Paginated transaction grid for the Interest Calendar Ledger application.
+The ledger is held as NumPy columns in chronological order, so filtering by
+client, date range and type, sorting and totals work on arrays, and only the
+rows of the page being shown are turned into a DataFrame.
+"""
+
+import numpy as np
+import pandas as pd
+
+TRANSACTION_TYPES = ["All", "Received Only", "Paid Only", "With Interest"]
+
+SORT_ORDERS = ["Oldest first", "Newest first"]
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def _amounts(values):
+    """A float column with missing amounts as 0."""
+    return np.nan_to_num(np.array(values, dtype=float), nan=0.0)
+
+
+def _prefix_sums(values):
+    """Cumulative sums with a leading 0, so sum(values[a:b]) is sums[b] - sums[a]."""
+    return np.concatenate(([0.0], np.cumsum(values)))
+
+
+class TransactionGrid:
+    """
+    Columnar index of the ledger in (date, id) order.
+
+    The positions of each client's rows are kept in chronological order, so a
+    client and date range filter is two binary searches. Prefix sums give the
+    totals of a date range over all clients without adding up its rows.
+    """
+
+    def __init__(self, transactions):
+        """
+        Build the grid.
+
+        Args:
+            transactions: List of transaction dictionaries
+        """
+        def column(key, default=None):
+            return [t.get(key, default) for t in transactions]
+
+        ids = np.array(column("id", 0), dtype=np.int64)
+        dates = pd.to_datetime(
+            pd.Series(column("date"), dtype=object), format="%Y-%m-%d", errors="coerce"
+        ).to_numpy(dtype="datetime64[D]")
+
+        # Chronological order, with the ID breaking ties between transactions on the same date
+        order = np.lexsort((ids, dates))
+
+        self.transactions = [transactions[i] for i in order]
+        self.ids = ids[order]
+        self.dates = dates[order]
+        self.client_ids = np.array(column("client_id"), dtype=object)[order]
+        self.received = _amounts(column("received"))[order]
+        self.paid = _amounts(column("paid"))[order]
+        self.interest = _amounts(column("interest"))[order]
+        self.movement = self.received - self.paid + self.interest
+
+        self._sums = {
+            "received": _prefix_sums(self.received),
+            "paid": _prefix_sums(self.paid),
+            "interest": _prefix_sums(self.interest)
+        }
+
+        # Positions of each client's rows, still in chronological order
+        self._client_positions = {}
+        if len(self.transactions):
+            by_client = pd.Series(np.arange(len(self.transactions))).groupby(self.client_ids, sort=False)
+            for client_id, positions in by_client:
+                self._client_positions[client_id] = positions.to_numpy()
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def date_bounds(self):
+        """
+        Get the first and last transaction dates.
+
+        Returns:
+            tuple: (first, last) as datetime.date, or None if the grid is empty
+        """
+        dates = self.dates[~np.isnat(self.dates)]
+        if not len(dates):
+            return None
+        return pd.Timestamp(dates[0]).date(), pd.Timestamp(dates[-1]).date()
+
+    def filter(self, client_id=None, start_date=None, end_date=None, transaction_type="All"):
+        """
+        Find the rows matching the filters.
+
+        Args:
+            client_id: Only rows of this client, or None for all clients
+            start_date: First date to include, or None
+            end_date: Last date to include, or None
+            transaction_type: One of TRANSACTION_TYPES
+
+        Returns:
+            numpy.ndarray: Positions of the matching rows in chronological order
+        """
+        if client_id is None:
+            positions = None
+            dates = self.dates
+        else:
+            positions = self._client_positions.get(client_id, np.array([], dtype=np.int64))
+            dates = self.dates[positions]
+
+        low = 0 if start_date is None else np.searchsorted(dates, np.datetime64(start_date, "D"), side="left")
+        high = len(dates) if end_date is None else np.searchsorted(dates, np.datetime64(end_date, "D"), side="right")
+        positions = np.arange(low, high) if positions is None else positions[low:high]
+
+        if transaction_type == "Received Only":
+            positions = positions[self.received[positions] > 0]
+        elif transaction_type == "Paid Only":
+            positions = positions[self.paid[positions] > 0]
+        elif transaction_type == "With Interest":
+            positions = positions[self.interest[positions] != 0]
+        return positions
+
+    def totals(self, positions):
+        """
+        Get the received, paid and interest totals of a set of rows.
+        Contiguous ranges, as left by a date filter on all clients, are read from prefix sums.
+
+        Args:
+            positions: Row positions returned by filter
+
+        Returns:
+            dict: 'received', 'paid', 'interest' and 'net' totals
+        """
+        if not len(positions):
+            totals = {"received": 0.0, "paid": 0.0, "interest": 0.0}
+        elif positions[-1] - positions[0] + 1 == len(positions):
+            first, last = positions[0], positions[-1] + 1
+            totals = {name: float(sums[last] - sums[first]) for name, sums in self._sums.items()}
+        else:
+            totals = {
+                "received": float(self.received[positions].sum()),
+                "paid": float(self.paid[positions].sum()),
+                "interest": float(self.interest[positions].sum())
+            }
+        totals["net"] = totals["received"] - totals["paid"] + totals["interest"]
+        return totals
+
+    def page(self, positions, page_number, page_size, newest_first=False, client_names=None):
+        """
+        Build the DataFrame for one page of rows.
+
+        The running balance is accumulated over all the filtered rows in
+        chronological order, whichever way the page is sorted.
+
+        Args:
+            positions: Row positions returned by filter
+            page_number: Page to build, starting at 1
+            page_size: Number of rows per page
+            newest_first: Whether to show the latest transactions first
+            client_names: Dictionary mapping client IDs to names for a 'client' column
+
+        Returns:
+            DataFrame: The page's transactions with 'date' as datetime and a 'running_balance' column
+        """
+        running_balance = np.cumsum(self.movement[positions])
+
+        order = np.arange(len(positions))
+        if newest_first:
+            order = order[::-1]
+        order = order[(page_number - 1) * page_size:page_number * page_size]
+
+        page_df = pd.DataFrame([self.transactions[i] for i in positions[order]])
+        if page_df.empty:
+            return page_df
+
+        page_df["date"] = pd.to_datetime(page_df["date"])
+        page_df["running_balance"] = running_balance[order]
+        if client_names is not None:
+            page_df["client"] = page_df["client_id"].map(client_names)
+        return page_df
+
+    def frame(self, positions):
+        """
+        Build a DataFrame of all the given rows, e.g. for printing or export.
+
+        Args:
+            positions: Row positions returned by filter
+
+        Returns:
+            DataFrame: The transactions in chronological order
+        """
+        if not len(positions):
+            return pd.DataFrame(columns=list(self.transactions[0].keys()) if self.transactions else [])
+        return pd.DataFrame([self.transactions[i] for i in positions])
+
+
+def page_count(row_count, page_size):
+    """Number of pages needed to show row_count rows, at least 1."""
+    return max(1, -(-row_count // page_size))
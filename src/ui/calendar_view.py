@@ -5,28 +5,17 @@ import os
 from streamlit_extras.colored_header import colored_header
 import streamlit.components.v1 as components
 from ..utils.helpers import format_calendar_for_display
+from ..utils.styles import register_style
 from ..services.interest_service import InterestService
-from ..data.data_loader import save_interest_calendar, save_transactions, load_transactions
+from ..services.calendar_intervals import CalendarIntervals
+from ..services.ledger_index import LedgerIndex
+from ..services.recalculation import recalculate_calendar_dates
+from ..data.data_loader import save_interest_calendar, load_clients, load_transactions, merge_interest_calendars, invalidate_calendar_cache
 from io import BytesIO
 import numpy as np
 
-def display_interest_calendars_tab(interest_calendars, interest_service):
-    """
-    Display the interest calendars tab with calendar management functionality.
-    
-    Args:
-        interest_calendars: Dictionary containing calendar data
-        interest_service: InterestService instance for calendar operations
-    """
-    # Use colored_header for consistent styling with other components
-    colored_header(
-        label="Interest Calendars Management",
-        description="View and edit your interest calendars for Diwali and Financial Year calculations",
-        color_name="gray-40"
-    )
-    
-    # Add custom CSS to style tab highlights with accent colors
-    st.markdown("""
+# Tab, calendar editor and radio styling of the calendars page
+register_style("calendar_tabs", """
     <style>
     /* Fix for duplicate highlight bars - explicitly target and hide all */
     .stTabs [data-baseweb="tab-highlight"] {
@@ -98,7 +87,23 @@ def display_interest_calendars_tab(interest_calendars, interest_service):
         background-color: rgba(75, 107, 251, 0.05) !important;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """, pages="calendars")
+
+def display_interest_calendars_tab(interest_calendars, interest_service, ledger=None):
+    """
+    Display the interest calendars tab with calendar management functionality.
+    
+    Args:
+        interest_calendars: Dictionary containing calendar data
+        interest_service: InterestService instance for calendar operations
+        ledger: Optional LedgerIndex used to recalculate transactions after a calendar edit
+    """
+    # Use colored_header for consistent styling with other components
+    colored_header(
+        label="Interest Calendars Management",
+        description="View and edit your interest calendars for Diwali and Financial Year calculations",
+        color_name="gray-40"
+    )
     
     if not interest_calendars:
         st.warning("No interest calendars found in the interest_calendars directory.")
@@ -152,26 +157,26 @@ def display_interest_calendars_tab(interest_calendars, interest_service):
                 if selected_type == 'diwali':
                     diwali_tab, financial_tab = st.tabs(calendar_types)
                     with diwali_tab:
-                        display_calendar_type_view(interest_calendars, interest_service, "diwali")
+                        display_calendar_type_view(interest_calendars, interest_service, "diwali", ledger)
                     with financial_tab:
-                        display_calendar_type_view(interest_calendars, interest_service, "financial")
+                        display_calendar_type_view(interest_calendars, interest_service, "financial", ledger)
                     # Clear the flag after using it
                     st.session_state['current_calendar_type'] = None
                 else:
                     financial_tab, diwali_tab = st.tabs(calendar_types)
                     with financial_tab:
-                        display_calendar_type_view(interest_calendars, interest_service, "financial")
+                        display_calendar_type_view(interest_calendars, interest_service, "financial", ledger)
                     with diwali_tab:
-                        display_calendar_type_view(interest_calendars, interest_service, "diwali")
+                        display_calendar_type_view(interest_calendars, interest_service, "diwali", ledger)
                     # Clear the flag after using it
                     st.session_state['current_calendar_type'] = None
             else:
                 # Normal tab selection
                 diwali_tab, financial_tab = st.tabs(calendar_types)
                 with diwali_tab:
-                    display_calendar_type_view(interest_calendars, interest_service, "diwali")
+                    display_calendar_type_view(interest_calendars, interest_service, "diwali", ledger)
                 with financial_tab:
-                    display_calendar_type_view(interest_calendars, interest_service, "financial")
+                    display_calendar_type_view(interest_calendars, interest_service, "financial", ledger)
         else:
             st.warning("No calendars available. Please upload a calendar file first.")
     
@@ -181,7 +186,7 @@ def display_interest_calendars_tab(interest_calendars, interest_service):
     with upload_tab:
         display_calendar_upload_section(interest_calendars)
 
-def display_calendar_type_view(interest_calendars, interest_service, calendar_type):
+def display_calendar_type_view(interest_calendars, interest_service, calendar_type, ledger=None):
     """Display view for a specific calendar type (Diwali or Financial)."""
     # Check if we need to show the newly created calendar
     if 'calendar_created' in st.session_state and st.session_state['calendar_created']:
@@ -198,9 +203,9 @@ def display_calendar_type_view(interest_calendars, interest_service, calendar_ty
                 st.session_state['selected_calendar'] = None
     
     # Display individual calendars directly without tabs
-    display_individual_calendars(interest_calendars, interest_service, calendar_type)
+    display_individual_calendars(interest_calendars, interest_service, calendar_type, ledger)
 
-def display_individual_calendars(interest_calendars, interest_service, calendar_type):
+def display_individual_calendars(interest_calendars, interest_service, calendar_type, ledger=None):
     """Display individual calendars for a specific calendar type."""
     # Create a selectbox to choose which calendar to view
     calendar_options = list(interest_calendars[calendar_type].keys())
@@ -320,7 +325,7 @@ def display_individual_calendars(interest_calendars, interest_service, calendar_
                                 st.session_state[update_ui_key] = True
                                 
                                 # Save changes immediately
-                                save_calendar_changes(edited_matrix, calendar_data, calendar_type, selected_calendar, interest_calendars, interest_service)
+                                save_calendar_changes(edited_matrix, calendar_data, calendar_type, selected_calendar, interest_calendars, interest_service, ledger)
                                 
                                 # Force rerun to update the UI
                                 st.rerun()
@@ -339,7 +344,7 @@ def display_individual_calendars(interest_calendars, interest_service, calendar_
                                         st.session_state[update_ui_key] = True
                                         
                                         # Save changes immediately
-                                        save_calendar_changes(edited_matrix, calendar_data, calendar_type, selected_calendar, interest_calendars, interest_service)
+                                        save_calendar_changes(edited_matrix, calendar_data, calendar_type, selected_calendar, interest_calendars, interest_service, ledger)
                                         
                                         # Force rerun to update the UI
                                         st.rerun()
@@ -545,7 +550,7 @@ def display_individual_calendars(interest_calendars, interest_service, calendar_
             
             if save_button:
                 # Save changes when save button is clicked
-                save_calendar_changes(edited_matrix, calendar_data, calendar_type, selected_calendar, interest_calendars, interest_service)
+                save_calendar_changes(edited_matrix, calendar_data, calendar_type, selected_calendar, interest_calendars, interest_service, ledger)
     else:
         st.warning(f"No {calendar_type.title()} calendars found.")
         
@@ -562,64 +567,45 @@ def display_individual_calendars(interest_calendars, interest_service, calendar_
         </div>
         """, unsafe_allow_html=True)
 
-def save_calendar_changes(edited_matrix, calendar_data, calendar_type, selected_calendar, interest_calendars, interest_service):
+def save_calendar_changes(edited_matrix, calendar_data, calendar_type, selected_calendar, interest_calendars, interest_service, ledger=None):
     """Save changes to the calendar file."""
     with st.spinner("Saving calendar and recalculating transactions..."):
         try:
-            # Get the original data format
-            updated_df = calendar_data.copy()
-            
-            # Update values based on the edited matrix
-            for day in edited_matrix.index:
-                for col in edited_matrix.columns:
-                    # Extract month and year from column name
-                    month_str, year_str = col.split('-')
-                    month_num = pd.to_datetime(month_str, format='%b').month
-                    year = int(year_str)
-                    
-                    value = edited_matrix.loc[day, col]
-                    if pd.notna(value):
-                        # Convert value to integer
-                        value = int(float(value))
-                        # Create the date to match
-                        match_date = pd.Timestamp(year=year, month=month_num, day=day).date()
-                        
-                        # Find any existing rows with this date
-                        mask = updated_df['Date'].dt.date == match_date
-                        
-                        if mask.any():
-                            # Update existing value
-                            updated_df.loc[mask, 'Shadow Value'] = value
-                        else:
-                            # Add new row
-                            new_row = pd.DataFrame({
-                                'Date': [pd.Timestamp(year=year, month=month_num, day=day)],
-                                'Shadow Value': [value],
-                                'source_file': [updated_df['source_file'].iloc[0]]  # Use the same source file
-                            })
-                            updated_df = pd.concat([updated_df, new_row], ignore_index=True)
-            
-            # Sort the DataFrame by date to ensure proper order
-            updated_df = updated_df.sort_values('Date')
+            # Merge the edited cells back into the calendar by date
+            updated_df, changed_dates = interest_service.apply_calendar_matrix(calendar_data, edited_matrix)
+            
+            if not changed_dates:
+                st.info("No calendar values were changed.")
+                return
             
             # Save the updated calendar
             if save_interest_calendar(updated_df):
-                # Reload transactions and recalculate interest values
-                transactions_data = load_transactions()
-                updated_transactions = interest_service.recalculate_all_transaction_interest(transactions_data)
-                save_transactions(updated_transactions)
-                
-                # Update the calendar data in memory
+                # Update the calendar data in memory and refresh the date lookup
+                # so the recalculation below sees the new shadow values
                 interest_calendars[calendar_type][selected_calendar] = updated_df
+                merge_interest_calendars(interest_calendars)
+                
+                # Only transactions of this calendar type dated on a changed cell can change
+                if ledger is None:
+                    ledger = LedgerIndex(load_clients(), load_transactions())
+                changed_count = recalculate_calendar_dates(ledger, interest_service, {calendar_type: changed_dates})
                 
                 # Show success message
-                st.success(f"✅ {calendar_type.title()} calendar for {selected_calendar} updated successfully! All transactions have been recalculated.")
+                st.success(f"✅ {calendar_type.title()} calendar for {selected_calendar} updated successfully! {changed_count} transaction(s) on the changed dates were recalculated.")
             else:
                 st.error("Failed to save calendar changes. Please try again.")
         except Exception as e:
             st.error(f"Error saving calendar changes: {str(e)}")
             st.error("Please check the console for more details.")
 
+def calendar_intervals(interest_calendars):
+    """Get the date ranges of the loaded calendars, building them if the loader did not."""
+    intervals = interest_calendars.get('intervals')
+    if intervals is None:
+        intervals = CalendarIntervals.from_calendars(interest_calendars)
+        interest_calendars['intervals'] = intervals
+    return intervals
+
 def display_create_calendar_section(interest_calendars):
     """Display the calendar creation section."""
     st.markdown("""
@@ -663,29 +649,24 @@ def display_create_calendar_section(interest_calendars):
         help="The shadow value for the first day. Subsequent days will automatically decrease by 1."
     )
     
+    # Point out the date ranges between existing calendars that no calendar covers yet
+    gaps = calendar_intervals(interest_calendars).gaps(calendar_type.lower())
+    if gaps:
+        st.caption("Dates not covered by any existing {} calendar: {}".format(
+            calendar_type, ", ".join(f"{start:%d-%m-%Y} to {end:%d-%m-%Y}" for start, end in gaps)
+        ))
+    
     if st.button("Create Calendar", type="primary", key="create_calendar_btn"):
         if start_date >= end_date:
             st.error("End date must be after start date.")
             return
         
         try:
-            # Check for date overlaps with existing calendars
-            has_overlap = False
-            overlapping_calendars = []
-            
-            # Generate the date range for the new calendar
-            new_dates = pd.date_range(start=start_date, end=end_date)
-            
-            # Check overlaps with existing calendars of the same type
-            if calendar_type.lower() in interest_calendars:
-                for existing_calendar_name, existing_calendar_data in interest_calendars[calendar_type.lower()].items():
-                    # Convert existing calendar dates to datetime if they're strings
-                    existing_dates = pd.to_datetime(existing_calendar_data['Date'])
-                    
-                    # Check for any overlap
-                    if any(date in existing_dates for date in new_dates):
-                        has_overlap = True
-                        overlapping_calendars.append(existing_calendar_name)
+            # Check for date overlaps with existing calendars of the same type
+            overlapping_calendars = calendar_intervals(interest_calendars).overlapping(
+                calendar_type.lower(), start_date, end_date
+            )
+            has_overlap = bool(overlapping_calendars)
             
             if has_overlap:
                 # Show error with details about overlapping calendars
@@ -734,6 +715,7 @@ def display_create_calendar_section(interest_calendars):
             
             # Save the file
             df.to_csv(file_path, index=False)
+            invalidate_calendar_cache()
             
             # Verify file was created
             if os.path.exists(file_path):
@@ -867,6 +849,22 @@ def display_calendar_upload_section(interest_calendars):
             # Add source file column for tracking
             df['source_file'] = target_filename
             
+            # The calendar with the same year range is replaced, so only the others can overlap
+            overlapping_calendars = [
+                name for name in calendar_intervals(interest_calendars).overlapping(
+                    final_type.lower(), df['Date'].min(), df['Date'].max()
+                )
+                if name != year_range
+            ]
+            if overlapping_calendars:
+                st.error(f"""
+                Cannot save calendar: Date range overlaps with existing calendar(s):
+                {', '.join(overlapping_calendars)}
+                
+                Please upload a calendar that doesn't overlap the existing calendar(s).
+                """)
+                return
+            
             # Confirm upload
             if st.button("Save Calendar", type="primary", key="save_uploaded_calendar"):
                 # Create directory if it doesn't exist
@@ -875,6 +873,7 @@ def display_calendar_upload_section(interest_calendars):
                 # Save to file
                 file_path = os.path.join("interest_calendars", target_filename)
                 df.to_csv(file_path, index=False)
+                invalidate_calendar_cache()
                 
                 st.success(f"✅ Calendar file '{target_filename}' saved successfully!")
                 st.info("The application will reload to include the new calendar.")
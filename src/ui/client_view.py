@@ -3,15 +3,66 @@ import pandas as pd
 from streamlit_extras.colored_header import colored_header
 from streamlit_extras.card import card
 from ..models.client import Client
-from ..data.data_loader import save_clients, save_transactions
 from ..services.interest_service import InterestService
+from ..services.ledger_service import calculate_client_balance, get_client_stats
+from ..services.ledger_index import LedgerIndex
 from ..utils.helpers import sanitize_html, num_to_words_rupees
+from ..utils.styles import register_style
 from datetime import datetime
-from ..ui.transaction_view import apply_tab_styling
 import streamlit.components.v1 as components
 
-def client_management(clients_data, transactions_data, interest_calendars=None):
+# Client card styling
+register_style("client_cards", """
+    <style>
+    /* Client card styling */
+    .client-card {
+        background-color: #ffffff !important;
+        border-radius: 0.8rem !important;
+        padding: 1.5rem !important;
+        margin-bottom: 1.5rem !important;
+        border: 1px solid #e0e6ef !important;
+        box-shadow: 0 4px 12px rgba(58, 90, 232, 0.08) !important;
+    }
+    
+    .client-card h2 {
+        color: #2c3e50 !important;
+        font-weight: 700 !important;
+        margin-bottom: 1rem !important;
+    }
+    
+    .client-card .client-label {
+        color: #485b73 !important;
+        font-weight: 600 !important;
+        font-size: 0.9rem !important;
+        margin-bottom: 0.2rem !important;
+    }
+    
+    .client-card .client-value {
+        color: #2c3e50 !important;
+        font-weight: 500 !important;
+        margin-bottom: 1rem !important;
+    }
+    
+    .client-info {
+        color: #2c3e50 !important;
+    }
+    
+    .client-id-badge {
+        background-color: rgba(75, 107, 251, 0.1) !important;
+        color: #4b6bfb !important;
+        padding: 0.3rem 0.8rem !important;
+        border-radius: 1rem !important;
+        font-size: 0.8rem !important;
+        font-weight: 700 !important;
+    }
+    </style>
+    """)
+
+def client_management(clients_data, transactions_data, interest_calendars=None, ledger=None):
     """Client management UI component."""
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
+    
     # Use colored_header instead of simple header
     colored_header(
         label="Clients Management",
@@ -43,10 +94,7 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
             
         def confirm_delete_all():
             # Delete all clients and their transactions
-            clients_data["clients"] = []
-            transactions_data["transactions"] = []
-            save_clients(clients_data)
-            save_transactions(transactions_data)
+            ledger.delete_all_clients()
             # Set the success flag instead of using st.success()
             st.session_state[success_key] = True
             # Keep the confirmation dialog open to show the success message
@@ -99,7 +147,6 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
     
     
     # Create tabs for different client functions
-    apply_tab_styling()
     tab1, tab2 = st.tabs(["📋 Client List", "✏️ Add New Client"])
     
     # Initialize interest service if calendars are provided
@@ -107,52 +154,6 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
     if interest_calendars:
         interest_service = InterestService(interest_calendars)
     
-    # Add custom styling for client cards
-    st.markdown("""
-    <style>
-    /* Client card styling */
-    .client-card {
-        background-color: #ffffff !important;
-        border-radius: 0.8rem !important;
-        padding: 1.5rem !important;
-        margin-bottom: 1.5rem !important;
-        border: 1px solid #e0e6ef !important;
-        box-shadow: 0 4px 12px rgba(58, 90, 232, 0.08) !important;
-    }
-    
-    .client-card h2 {
-        color: #2c3e50 !important;
-        font-weight: 700 !important;
-        margin-bottom: 1rem !important;
-    }
-    
-    .client-card .client-label {
-        color: #485b73 !important;
-        font-weight: 600 !important;
-        font-size: 0.9rem !important;
-        margin-bottom: 0.2rem !important;
-    }
-    
-    .client-card .client-value {
-        color: #2c3e50 !important;
-        font-weight: 500 !important;
-        margin-bottom: 1rem !important;
-    }
-    
-    .client-info {
-        color: #2c3e50 !important;
-    }
-    
-    .client-id-badge {
-        background-color: rgba(75, 107, 251, 0.1) !important;
-        color: #4b6bfb !important;
-        padding: 0.3rem 0.8rem !important;
-        border-radius: 1rem !important;
-        font-size: 0.8rem !important;
-        font-weight: 700 !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
     with tab2:
         # Check for success message from previous submission
         if st.session_state.get('client_added_success'):
@@ -212,7 +213,7 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
                     st.error("Client name is required!")
                 else:
                     new_client = {
-                        "id": len(clients_data.get("clients", [])) + 1,
+                        "id": ledger.next_client_id(),
                         "name": new_client_name,
                         "contact": new_client_contact,
                         "email": new_client_email,
@@ -220,12 +221,7 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
                         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     }
                     
-                    # Initialize clients list if not exists
-                    if "clients" not in clients_data:
-                        clients_data["clients"] = []
-                    
-                    clients_data["clients"].append(new_client)
-                    save_clients(clients_data)
+                    ledger.add_client(new_client)
                     
                     # Set success flag in session state for after rerun
                     st.session_state.client_added_success = True
@@ -274,8 +270,9 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
         </div>
         """, unsafe_allow_html=True)
         
-        # Display client cards
+        # Display client cards, with balances from the running totals of the index
         for i, row in client_df.iterrows():
+            balance = ledger.client_totals(row.get('id'))["balance"]
             # Create a container for each client to contain all elements
             with st.container():
                 # Main client content container
@@ -300,6 +297,10 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
                                     <p class="client-label">Email</p>
                                     <p class="client-value">{row['email'] if row['email'] else 'N/A'}</p>
                                 </div>
+                                <div style="min-width:200px;">
+                                    <p class="client-label">Balance</p>
+                                    <p class="client-value" style="color:{'#1e7e34' if balance >= 0 else '#dc3545'};">₹{balance:,.2f}</p>
+                                </div>
                             </div>
                             <div>
                                 <p class="client-label">Notes</p>
@@ -341,12 +342,8 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
                             )
                             
                             if confirm_del_trans:
-                                # Filter out transactions for this client
-                                transactions_data["transactions"] = [
-                                    t for t in transactions_data["transactions"] 
-                                    if t.get("client_id") != row.get('id')
-                                ]
-                                save_transactions(transactions_data)
+                                # Delete the transactions for this client
+                                ledger.delete_client_transactions(row.get('id'))
                                 st.success(f"✅ All transactions for {row['name']} have been deleted.")
                                 st.rerun()
                         
@@ -359,18 +356,8 @@ def client_management(clients_data, transactions_data, interest_calendars=None):
                             )
                             
                             if confirm_del_client:
-                                # Filter out this client
-                                clients_data["clients"] = [
-                                    c for c in clients_data["clients"] 
-                                    if c.get("id") != row.get('id')
-                                ]
-                                # Filter out transactions for this client
-                                transactions_data["transactions"] = [
-                                    t for t in transactions_data["transactions"] 
-                                    if t.get("client_id") != row.get('id')
-                                ]
-                                save_clients(clients_data)
-                                save_transactions(transactions_data)
+                                # Delete this client and their transactions
+                                ledger.delete_client(row.get('id'))
                                 st.success(f"✅ Client {row['name']} and all their transactions have been deleted.")
                                 st.rerun()
                 
@@ -455,8 +442,11 @@ def display_client_details(client, transactions_data):
     </div>
     """, unsafe_allow_html=True)
 
-def edit_client(clients_data, transactions_data, interest_calendars=None):
+def edit_client(clients_data, transactions_data, interest_calendars=None, ledger=None):
     """Client edit UI component."""
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
+    
     # Use colored_header for consistent styling
     colored_header(
         label="Edit Client",
@@ -479,13 +469,7 @@ def edit_client(clients_data, transactions_data, interest_calendars=None):
         return
     
     # Find the client in the clients_data
-    client = None
-    client_index = None
-    for i, c in enumerate(clients_data.get("clients", [])):
-        if c.get("id") == client_id:
-            client = c
-            client_index = i
-            break
+    client = ledger.client(client_id)
     
     if not client:
         st.error(f"Client with ID {client_id} not found!")
@@ -546,17 +530,13 @@ def edit_client(clients_data, transactions_data, interest_calendars=None):
             if not client_name:
                 st.error("Client name is required!")
             else:
-                # Update client data
-                client["name"] = client_name
-                client["contact"] = client_contact
-                client["email"] = client_email
-                client["notes"] = client_notes
-                
-                # Update the client in clients_data
-                clients_data["clients"][client_index] = client
-                
-                # Save clients data
-                save_clients(clients_data)
+                # Update and save the client data
+                ledger.update_client(client_id, {
+                    "name": client_name,
+                    "contact": client_contact,
+                    "email": client_email,
+                    "notes": client_notes
+                })
                 
                 st.success("✅ Client updated successfully!")
                 
@@ -596,8 +576,11 @@ def edit_client(clients_data, transactions_data, interest_calendars=None):
         st.session_state.nav_changed = True
         st.rerun()
 
-def display_client_row(client, transactions_data, all_clients_data):
+def display_client_row(client, transactions_data, all_clients_data, ledger=None):
     """Display a single client row with actions."""
+    if ledger is None:
+        ledger = LedgerIndex(all_clients_data, transactions_data)
+    
     with st.container():
         col1, col2 = st.columns([3, 1])
         
@@ -611,7 +594,7 @@ def display_client_row(client, transactions_data, all_clients_data):
             
             if is_expanded:
                 # Calculate client balance
-                balance = calculate_client_balance(client["id"], transactions_data)
+                balance = calculate_client_balance(client["id"], transactions_data, ledger)
                 
                 # Create an indented container for client details
                 with st.container():
@@ -817,12 +800,8 @@ def display_client_row(client, transactions_data, all_clients_data):
                         )
                         
                         if confirm_del_trans:
-                            # Filter out transactions for this client
-                            transactions_data["transactions"] = [
-                                t for t in transactions_data["transactions"] 
-                                if t.get("client_id") != client["id"]
-                            ]
-                            save_transactions(transactions_data)
+                            # Delete the transactions for this client
+                            ledger.delete_client_transactions(client["id"])
                             st.success(f"✅ All transactions for {client['name']} have been deleted.")
                             st.rerun()
                     
@@ -835,24 +814,14 @@ def display_client_row(client, transactions_data, all_clients_data):
                         )
                         
                         if confirm_del_client:
-                            # Filter out this client
-                            all_clients_data["clients"] = [
-                                c for c in all_clients_data["clients"] 
-                                if c.get("id") != client["id"]
-                            ]
-                            # Filter out transactions for this client
-                            transactions_data["transactions"] = [
-                                t for t in transactions_data["transactions"] 
-                                if t.get("client_id") != client["id"]
-                            ]
-                            save_clients(all_clients_data)
-                            save_transactions(transactions_data)
+                            # Delete this client and their transactions
+                            ledger.delete_client(client["id"])
                             st.success(f"✅ Client {client['name']} and all their transactions have been deleted.")
                             st.rerun()
         
         with col2:
             # Display client statistics
-            client_stats = get_client_stats(client["id"], transactions_data)
+            client_stats = get_client_stats(client["id"], transactions_data, ledger)
             
             # Format the display with color-coded values
             st.markdown(f"""
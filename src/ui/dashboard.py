@@ -1,15 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import altair as alt
 from datetime import datetime, timedelta
 from streamlit_extras.metric_cards import style_metric_cards
 from streamlit_extras.colored_header import colored_header
 from streamlit_extras.card import card
+from ..services.ledger_index import LedgerIndex
 
-def display_dashboard(transactions_data, clients_data, interest_calendars):
+def display_dashboard(transactions_data, clients_data, interest_calendars, ledger=None):
     """Display the dashboard overview with key metrics and recent activity."""
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
+    
     colored_header(
         label="Dashboard Overview",
         description="Key metrics and recent activity",
@@ -21,20 +22,19 @@ def display_dashboard(transactions_data, clients_data, interest_calendars):
     
     # Transaction metrics
     if transactions_data.get("transactions"):
-        df = pd.DataFrame(transactions_data["transactions"])
-        
-        total_received = df["received"].sum()
-        total_paid = df["paid"].sum()
-        total_interest = df["interest"].sum()
-        net_balance = total_received - total_paid + total_interest
+        # Ledger totals are kept up to date by the index, so nothing is added up here
+        totals = ledger.totals()
+        total_received = totals["received"]
+        total_paid = totals["paid"]
+        total_interest = totals["interest"]
+        net_balance = totals["balance"]
         
-        # Create dataframe for recent transactions
-        df["date"] = pd.to_datetime(df["date"])
-        recent_transactions = df.sort_values("date", ascending=False).head(5)
+        # Create dataframe for recent transactions, read from the end of the date index
+        recent_transactions = pd.DataFrame(ledger.recent_transactions(5))
+        recent_transactions["date"] = pd.to_datetime(recent_transactions["date"])
         
         # Add client names
-        client_map = {c["id"]: c["name"] for c in clients_data.get("clients", [])}
-        recent_transactions["client_name"] = recent_transactions["client_id"].map(client_map)
+        recent_transactions["client_name"] = recent_transactions["client_id"].map(ledger.client_names())
     else:
         total_received = 0
         total_paid = 0 
@@ -10,9 +10,20 @@ import streamlit.components.v1 as components
 from streamlit_extras.colored_header import colored_header
 from streamlit_extras.card import card
 from ..utils.helpers import sanitize_html
+from ..services.ledger_service import summarize_clients
+from ..services.ledger_index import LedgerIndex
 
-def display_report_view(transactions_data, clients_data, interest_calendars):
-    """Display the financial report view."""
+def display_report_view(transactions_data, clients_data, interest_calendars, client_summary=None, ledger=None):
+    """
+    Display the financial report view.
+    
+    Args:
+        transactions_data: Transaction data dictionary
+        clients_data: Client data dictionary
+        interest_calendars: Dictionary containing calendar data
+        client_summary: Per-client summary from summarize_clients, computed here if not given
+        ledger: LedgerIndex of the loaded ledger, built here if not given
+    """
     # Use colored_header for consistent styling
     colored_header(
         label="Financial Reports",
@@ -20,57 +31,25 @@ def display_report_view(transactions_data, clients_data, interest_calendars):
         color_name="gray-40"
     )
     
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
+    
     # Get client data
-    clients = clients_data.get("clients", [])
-    transactions = transactions_data.get("transactions", [])
+    clients = ledger.clients
     
     if not clients:
         st.warning("No clients available. Please add clients in the Clients section.")
         return
     
-    # Create client map for easy lookup
-    client_map = {client["id"]: client["name"] for client in clients}
-    
-    # Calculate financial data for all clients regardless of transaction activity
-    client_financial_data = []
-    
-    for client in clients:
-        client_id = client.get("id")
-        client_name = client.get("name")
-        
-        # Filter transactions for this client
-        client_transactions = [t for t in transactions if t.get("client_id") == client_id]
-        
-        # Calculate components
-        received = sum(t.get("received", 0) for t in client_transactions)
-        paid = sum(t.get("paid", 0) for t in client_transactions)
-        interest = sum(t.get("interest", 0) for t in client_transactions)
-        
-        # Calculate principal (received - paid)
-        principal = received - paid
-        
-        # Total balance is principal + interest
-        balance = principal + interest
-        
-        # Get the most recent transaction to determine interest rate
-        if client_transactions:
-            recent_txn = max(client_transactions, key=lambda x: x.get("date", ""))
-            interest_rate = recent_txn.get("interest_rate", 0)
-        else:
-            # Default interest rate if no transactions
-            interest_rate = 0
-            
-        client_financial_data.append({
-            "client_id": client_id,
-            "client_name": client_name,
-            "principal": principal,
-            "interest": interest,
-            "balance": balance,
-            "interest_rate": interest_rate
-        })
+    # Financial data for all clients regardless of transaction activity
+    if client_summary is None:
+        client_summary = summarize_clients(clients_data, transactions_data)
     
-    # Convert to DataFrame for display
-    df = pd.DataFrame(client_financial_data)
+    known_clients = client_summary["client_id"].map(lambda client_id: ledger.client(client_id) is not None)
+    df = client_summary.loc[
+        known_clients,
+        ["client_id", "client_name", "principal", "interest", "balance", "interest_rate"]
+    ].reset_index(drop=True)
     
     # Show print button
     col_print, _ = st.columns([1, 5])
@@ -9,136 +9,28 @@ import streamlit.components.v1 as components
 from ..models.transaction import Transaction
 from ..models.client import Client
 from ..services.interest_service import InterestService
-from ..data.data_loader import save_transactions, load_transactions
-from ..utils.helpers import sanitize_html, num_to_words_rupees  # Removed render_html_safely
+from ..services.ledger_service import calculate_running_balance
+from ..services.ledger_index import LedgerIndex
+from ..services.transaction_grid import TRANSACTION_TYPES, PAGE_SIZES, SORT_ORDERS, page_count
+from ..services.import_service import read_statement, convert_statement, convert_statement_chunks
+from ..utils.helpers import sanitize_html, num_to_words_rupees, num_to_words_rupees_batch  # Removed render_html_safely
+from ..utils.styles import register_style
 
-def import_transactions_from_excel(uploaded_file, client_id, interest_calendars, interest_service, transactions_data):
+def import_transactions_from_excel(uploaded_file, client_id, interest_calendars, interest_service, ledger):
     """Import transactions from an Excel file."""
     try:
-        # Read the Excel file
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file, header=0)
-        else:
-            df = pd.read_excel(uploaded_file, header=0)
+        # Read the file without blank rows and the last two summary rows
+        df = read_statement(uploaded_file)
         
-        # Drop rows where all values are NaN
-        df = df.dropna(how='all')
+        next_id = ledger.next_transaction_id()
         
-        # Initialize list for new transactions
-        new_transactions = []
-        next_id = max([t.get("id", 0) for t in transactions_data["transactions"]], default=0) + 1
+        new_transactions, rejected, calendar_type = convert_statement(df, client_id, interest_service, next_id)
         
-        # Determine calendar type from the first valid entry
-        calendar_type = None
+        if calendar_type is not None:
+            st.info(f"Using {calendar_type} calendar for all imported transactions based on the first entry.")
         
-        # Process each row except the last two summary rows
-        for idx, row in df.iloc[:-2].iterrows():
-            try:
-                # Skip rows with no date
-                if pd.isna(row.iloc[0]):
-                    continue
-                
-                # Convert date to string format, ensuring dd-mm-yyyy interpretation
-                try:
-                    # First try parsing as dd-mm-yyyy
-                    date_val = pd.to_datetime(row.iloc[0], format='%d-%m-%Y')
-                except:
-                    try:
-                        # If that fails, try parsing as dd/mm/yyyy
-                        date_val = pd.to_datetime(row.iloc[0], format='%d/%m/%Y')
-                    except:
-                        try:
-                            # If both fail, let pandas try to parse it but force day-first
-                            date_val = pd.to_datetime(row.iloc[0], dayfirst=True)
-                        except:
-                            st.warning(f"Error parsing date in row {idx + 1}. Using original date.")
-                            date_val = pd.to_datetime(row.iloc[0])
-                
-                date_str = date_val.strftime('%Y-%m-%d')
-                
-                # Get transaction amounts
-                issue_amount = float(row['Issue']) if not pd.isna(row['Issue']) else 0.0
-                receipt_amount = float(row['Receipt']) if not pd.isna(row['Receipt']) else 0.0
-                
-                # Get interest days
-                days = int(float(row['No of Days'])) if not pd.isna(row['No of Days']) else 0
-                
-                # Get monthly interest rate from the last column and convert to annual rate
-                monthly_rate = float(row.iloc[-1]) if not pd.isna(row.iloc[-1]) else 0.0
-                annual_interest_rate = monthly_rate * 12
-                
-                # Determine calendar type only for the first valid entry
-                if calendar_type is None:
-                    # In most cases:
-                    # - Diwali calendar uses a base of 360 days
-                    # - Financial calendar uses a base of 365 days
-                    # We'll use a heuristic based on the days value
-                    if days <= 360:
-                        calendar_type = "Diwali"
-                    else:
-                        calendar_type = "Financial"
-                    
-                    st.info(f"Using {calendar_type} calendar for all imported transactions based on the first entry.")
-                
-                # Create transaction for paid amount (Issue)
-                if issue_amount > 0:
-                    # Calculate interest for paid amount
-                    interest = interest_service.calculate_interest(
-                        issue_amount,
-                        annual_interest_rate,
-                        days,
-                        calendar_type  # Using determined calendar type
-                    )
-                    interest = -abs(interest)  # Make it negative for paid interest
-                    
-                    transaction = {
-                        "id": next_id,
-                        "client_id": client_id,
-                        "date": date_str,
-                        "received": 0.0,
-                        "paid": issue_amount,
-                        "amount_in_words": num_to_words_rupees(issue_amount),
-                        "interest_rate": annual_interest_rate,
-                        "calendar_type": calendar_type,
-                        "days": days,
-                        "interest": interest,  # Using calculated interest
-                        "notes": "",  # No notes for imported transactions
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    new_transactions.append(transaction)
-                    next_id += 1
-                
-                # Create transaction for received amount (Receipt)
-                if receipt_amount > 0:
-                    # Calculate interest for received amount
-                    interest = interest_service.calculate_interest(
-                        receipt_amount,
-                        annual_interest_rate,
-                        days,
-                        calendar_type  # Using determined calendar type
-                    )
-                    interest = abs(interest)  # Make it positive for received interest
-                    
-                    transaction = {
-                        "id": next_id,
-                        "client_id": client_id,
-                        "date": date_str,
-                        "received": receipt_amount,
-                        "paid": 0.0,
-                        "amount_in_words": num_to_words_rupees(receipt_amount),
-                        "interest_rate": annual_interest_rate,
-                        "calendar_type": calendar_type,
-                        "days": days,
-                        "interest": interest,  # Using calculated interest
-                        "notes": "",  # No notes for imported transactions
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    new_transactions.append(transaction)
-                    next_id += 1
-                
-            except Exception as e:
-                st.warning(f"Error processing row {idx + 1}: {str(e)}")
-                continue
+        if not rejected.empty:
+            show_rejected_rows(rejected)
         
         return new_transactions
         
@@ -146,115 +38,53 @@ def import_transactions_from_excel(uploaded_file, client_id, interest_calendars,
         st.error(f"Error importing transactions: {str(e)}")
         return None
 
-def apply_tab_styling():
-    """Apply enhanced tab styling to Streamlit tabs."""
-    st.markdown("""
-    <style>
-    /* Fix for duplicate highlight bars - explicitly target and hide all */
-    .stTabs [data-baseweb="tab-highlight"] {
-        display: none !important;
-    }
-    
-    /* Add a custom border-bottom to the selected tab to replace the highlight */
-    .stTabs [data-baseweb="tab"][aria-selected="true"] {
-        background-color: #ffffff !important;
-        color: #4b6bfb !important;
-        font-weight: 700 !important; /* Increased weight for selected tab */
-        border-bottom: 3px solid #4b6bfb !important; /* Blue highlight */
-        box-shadow: 0 -10px 20px rgba(75, 107, 251, 0.1) !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    /* Style for all tabs to make them more visible */
-    .stTabs [data-baseweb="tab"] {
-        padding: 10px 20px !important;
-        border-radius: 5px 5px 0 0 !important;
-        margin-right: 5px !important;
-        border: 1px solid rgba(75, 107, 251, 0.1) !important;
-        border-bottom: none !important;
-        background-color: #f5f7fa !important;
-        transition: all 0.2s ease !important;
-        font-weight: 600 !important; /* Make all tab text bold */
-        font-size: 1.05rem !important; /* Slightly larger font size */
-        color: #485b73 !important;
-    }
-    
-    /* More specific rules for the tab text to ensure it's bold */
-    .stTabs [data-baseweb="tab"] div[data-testid="stMarkdownContainer"] p,
-    .stTabs [data-baseweb="tab"] div,
-    .stTabs [data-baseweb="tab"] span {
-        font-weight: 700 !important; /* Definitely bold */
-        font-family: 'Geist Mono', monospace !important; /* Consistent font */
-    }
-    
-    /* Explicitly target the text elements inside tabs */
-    .stTabs button[role="tab"] span,
-    .stTabs button[role="tab"] p {
-        font-weight: 800 !important; /* Extra bold */
-        letter-spacing: 0.02em !important; /* Slightly increase letter spacing */
-        color: inherit !important;
-    }
-    
-    /* Hover effect for tabs */
-    .stTabs [data-baseweb="tab"]:hover:not([aria-selected="true"]) {
-        background-color: #ffffff !important;
-        color: #3a5ae8 !important;
-        border-bottom: 1px solid rgba(75, 107, 251, 0.3) !important;
-    }
-    
-    /* Ensure no extra borders around tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        border-bottom: 1px solid #e0e6ef !important;
-        padding-bottom: 0 !important;
-        margin-bottom: 20px !important;
-    }
-    
-    /* Add a subtle glow to active tab */
-    .stTabs [data-baseweb="tab"][aria-selected="true"]::after {
-        content: "";
-        position: absolute;
-        bottom: -3px;
-        left: 0;
-        right: 0;
-        height: 3px;
-        background: linear-gradient(90deg, rgba(75, 107, 251, 0.3), rgba(75, 107, 251, 0.8), rgba(75, 107, 251, 0.3));
-        border-radius: 3px;
-    }
-    
-    /* Transaction table styles */
-    div.transaction-table table {
-        background-color: #ffffff !important;
-        border-radius: 0.8rem !important;
-        overflow: hidden !important;
-        border-collapse: separate !important;
-        border-spacing: 0 !important;
-        box-shadow: 0 4px 12px rgba(58, 90, 232, 0.08) !important;
-    }
-    
-    div.transaction-table th {
-        background-color: #f5f7fa !important;
-        color: #2c3e50 !important;
-        font-weight: 700 !important;
-        border-bottom: 2px solid #e0e6ef !important;
-        padding: 12px 16px !important;
-    }
+# Statements larger than this are imported in chunks without a preview
+STREAMING_IMPORT_THRESHOLD_BYTES = 5 * 1024 * 1024
+
+def show_rejected_rows(rejected):
+    """Show the statement rows that could not be imported."""
+    st.warning(f"{len(rejected)} row(s) could not be imported and were skipped.")
+    st.dataframe(
+        rejected,
+        column_config={
+            "row": "Row",
+            "value": "Date",
+            "reason": "Problem"
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+def import_transactions_in_chunks(uploaded_file, client_id, interest_service, ledger):
+    """
+    Import a large statement chunk by chunk, storing each chunk as soon as it is converted.
     
-    div.transaction-table td {
-        padding: 12px 16px !important;
-        border-bottom: 1px solid #e0e6ef !important;
-        color: #2c3e50 !important;
-        font-weight: 500 !important;
-    }
+    Returns:
+        tuple: (imported_count, rejected) or None if the import failed
+    """
+    progress_bar = st.progress(0.0, text="Importing transactions...")
+    next_id = ledger.next_transaction_id()
+    imported_count = 0
+    rejected_chunks = []
     
-    div.transaction-table tr:nth-child(even) {
-        background-color: #f8f9fb !important;
-    }
+    try:
+        for new_transactions, rejected, calendar_type, progress in convert_statement_chunks(
+                uploaded_file, client_id, interest_service, next_id):
+            if new_transactions:
+                ledger.add_transactions(new_transactions)
+                imported_count += len(new_transactions)
+            if not rejected.empty:
+                rejected_chunks.append(rejected)
+            if progress is not None:
+                progress_bar.progress(min(progress, 1.0), text=f"Imported {imported_count:,} transactions...")
+    except Exception as e:
+        progress_bar.empty()
+        st.error(f"Error importing transactions after {imported_count:,} transactions: {str(e)}")
+        return None
     
-    div.transaction-table tr:hover {
-        background-color: rgba(75, 107, 251, 0.05) !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    progress_bar.progress(1.0, text=f"Imported {imported_count:,} transactions")
+    rejected = pd.concat(rejected_chunks, ignore_index=True) if rejected_chunks else None
+    return imported_count, rejected
 
 def get_amount_in_words(row):
     """
@@ -314,8 +144,11 @@ def field_exists(transaction, field):
     """
     return field in transaction and transaction[field]
 
-def transactions_section(transactions_data, clients_data, interest_calendars, interest_service):
+def transactions_section(transactions_data, clients_data, interest_calendars, interest_service, ledger=None):
     """Transaction management UI component."""
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
+    
     # Check if we need to handle navigation from client view to another page
     if (st.session_state.get("view_client_transactions") is not None and 
         st.session_state.page != "transactions"):
@@ -348,22 +181,22 @@ def transactions_section(transactions_data, clients_data, interest_calendars, in
     if 'active_tab' not in st.session_state:
         st.session_state.active_tab = "all_transactions"  # Default to all transactions tab
     
-    # Apply enhanced tab styling
-    apply_tab_styling()
-    
     # Create tabs for different transaction functions
     tab1, tab2, tab3 = st.tabs(["📋 All Transactions", "✏️ Add Transaction", "📥 Import Transactions"])
     
     # Show the appropriate tab content
     with tab1:
-        all_transactions_view(transactions_data, clients_data, interest_service)
+        all_transactions_view(transactions_data, clients_data, interest_service, ledger)
     with tab2:
-        transaction_management(transactions_data, clients_data, interest_service, interest_calendars)
+        transaction_management(transactions_data, clients_data, interest_service, interest_calendars, ledger)
     with tab3:
-        import_transactions_view(transactions_data, clients_data, interest_service, interest_calendars)
+        import_transactions_view(transactions_data, clients_data, interest_service, interest_calendars, ledger)
 
-def import_transactions_view(transactions_data, clients_data, interest_service, interest_calendars):
+def import_transactions_view(transactions_data, clients_data, interest_service, interest_calendars, ledger=None):
     """Import transactions from Excel file."""
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
+    
     st.markdown("### Import Transactions from Excel")
     
     # Initialize session state for import
@@ -374,15 +207,21 @@ def import_transactions_view(transactions_data, clients_data, interest_service,
     if st.session_state.import_confirmed:
         st.success("✅ Transactions have been imported successfully!")
         
+        # Rows skipped by a chunked import are only known once it has finished
+        if st.session_state.get('import_rejected') is not None:
+            show_rejected_rows(st.session_state.import_rejected)
+        
         # Add buttons for navigation
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Back to Transactions", use_container_width=True):
                 st.session_state.import_confirmed = False
+                st.session_state.import_rejected = None
                 st.rerun()
         with col2:
             if st.button("Import More Transactions", type="primary", use_container_width=True):
                 st.session_state.import_confirmed = False
+                st.session_state.import_rejected = None
                 st.rerun()
         return
     
@@ -402,14 +241,25 @@ def import_transactions_view(transactions_data, clients_data, interest_service,
     # File upload
     uploaded_file = st.file_uploader("Choose an Excel file", type=['xlsx', 'xls', 'csv'], key="file_uploader")
     
-    if uploaded_file and selected_client_id:
+    if uploaded_file and selected_client_id and uploaded_file.size > STREAMING_IMPORT_THRESHOLD_BYTES:
+        # Large statements are converted and stored in chunks to keep memory use bounded
+        st.info(f"This file is {uploaded_file.size / (1024 * 1024):,.1f} MB, so it will be imported in chunks without a preview.")
+        if st.button("Import Transactions", type="primary", use_container_width=True):
+            result = import_transactions_in_chunks(uploaded_file, selected_client_id, interest_service, ledger)
+            if result is not None:
+                _, rejected = result
+                st.session_state.import_rejected = rejected
+                st.session_state.import_confirmed = True
+                st.rerun()
+    
+    elif uploaded_file and selected_client_id:
         # Preview transactions first
         preview_transactions = import_transactions_from_excel(
             uploaded_file,
             selected_client_id,
             interest_calendars,
             interest_service,
-            transactions_data
+            ledger
         )
         
         if preview_transactions:
@@ -462,10 +312,8 @@ def import_transactions_view(transactions_data, clients_data, interest_service,
             
             with col2:
                 if st.button("Confirm Import", type="primary", use_container_width=True):
-                    # Add new transactions to existing ones
-                    transactions_data["transactions"].extend(preview_transactions)
-                    # Save updated transactions
-                    save_transactions(transactions_data)
+                    # Add and save the new transactions
+                    ledger.add_transactions(preview_transactions)
                     # Set import confirmed flag
                     st.session_state.import_confirmed = True
                     st.rerun()
@@ -478,8 +326,11 @@ def import_transactions_view(transactions_data, clients_data, interest_service,
     if st.session_state.import_confirmed:
         pass
 
-def transaction_management(transactions_data, clients_data, interest_service, interest_calendars):
+def transaction_management(transactions_data, clients_data, interest_service, interest_calendars, ledger=None):
     """Transaction management UI component."""
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
+    
     st.markdown("### Add New Transaction")
     
     # Get client options
@@ -538,11 +389,7 @@ def transaction_management(transactions_data, clients_data, interest_service, in
         # If confirmed, add the transaction
         if confirm_button:
             # Add and save transaction
-            if "transactions" not in transactions_data:
-                transactions_data["transactions"] = []
-            
-            transactions_data["transactions"].append(st.session_state.pending_transaction_data)
-            save_transactions(transactions_data)
+            ledger.add_transactions([st.session_state.pending_transaction_data])
             
             # Show success message with details
             st.success(f"""
@@ -683,15 +530,11 @@ def transaction_management(transactions_data, clients_data, interest_service, in
             days_value = financial_days
         
         # Find client ID
-        client_id = next(
-            client["id"]
-            for client in clients_data["clients"]
-            if client["name"] == selected_client
-        )
+        client_id = ledger.client_by_name(selected_client)["id"]
         
         # Create transaction object
         transaction_data = {
-            "id": len(transactions_data.get("transactions", [])) + 1,
+            "id": ledger.next_transaction_id(),
             "client_id": client_id,
             "client_name": selected_client,
             "date": date_str,
@@ -714,8 +557,11 @@ def transaction_management(transactions_data, clients_data, interest_service, in
         # Refresh the page to show confirmation
         st.rerun()
 
-def edit_transaction_view(transactions_data, clients_data, interest_service):
+def edit_transaction_view(transactions_data, clients_data, interest_service, ledger=None):
     """UI component for editing existing transactions."""
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
+    
     if not transactions_data.get("transactions"):
         st.info("💼 No transactions recorded yet. Add your first transaction in the 'Add Transaction' section.")
         return
@@ -731,7 +577,7 @@ def edit_transaction_view(transactions_data, clients_data, interest_service):
     df["date"] = pd.to_datetime(df["date"])
     
     # Add client names
-    client_map = {c["id"]: c["name"] for c in clients_data.get("clients", [])}
+    client_map = ledger.client_names()
     df["client_name"] = df["client_id"].map(client_map)
     
     # Sort by date (newest first)
@@ -757,20 +603,14 @@ def edit_transaction_view(transactions_data, clients_data, interest_service):
     
     if selected_transaction_id:
         # Get the selected transaction
-        selected_transaction = next(
-            (t for t in transactions_data["transactions"] if t.get("id") == selected_transaction_id),
-            None
-        )
+        selected_transaction = ledger.transaction(selected_transaction_id)
         
         if not selected_transaction:
             st.error("Transaction not found!")
             return
         
         # Get the client
-        client = next(
-            (c for c in clients_data["clients"] if c.get("id") == selected_transaction.get("client_id")),
-            None
-        )
+        client = ledger.client(selected_transaction.get("client_id"))
         
         client_name = client.get("name", "Unknown") if client else "Unknown"
         
@@ -889,24 +729,18 @@ def edit_transaction_view(transactions_data, clients_data, interest_service):
                         interest = -interest
                     days_value = financial_days
                 
-                # Update transaction
-                for i, transaction in enumerate(transactions_data["transactions"]):
-                    if transaction.get("id") == selected_transaction_id:
-                        transactions_data["transactions"][i].update({
-                            "date": date_str,
-                            "received": float(edit_amount) if transaction_type == "Received" else 0.0,
-                            "paid": float(edit_amount) if transaction_type == "Paid" else 0.0,
-                            "amount_in_words": num_to_words_rupees(edit_amount),
-                            "interest_rate": float(interest_rate_pct),
-                            "calendar_type": calendar_type,
-                            "days": int(days_value) if days_value is not None else 0,
-                            "interest": round(float(interest), 2),
-                            "notes": notes,
-                        })
-                        break
-                
-                # Save changes
-                save_transactions(transactions_data)
+                # Update and save the transaction
+                ledger.update_transaction(selected_transaction_id, {
+                    "date": date_str,
+                    "received": float(edit_amount) if transaction_type == "Received" else 0.0,
+                    "paid": float(edit_amount) if transaction_type == "Paid" else 0.0,
+                    "amount_in_words": num_to_words_rupees(edit_amount),
+                    "interest_rate": float(interest_rate_pct),
+                    "calendar_type": calendar_type,
+                    "days": int(days_value) if days_value is not None else 0,
+                    "interest": round(float(interest), 2),
+                    "notes": notes,
+                })
                 
                 # Show success message
                 st.success(f"""
@@ -948,11 +782,8 @@ def edit_transaction_view(transactions_data, clients_data, interest_service):
                     st.error("❌ Please confirm that you understand this action cannot be undone.")
                     return
                 
-                # Delete the transaction
-                transactions_data["transactions"] = [t for t in transactions_data["transactions"] if t.get("id") != selected_transaction_id]
-                
-                # Save changes
-                save_transactions(transactions_data)
+                # Delete the transaction and save changes
+                ledger.delete_transactions([selected_transaction_id])
                 
                 # Show success message
                 st.success(f"""
@@ -965,9 +796,185 @@ def edit_transaction_view(transactions_data, clients_data, interest_service):
                 st.session_state.reset_transaction_form = True
                 st.rerun()
 
-def all_transactions_view(transactions_data, clients_data, interest_service):
-    """Display all transactions with filtering options."""
-    st.markdown("""
+def _editor_value(changes, column, default):
+    """Get an edited value from a data editor row, or the default if it was not set."""
+    value = changes.get(column)
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return default
+    return value
+
+def _editor_amount(changes, column, stored):
+    """Get an edited amount from a data editor row; a cleared cell counts as 0."""
+    if column not in changes:
+        return float(stored or 0.0)
+    return float(_editor_value(changes, column, 0.0))
+
+def _editor_interest(interest_service, amount, interest_rate, days, calendar_type, is_received):
+    """Interest for an edited amount; negative for paid transactions."""
+    interest = interest_service.calculate_interest(amount, interest_rate, days, calendar_type)
+    return round(float(interest if is_received else -interest), 2)
+
+def edited_transaction_fields(transaction, changes, ledger, interest_service):
+    """
+    Work out the fields to update for a row changed in the transactions data editor.
+    
+    Interest is recalculated when the amount, rate or date changes, unless the
+    interest itself was edited. A new date takes its days from the calendar.
+    
+    Args:
+        transaction: The stored transaction dictionary
+        changes: Dictionary of edited columns and their new values
+        ledger: LedgerIndex of the loaded ledger
+        interest_service: InterestService instance for calculations
+        
+    Returns:
+        dict: Fields to update on the transaction
+    """
+    updates = {}
+    
+    client = ledger.client_by_name(changes.get("client")) if "client" in changes else None
+    if client is not None:
+        updates["client_id"] = client["id"]
+    
+    if "notes" in changes:
+        updates["notes"] = changes["notes"] or ""
+    
+    if not {"date", "received", "paid", "interest_rate", "interest"} & changes.keys():
+        return updates
+    
+    received = _editor_amount(changes, "received", transaction.get("received"))
+    paid = _editor_amount(changes, "paid", transaction.get("paid"))
+    is_received = received > 0
+    amount = received if is_received else paid
+    interest_rate = float(_editor_value(changes, "interest_rate", transaction.get("interest_rate", 0.0)))
+    calendar_type = transaction.get("calendar_type", "Financial")
+    days = int(transaction.get("days", 0))
+    date_str = transaction.get("date")
+    
+    if _editor_value(changes, "date", None) is not None:
+        date_str = pd.to_datetime(changes["date"]).strftime("%Y-%m-%d")
+        if date_str != transaction.get("date"):
+            diwali_days, financial_days = interest_service.get_interest_value(date_str)
+            calendar_days = diwali_days if calendar_type == "Diwali" else financial_days
+            if calendar_days is not None:
+                days = int(calendar_days)
+    
+    if _editor_value(changes, "interest", None) is not None:
+        # The user set the interest by hand, keep their value
+        interest = round(float(changes["interest"]), 2)
+    else:
+        interest = _editor_interest(interest_service, amount, interest_rate, days, calendar_type, is_received)
+    
+    updates.update({
+        "date": date_str,
+        "received": received if is_received else 0.0,
+        "paid": paid if not is_received else 0.0,
+        "amount_in_words": num_to_words_rupees(amount),
+        "interest_rate": interest_rate,
+        "days": days,
+        "interest": interest
+    })
+    return updates
+
+def new_transaction_from_row(row, transaction_id, ledger, interest_service):
+    """
+    Build a transaction from a row added in the transactions data editor.
+    
+    The calendar type and, if not given, the interest rate are taken from the most
+    recent transaction in the ledger.
+    
+    Returns:
+        dict: The new transaction, or None if the row has no client, date or amount
+    """
+    client = ledger.client_by_name(row.get("client"))
+    if client is None or _editor_value(row, "date", None) is None:
+        return None
+    
+    received = float(_editor_value(row, "received", 0.0))
+    paid = float(_editor_value(row, "paid", 0.0))
+    is_received = received > 0
+    amount = received if is_received else paid
+    if amount <= 0:
+        return None
+    
+    latest = ledger.latest_transaction() or {}
+    calendar_type = latest.get("calendar_type", "Financial")
+    interest_rate = float(_editor_value(row, "interest_rate", latest.get("interest_rate", 0.0)))
+    
+    date_str = pd.to_datetime(row["date"]).strftime("%Y-%m-%d")
+    diwali_days, financial_days = interest_service.get_interest_value(date_str)
+    calendar_days = diwali_days if calendar_type == "Diwali" else financial_days
+    days = int(calendar_days) if calendar_days is not None else 0
+    
+    if _editor_value(row, "interest", None) is not None:
+        interest = round(float(row["interest"]), 2)
+    else:
+        interest = _editor_interest(interest_service, amount, interest_rate, days, calendar_type, is_received)
+    
+    return {
+        "id": transaction_id,
+        "client_id": client["id"],
+        "date": date_str,
+        "received": received if is_received else 0.0,
+        "paid": paid if not is_received else 0.0,
+        "amount_in_words": num_to_words_rupees(amount),
+        "interest_rate": interest_rate,
+        "calendar_type": calendar_type,
+        "days": days,
+        "interest": interest,
+        "notes": row.get("notes") or "",
+        "timestamp": datetime.now().isoformat()
+    }
+
+def apply_transaction_editor_changes(editor_state, row_ids, ledger, interest_service):
+    """
+    Apply the changes made in the transactions data editor.
+    
+    Only the rows the editor reports as edited, added or deleted are touched, so
+    transactions hidden by the filters are kept as they are. Nothing is applied
+    while an added row is still missing its client, date or amount.
+    
+    Args:
+        editor_state: The data editor's state with 'edited_rows', 'added_rows' and 'deleted_rows'
+        row_ids: IDs of the transactions shown in the editor, in display order
+        ledger: LedgerIndex of the loaded ledger
+        interest_service: InterestService instance for calculations
+        
+    Returns:
+        int: Number of transactions added, updated or deleted, or None if an added row is incomplete
+    """
+    deleted_ids = {row_ids[position] for position in editor_state.get("deleted_rows", [])}
+    
+    updates = {}
+    for position, changes in editor_state.get("edited_rows", {}).items():
+        transaction_id = row_ids[int(position)]
+        transaction = ledger.transaction(transaction_id)
+        if transaction_id in deleted_ids or transaction is None:
+            continue
+        fields = edited_transaction_fields(transaction, changes, ledger, interest_service)
+        if fields:
+            updates[transaction_id] = fields
+    
+    next_id = ledger.next_transaction_id()
+    new_transactions = []
+    for row in editor_state.get("added_rows", []):
+        transaction = new_transaction_from_row(row, next_id, ledger, interest_service)
+        if transaction is None:
+            return None
+        new_transactions.append(transaction)
+        next_id += 1
+    
+    if updates:
+        ledger.update_transactions(updates)
+    if new_transactions:
+        ledger.add_transactions(new_transactions)
+    if deleted_ids:
+        ledger.delete_transactions(deleted_ids)
+    
+    return len(updates) + len(new_transactions) + len(deleted_ids)
+
+# Transaction table and metric styling of the transactions list
+register_style("transaction_table", """
     <style>
     /* Transaction table styles */
     .stDataFrame table {
@@ -1048,7 +1055,65 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
         color: #4b6bfb;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """, pages="transactions")
+
+# Totals boxes of the transactions list
+register_style("transaction_totals", """
+    <style>
+    .total-box {
+        background-color: #ffffff;
+        padding: 15px;
+        border-radius: 8px;
+        margin: 10px 0;
+        border: 1px solid #333;
+    }
+    .total-amount {
+        font-size: 1.2em;
+        font-weight: bold;
+        margin: 0;
+    }
+    .total-label {
+        color: #000000;
+        font-size: 0.9em;
+        margin: 0;
+    }
+    </style>
+    """)
+
+def build_transactions_export(transactions_df, client_names):
+    """
+    Build the download of filtered transactions, in date order with the running balance.
+
+    Args:
+        transactions_df: DataFrame of the filtered transactions
+        client_names: Dictionary mapping client IDs to names
+
+    Returns:
+        tuple: (file contents as bytes, True if the file is a CSV rather than Excel)
+    """
+    export_df = calculate_running_balance(transactions_df)
+    
+    # Add client names to the export dataframe
+    if 'client_id' in export_df.columns:
+        export_df['client'] = export_df['client_id'].map(client_names)
+        
+    # Format the date column for Excel if present
+    if 'date' in export_df.columns:
+        export_df['date'] = pd.to_datetime(export_df['date'])
+        
+    # Reorder and select columns for export
+    export_columns = [col for col in ['date', 'client', 'received', 'paid', 'interest', 'running_balance', 'notes', 'interest_rate', 'calendar_type', 'days'] if col in export_df.columns]
+    export_df = export_df[export_columns]
+    
+    # Excel file, falling back to CSV for very large exports
+    if len(export_df) > EXCEL_EXPORT_MAX_ROWS:
+        return export_to_csv(export_df), True
+    return export_to_excel(export_df), False
+
+def all_transactions_view(transactions_data, clients_data, interest_service, ledger=None):
+    """Display all transactions with filtering options."""
+    if ledger is None:
+        ledger = LedgerIndex(clients_data, transactions_data)
     
     st.markdown("### All Transactions")
         
@@ -1064,7 +1129,7 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
         # Use the selected client from view_client_transactions if available, otherwise default to "All Clients"
         if st.session_state.get("view_client_transactions") is not None:
             client_id = st.session_state.get("view_client_transactions")
-            client_name = next((c["name"] for c in clients_data["clients"] if c["id"] == client_id), "All Clients")
+            client_name = ledger.client_name(client_id, "All Clients")
             st.session_state.transaction_filter_client = client_name
         else:
             st.session_state.transaction_filter_client = "All Clients"
@@ -1072,8 +1137,8 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
     if "transaction_filter_date_range" not in st.session_state:
         # Convert datetime objects to date objects for the date picker
         try:
-            min_date = pd.to_datetime(min(t["date"] for t in transactions)).date()
-            max_date = pd.to_datetime(max(t["date"] for t in transactions)).date()
+            min_date = pd.to_datetime(ledger.date_bounds()[0]).date()
+            max_date = pd.to_datetime(ledger.date_bounds()[1]).date()
             st.session_state.transaction_filter_date_range = (min_date, max_date)
         except (ValueError, TypeError):
             # Handle empty transactions list or other errors
@@ -1115,15 +1180,15 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
             st.session_state.transaction_filter_date_range = date_range
         except Exception as e:
             # Handle any errors by resetting the date range
-            min_date = pd.to_datetime(min(t["date"] for t in transactions)).date()
-            max_date = pd.to_datetime(max(t["date"] for t in transactions)).date()
+            min_date = pd.to_datetime(ledger.date_bounds()[0]).date()
+            max_date = pd.to_datetime(ledger.date_bounds()[1]).date()
             st.session_state.transaction_filter_date_range = (min_date, max_date)
             date_range = st.session_state.transaction_filter_date_range
             st.error(f"Date range reset due to error: {str(e)}")
     
     with filter_col3:
         # Transaction type filter - use persisted value
-        transaction_types = ["All", "Received Only", "Paid Only", "With Interest"]
+        transaction_types = TRANSACTION_TYPES
         type_index = transaction_types.index(st.session_state.transaction_filter_type) if st.session_state.transaction_filter_type in transaction_types else 0
         transaction_type = st.selectbox(
             "Transaction Type", 
@@ -1139,8 +1204,8 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
             st.session_state.transaction_filter_client = "All Clients"
             # Convert to date objects for consistency
             try:
-                min_date = pd.to_datetime(min(t["date"] for t in transactions)).date()
-                max_date = pd.to_datetime(max(t["date"] for t in transactions)).date()
+                min_date = pd.to_datetime(ledger.date_bounds()[0]).date()
+                max_date = pd.to_datetime(ledger.date_bounds()[1]).date()
                 st.session_state.transaction_filter_date_range = (min_date, max_date)
             except (ValueError, TypeError):
                 # Handle empty transactions list or other errors
@@ -1150,60 +1215,25 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
         st.write("\n\t\t")
         st.button("🔄 Reset", on_click=reset_transaction_filters, help="Reset all filters to default values")
     
-    # Convert transactions to DataFrame
-    df = pd.DataFrame(transactions)
-    
-    # Apply filters
+    # Filter against the ledger's columnar grid; only the current page becomes a DataFrame
+    grid = ledger.grid()
+    filter_client_id = None
     if selected_client != "All Clients":
-        client_id = next(c["id"] for c in clients_data["clients"] if c["name"] == selected_client)
-        df = df[df["client_id"] == client_id]
-    
-    if len(date_range) == 2:
-        df["date"] = pd.to_datetime(df["date"])
-        start_date = pd.to_datetime(date_range[0])
-        end_date = pd.to_datetime(date_range[1])
-        # Set the time of end_date to 23:59:59 to include the entire day
-        end_date = end_date + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-        df = df[(df["date"] >= start_date) & (df["date"] <= end_date)]
-    
-    if transaction_type == "Received Only":
-        df = df[df["received"] > 0]
-    elif transaction_type == "Paid Only":
-        df = df[df["paid"] > 0]
-    elif transaction_type == "With Interest":
-        df = df[df["interest"] != 0]
+        filter_client_id = ledger.client_by_name(selected_client)["id"]
+    
+    start_date, end_date = (date_range[0], date_range[1]) if len(date_range) == 2 else (None, None)
+    positions = grid.filter(filter_client_id, start_date, end_date, transaction_type)
+    filter_key = f"{selected_client}|{start_date}|{end_date}|{transaction_type}"
     
     # Create client names mapping here, before it's used
-    client_names = {c['id']: c['name'] for c in clients_data['clients']}
+    client_names = ledger.client_names()
     
     # Calculate totals
-    total_received = df["received"].sum()
-    total_paid = df["paid"].sum()
-    total_interest = df["interest"].sum()
-    net_balance = total_received - total_paid + total_interest
-    
-    # Display totals in a styled container
-    st.markdown("""
-    <style>
-    .total-box {
-        background-color: #ffffff;
-        padding: 15px;
-        border-radius: 8px;
-        margin: 10px 0;
-        border: 1px solid #333;
-    }
-    .total-amount {
-        font-size: 1.2em;
-        font-weight: bold;
-        margin: 0;
-    }
-    .total-label {
-        color: #000000;
-        font-size: 0.9em;
-        margin: 0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    totals = grid.totals(positions)
+    total_received = totals["received"]
+    total_paid = totals["paid"]
+    total_interest = totals["interest"]
+    net_balance = totals["net"]
     
     st.markdown("#### Transaction Summary")
     col1, col2, col3, col4 = st.columns(4)
@@ -1253,7 +1283,7 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
     with btn_col1:
         if st.button("🖨️ Print Transactions", help="Create a printable version of the current filtered transactions"):
             # Create a temporary HTML file with current filtered transactions
-            print_html = create_printable_html(df, client_names, total_received, total_paid, total_interest, net_balance)
+            print_html = create_printable_html(grid.frame(positions), client_names, total_received, total_paid, total_interest, net_balance)
             
             # Use components to load and auto-print the HTML
             components.html(print_html, height=0, scrolling=False)
@@ -1261,43 +1291,48 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
             st.success("Print dialog should open automatically. If it doesn't, check your browser settings.")
     
     with btn_col2:
-        # Create a copy of the dataframe for Excel export
-        export_df = df.copy()
-        
-        # Add client names to the export dataframe
-        if 'client_id' in export_df.columns:
-            export_df['client'] = export_df['client_id'].map(client_names)
-            
-        # Format the date column for Excel if present
-        if 'date' in export_df.columns:
-            export_df['date'] = pd.to_datetime(export_df['date'])
-            
-        # Reorder and select columns for export
-        export_columns = [col for col in ['date', 'client', 'received', 'paid', 'interest', 'running_balance', 'notes', 'interest_rate', 'calendar_type', 'days'] if col in export_df.columns]
-        export_df = export_df[export_columns]
-        
-        # Prepare Excel file download
-        excel_data = export_to_excel(export_df)
-        
-        # Create a descriptive filename with date range
-        try:
-            start_date = date_range[0].strftime('%d-%m-%Y') if len(date_range) >= 1 else "all"
-            end_date = date_range[1].strftime('%d-%m-%Y') if len(date_range) >= 2 else "all"
-        except AttributeError:
-            # Handle case where date_range is datetime or other type
-            start_date = pd.to_datetime(date_range[0]).strftime('%d-%m-%Y') if len(date_range) >= 1 else "all"
-            end_date = pd.to_datetime(date_range[1]).strftime('%d-%m-%Y') if len(date_range) >= 2 else "all"
-        client_name = selected_client.replace(" ", "_") if selected_client != "All Clients" else "All_Clients"
-        excel_filename = f"transactions_{client_name}_{start_date}_to_{end_date}.xlsx"
-        
-        # Download button
-        st.download_button(
-            label="📊 Export to Excel",
-            data=excel_data,
-            file_name=excel_filename,
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            help="Download current filtered transactions as Excel file"
-        )
+        # The export is built on request and kept until the filters or the transactions
+        # change, so paging through the grid doesn't rebuild it
+        export = st.session_state.get("transaction_export")
+        if export is not None and (export["filter"] != filter_key or export["grid"] is not grid):
+            del st.session_state.transaction_export
+            export = None
+        if export is None and st.button("📦 Prepare Export", help="Build a download of the current filtered transactions"):
+            excel_data, export_as_csv = build_transactions_export(grid.frame(positions), client_names)
+            export = {"filter": filter_key, "grid": grid, "data": excel_data, "as_csv": export_as_csv}
+            st.session_state.transaction_export = export
+        
+        if export is not None:
+            excel_data, export_as_csv = export["data"], export["as_csv"]
+        
+            # Create a descriptive filename with date range
+            try:
+                export_start = date_range[0].strftime('%d-%m-%Y') if len(date_range) >= 1 else "all"
+                export_end = date_range[1].strftime('%d-%m-%Y') if len(date_range) >= 2 else "all"
+            except AttributeError:
+                # Handle case where date_range is datetime or other type
+                export_start = pd.to_datetime(date_range[0]).strftime('%d-%m-%Y') if len(date_range) >= 1 else "all"
+                export_end = pd.to_datetime(date_range[1]).strftime('%d-%m-%Y') if len(date_range) >= 2 else "all"
+            client_name = selected_client.replace(" ", "_") if selected_client != "All Clients" else "All_Clients"
+            excel_filename = f"transactions_{client_name}_{export_start}_to_{export_end}.xlsx"
+        
+            # Download button
+            if export_as_csv:
+                st.download_button(
+                    label="📊 Export to CSV",
+                    data=excel_data,
+                    file_name=excel_filename.replace(".xlsx", ".csv"),
+                    mime="text/csv",
+                    help="Too many transactions for Excel formatting; download them as a CSV file"
+                )
+            else:
+                st.download_button(
+                    label="📊 Export to Excel",
+                    data=excel_data,
+                    file_name=excel_filename,
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    help="Download current filtered transactions as Excel file"
+                )
     
     with btn_col3:
         # Delete all transactions button
@@ -1312,8 +1347,7 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
         confirm_col1, confirm_col2 = st.columns([1, 1])
         with confirm_col1:
             if st.button("Yes, Delete All", type="primary"):
-                transactions_data["transactions"] = []
-                save_transactions(transactions_data)
+                ledger.delete_all_transactions()
                 st.session_state.show_delete_confirmation = False
                 st.success("All transactions have been deleted!")
                 st.rerun()
@@ -1324,31 +1358,48 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
     
     st.markdown("#### Transaction Details")
     
-    # Format DataFrame for display
-    display_df = df.copy()
-    
-    # Add client names
-    display_df['client'] = display_df['client_id'].map(client_names)
-    
-    # Convert date to datetime if not already
-    display_df['date'] = pd.to_datetime(display_df['date'])
+    # Page size, page and sort order; a new filter starts again from the first page
+    if st.session_state.get('transaction_page_filter') != filter_key:
+        st.session_state.transaction_page_filter = filter_key
+        st.session_state.transaction_page = 1
     
-    # Sort by date
-    display_df = display_df.sort_values('date')
+    page_col1, page_col2, page_col3, page_col4 = st.columns([1, 1, 1, 1])
+    with page_col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key="transaction_page_size")
+    with page_col2:
+        sort_order = st.selectbox("Sort", SORT_ORDERS, key="transaction_sort_order")
     
-    # Calculate running balance chronologically across all transactions
-    display_df['running_balance'] = 0.0
-    balance = 0.0
-    # Loop through the sorted dataframe to calculate running balance
-    for idx, row in display_df.iterrows():
-        received = row['received'] if not pd.isna(row['received']) else 0
-        paid = row['paid'] if not pd.isna(row['paid']) else 0
-        interest = row['interest'] if not pd.isna(row['interest']) else 0
-        balance += received - paid + interest
-        display_df.loc[idx, 'running_balance'] = balance
+    pages = page_count(len(positions), page_size)
+    st.session_state.transaction_page = min(st.session_state.transaction_page, pages)
     
-    # Store original row indices to maintain relationship with original dataframe
-    display_df['original_index'] = display_df.index
+    with page_col3:
+        st.write("\n\t\t")
+        nav_col1, nav_col2 = st.columns(2)
+        with nav_col1:
+            if st.button("◀ Previous", disabled=st.session_state.transaction_page <= 1, use_container_width=True):
+                st.session_state.transaction_page -= 1
+                st.rerun()
+        with nav_col2:
+            if st.button("Next ▶", disabled=st.session_state.transaction_page >= pages, use_container_width=True):
+                st.session_state.transaction_page += 1
+                st.rerun()
+    with page_col4:
+        first_row = (st.session_state.transaction_page - 1) * page_size + 1 if len(positions) else 0
+        last_row = min(st.session_state.transaction_page * page_size, len(positions))
+        st.write("\n\t\t")
+        st.caption(f"Page {st.session_state.transaction_page} of {pages} · rows {first_row:,}–{last_row:,} of {len(positions):,}")
+    
+    # Build only the rows of the current page, with the running balance over all filtered rows
+    display_df = grid.page(
+        positions,
+        st.session_state.transaction_page,
+        page_size,
+        newest_first=sort_order == "Newest first",
+        client_names=client_names
+    )
+    if display_df.empty:
+        st.info("No transactions match the selected filters.")
+        return
     
     # Reorder columns for display, but keep original columns in the dataframe
     columns_to_display = [
@@ -1368,8 +1419,15 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
     if 'interest_rate' in display_df.columns:
         display_df['interest_rate'] = display_df['interest_rate'].fillna(0).round(2)
     
+    # The editor's key changes after every save, which clears its pending changes
+    if 'transaction_editor_version' not in st.session_state:
+        st.session_state.transaction_editor_version = 0
+    # It also changes with the page shown, since the editor reports changes by row position
+    editor_key = (f"transaction_data_editor_{st.session_state.transaction_editor_version}_"
+                  f"{filter_key}|{sort_order}|{page_size}|{st.session_state.transaction_page}")
+    
     # Create an editable dataframe
-    edited_df = st.data_editor(
+    st.data_editor(
         display_df[display_columns],
         use_container_width=True,
         hide_index=True,
@@ -1415,171 +1473,26 @@ def all_transactions_view(transactions_data, clients_data, interest_service):
             )
         },
         num_rows="dynamic",
-        key="transaction_data_editor"
+        key=editor_key
     )
     
-    # Check if there are any changes
-    displayed_df = display_df[display_columns]
-    if not displayed_df.equals(edited_df):
-        # Update the transactions data
-        updated_transactions = []
-        
-        # Get next available ID
-        next_id = max([t.get("id", 0) for t in transactions_data["transactions"]], default=0) + 1
-        
-        # Store original indices to make matching more reliable
-        original_indices = {}
-        for i, idx in enumerate(display_df['original_index']):
-            original_indices[i] = idx
-            
-        # Build a lookup map of original transactions by ID for quicker matching
-        original_transactions_map = {t.get("id"): t for t in transactions_data["transactions"]}
-            
-        for idx, row in edited_df.iterrows():
-            orig_transaction = None
-            
-            # Try to find the original transaction by its index first
-            if idx in original_indices:
-                orig_idx = original_indices[idx]
-                if orig_idx in display_df.index:
-                    # Get the transaction ID from the original data
-                    if 'id' in display_df.loc[orig_idx]:
-                        transaction_id = display_df.loc[orig_idx]['id']
-                        if transaction_id in original_transactions_map:
-                            orig_transaction = original_transactions_map[transaction_id]
-            
-            # If we couldn't find it by index, try the client+date approach as fallback
-            if orig_transaction is None:
-                client_id = next((c["id"] for c in clients_data["clients"] if c["name"] == row["client"]), None)
-                date_str = pd.to_datetime(row["date"]).strftime("%Y-%m-%d")
-                
-                for t in transactions_data["transactions"]:
-                    # Match on client and date
-                    if t["client_id"] == client_id and t["date"] == date_str:
-                        # Try to match transaction type (received vs paid)
-                        is_receive_match = (t.get("received", 0) > 0 and not pd.isna(row["received"]) and float(row["received"]) > 0)
-                        is_paid_match = (t.get("paid", 0) > 0 and not pd.isna(row["paid"]) and float(row["paid"]) > 0)
-                        
-                        if is_receive_match or is_paid_match:
-                            orig_transaction = t
-                            break
-            
-            # Process the transaction (either update existing or create new)
-            if orig_transaction:
-                # Determine if the transaction is received or paid in the edited version
-                is_received = not pd.isna(row["received"]) and float(row["received"]) > 0
-                
-                # Get the new amount
-                amount = float(row["received"]) if is_received else float(row["paid"])
-                
-                # Update interest rate if edited, otherwise keep the original
-                if 'interest_rate' in row and not pd.isna(row['interest_rate']):
-                    interest_rate = float(row['interest_rate'])
-                else:
-                    interest_rate = float(orig_transaction.get("interest_rate", 0.0))
-                
-                calendar_type = orig_transaction.get("calendar_type", "Financial")
-                days = int(orig_transaction.get("days", 0))
-                
-                # Always recalculate interest based on the new amount using existing rate
-                transaction_amount = amount if is_received else -amount
-                
-                if calendar_type == "Diwali":
-                    interest = interest_service.calculate_interest(abs(transaction_amount), interest_rate, days, "Diwali")
-                    if not is_received:  # If paid
-                        interest = -interest
-                else:  # Financial
-                    interest = interest_service.calculate_interest(abs(transaction_amount), interest_rate, days, "Financial")
-                    if not is_received:  # If paid
-                        interest = -interest
-                
-                # Only use the interest from the data editor if it was explicitly modified
-                # Otherwise use our calculated interest
-                if 'interest' in row and not pd.isna(row['interest']) and abs(float(row['interest']) - float(orig_transaction.get('interest', 0))) > 0.01:
-                    # User manually changed the interest, keep their value
-                    interest = float(row["interest"])
-                
-                # Update the transaction
-                updated_transaction = orig_transaction.copy()
-                updated_transaction.update({
-                    "date": pd.to_datetime(row["date"]).strftime("%Y-%m-%d"),
-                    "received": float(row["received"]) if is_received else 0.0,
-                    "paid": float(row["paid"]) if not is_received else 0.0,
-                    "amount_in_words": num_to_words_rupees(amount),
-                    "interest_rate": interest_rate,  # Keep original interest rate
-                    "calendar_type": calendar_type,  # Keep original calendar type
-                    "days": days,  # Keep original days
-                    "interest": round(float(interest), 2),  # Recalculated interest
-                    "notes": row["notes"] if "notes" in row and row["notes"] else orig_transaction.get("notes", ""),
-                })
-                
-                updated_transactions.append(updated_transaction)
-            else:
-                # This is a new transaction
-                client_id = next(c["id"] for c in clients_data["clients"] if c["name"] == row["client"])
-                
-                # For new transactions, we need to determine a default calendar type based on interest
-                # If interest is explicitly set, determine calendar type based on provided values
-                is_received = not pd.isna(row["received"]) and float(row["received"]) > 0
-                amount = float(row["received"]) if is_received else float(row["paid"])
-                interest = float(row["interest"]) if not pd.isna(row["interest"]) else 0.0
-                
-                # Use interest rate from input or a sensible default based on other transactions
-                # Try to find an appropriate default interest rate
-                default_rate = 0.0
-                if len(transactions_data["transactions"]) > 0:
-                    # Use the most recent transaction's interest rate as default
-                    sorted_transactions = sorted(
-                        transactions_data["transactions"], 
-                        key=lambda t: datetime.strptime(t.get("date", "1900-01-01"), "%Y-%m-%d"),
-                        reverse=True
-                    )
-                    if sorted_transactions:
-                        default_rate = float(sorted_transactions[0].get("interest_rate", 0.0))
-                
-                # If we couldn't find a default from existing transactions, use 0.0
-                if default_rate == 0.0:
-                    default_rate = 0.0  # Remove the hardcoded 5.0
-                
-                interest_rate = float(row["interest_rate"]) if "interest_rate" in row and not pd.isna(row["interest_rate"]) else default_rate
-                days = 0  # Default days
-                
-                # If we have a date, try to get the days value
-                date_str = pd.to_datetime(row["date"]).strftime("%Y-%m-%d")
-                diwali_days, financial_days = interest_service.get_interest_value(date_str)
-                
-                if calendar_type == "Financial" and financial_days is not None:
-                    days = int(financial_days)
-                
-                # If interest wasn't explicitly provided, calculate it
-                if interest == 0.0 and amount > 0:
-                    if calendar_type == "Financial":
-                        interest = interest_service.calculate_interest(amount, interest_rate, days, "Financial")
-                        if not is_received:
-                            interest = -interest
-                
-                new_transaction = {
-                    "id": next_id,
-                    "client_id": client_id,
-                    "date": date_str,
-                    "received": float(row["received"]) if is_received else 0.0,
-                    "paid": float(row["paid"]) if not is_received else 0.0,
-                    "amount_in_words": num_to_words_rupees(amount),
-                    "interest_rate": interest_rate,
-                    "calendar_type": calendar_type,
-                    "days": days,
-                    "interest": round(float(interest), 2),
-                    "notes": row["notes"] if "notes" in row else "",
-                    "timestamp": datetime.now().isoformat()
-                }
-                updated_transactions.append(new_transaction)
-                next_id += 1
-        
-        # Save the updated transactions
-        transactions_data["transactions"] = updated_transactions
-        save_transactions(transactions_data)
-        st.success("Transactions updated successfully!")
-        st.rerun()
+    # Apply only the rows the editor reports as edited, added or deleted
+    editor_state = st.session_state.get(editor_key, {})
+    if editor_state.get("edited_rows") or editor_state.get("added_rows") or editor_state.get("deleted_rows"):
+        changed = apply_transaction_editor_changes(
+            editor_state,
+            display_df['id'].tolist(),
+            ledger,
+            interest_service
+        )
+        if changed is None:
+            st.info("Enter a client, a date and an amount for each new row to save your changes.")
+        else:
+            # Start the next run with a fresh editor so the same changes are not applied twice
+            st.session_state.transaction_editor_version += 1
+            if changed:
+                st.success("Transactions updated successfully!")
+            st.rerun()
 
 def confirm_transaction_screen(client_name, transaction_data, back_callback=None):
     """Display the transaction confirmation screen."""
@@ -1623,6 +1536,9 @@ def confirm_transaction_screen(client_name, transaction_data, back_callback=None
 
 def display_transaction_details(transaction, client_name):
     """Display detailed information about a transaction."""
+    # Transactions read from the columnar file leave the words to be derived
+    amount_in_words = transaction['amount_in_words'] if 'amount_in_words' in transaction else get_amount_in_words(transaction)
+    
     # Create a styled container for the transaction details with additional background styling
     transaction_html = f"""
     <div style="background-color:#121212; padding:1.5rem; border-radius:0.8rem; margin-bottom:1.5rem; box-shadow:0 4px 8px rgba(0,0,0,0.2); position:relative;">
@@ -1686,9 +1602,9 @@ def display_transaction_details(transaction, client_name):
         {f'''
         <div style="margin-top: 15px; padding-top: 15px; border-top: 1px solid #2a2a2a;">
             <p style="color: #a0a0a0; margin-bottom: 5px; font-size: 0.9rem;">Amount in Words</p>
-            <p style="color: #e0e0e0; margin-top: 0; font-style: italic;">{transaction.get('amount_in_words', '')}</p>
+            <p style="color: #e0e0e0; margin-top: 0; font-style: italic;">{amount_in_words}</p>
         </div>
-        ''' if transaction.get('amount_in_words') else ''}
+        ''' if amount_in_words else ''}
     </div>
     """
     
@@ -1870,6 +1786,8 @@ def display_transaction_details(transaction, client_name):
 
 def transaction_receipt(transaction, client_name):
     """Display a transaction receipt that can be printed or saved."""
+    amount_in_words = transaction['amount_in_words'] if 'amount_in_words' in transaction else get_amount_in_words(transaction)
+    
     colored_header(
         label="Transaction Receipt",
         description="Transaction has been successfully recorded",
@@ -1962,9 +1880,9 @@ def transaction_receipt(transaction, client_name):
         {f'''
         <div style="margin-top:1.5rem; padding-top:1.5rem; border-top:1px solid #e2e8f0;">
             <p style="color:#64748b; margin-bottom:0.25rem; font-size:0.875rem;">Amount in Words</p>
-            <p style="color:#0f172a; margin-top:0; font-style:italic;">{transaction.get('amount_in_words', '')}</p>
+            <p style="color:#0f172a; margin-top:0; font-style:italic;">{amount_in_words}</p>
         </div>
-        ''' if transaction.get('amount_in_words') else ''}
+        ''' if amount_in_words else ''}
         
         <div style="text-align:center; margin-top:3rem; padding-top:1.5rem; border-top:1px dashed #e2e8f0;">
             <p style="color:#64748b; margin:0; font-size:0.875rem;">This is a system-generated receipt.</p>
@@ -2012,22 +1930,9 @@ def create_printable_html(df, client_map, total_received, total_paid, total_inte
     if 'client' not in print_df.columns and 'client_id' in print_df.columns:
         print_df['client'] = print_df['client_id'].map(client_map)
     
-    # Ensure date is in datetime format and sort chronologically
-    if 'date' in print_df.columns:
-        print_df['date'] = pd.to_datetime(print_df['date'])
-        print_df = print_df.sort_values('date')
-        
-    # Calculate running balance across all transactions chronologically
-    print_df['running_balance'] = 0.0
-    balance = 0.0
-    
-    # Loop through the sorted dataframe to calculate running balance
-    for idx, row in print_df.iterrows():
-        received = row['received'] if not pd.isna(row['received']) else 0
-        paid = row['paid'] if not pd.isna(row['paid']) else 0
-        # Exclude interest from running balance calculation
-        balance += received - paid
-        print_df.loc[idx, 'running_balance'] = balance
+    # Sort chronologically and calculate running balance across all transactions,
+    # excluding interest from the running balance
+    print_df = calculate_running_balance(print_df, include_interest=False)
     
     # Format date after calculations
     print_df['date'] = print_df['date'].dt.strftime('%d %b %Y')
@@ -2430,101 +2335,162 @@ def create_printable_html(df, client_map, total_received, total_paid, total_inte
     
     return html
 
-def export_to_excel(df, filename="transactions_export.xlsx"):
+# Exports with more rows than this are offered as CSV instead of Excel
+EXCEL_EXPORT_MAX_ROWS = 50000
+
+# Number of values per column sampled when sizing the Excel columns
+EXCEL_WIDTH_SAMPLE_SIZE = 1000
+
+EXPORT_MONEY_COLUMNS = ['received', 'paid', 'interest', 'running_balance']
+
+def prepare_export_frame(df):
+    """
+    Prepare a transactions DataFrame for export: dates as DD-MM-YYYY strings,
+    amounts in words filled in where missing and the timestamp column dropped.
+    
+    Args:
+        df: DataFrame with transaction data
+        
+    Returns:
+        DataFrame: A copy ready to be written out
+    """
+    export_df = df.drop(columns=['timestamp'], errors='ignore').copy()
+    
+    # Spell out the amounts of rows saved without words, all in one batch
+    if 'amount_in_words' in export_df.columns and {'received', 'paid'} <= set(export_df.columns):
+        missing = export_df['amount_in_words'].fillna('').astype(str).str.strip() == ''
+        if missing.any():
+            rows = export_df.loc[missing]
+            received = rows['received'].fillna(0)
+            amounts = received.where(received > 0, rows['paid'].fillna(0).clip(lower=0))
+            export_df.loc[missing, 'amount_in_words'] = num_to_words_rupees_batch(amounts)
+    
+    # Format date column if present
+    if 'date' in export_df.columns and not export_df['date'].empty:
+        export_df['date'] = pd.to_datetime(export_df['date']).dt.strftime('%d-%m-%Y')
+    
+    return export_df
+
+def sample_column_width(series, header, sample_size=EXCEL_WIDTH_SAMPLE_SIZE):
+    """
+    Estimate a column width from an evenly spaced sample of its values.
+    
+    Args:
+        series: Column values
+        header: Column header
+        sample_size: Maximum number of values to look at
+        
+    Returns:
+        int: Column width in characters
+    """
+    step = max(1, len(series) // sample_size)
+    sample = series.iloc[::step]
+    longest = sample.astype(str).str.len().max() if not sample.empty else 0
+    return int(max(longest if pd.notna(longest) else 0, len(str(header)))) + 2
+
+def export_to_excel(df, filename="transactions_export.xlsx", output=None):
     """
     Export a DataFrame to an Excel file for download
     
+    Rows are written one at a time in xlsxwriter's constant_memory mode, with the
+    cell formats set once per column, so memory use stays flat for large exports.
+    
     Args:
         df: DataFrame with transaction data
         filename: Name of the Excel file to create
+        output: Path or binary file object to write to; defaults to an in-memory buffer
         
     Returns:
-        BytesIO: Excel file as bytes for download
+        BytesIO: Excel file as bytes for download, or the given output
     """
-    output = BytesIO()
-    
-    # Create Excel writer
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        # Convert all columns to appropriate types
-        export_df = df.copy()
-        
-        # Format date column if present
-        if 'date' in export_df.columns and not export_df['date'].empty:
-            if isinstance(export_df['date'].iloc[0], str):
-                export_df['date'] = pd.to_datetime(export_df['date'])
-            export_df['date'] = export_df['date'].dt.strftime('%d-%m-%Y')
-            
-        # Remove any object columns that might cause issues
-        cols_to_keep = [col for col in export_df.columns if col not in ['timestamp']]
-        export_df = export_df[cols_to_keep]
-        
-        # Write the dataframe to Excel
-        export_df.to_excel(writer, sheet_name='Transactions', index=False)
-        
-        # Get the worksheet to apply formatting
-        workbook = writer.book
-        worksheet = writer.sheets['Transactions']
-        
-        # Define formats
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#f2f2f2',
-            'border': 1,
-            'font_size': 12
-        })
-        
-        cell_format = workbook.add_format({
-            'border': 1,
-            'font_size': 11
-        })
-        
-        number_format = workbook.add_format({
-            'border': 1,
-            'font_size': 11,
-            'num_format': '₹#,##0.00'
-        })
-        
-        percentage_format = workbook.add_format({
-            'border': 1,
-            'font_size': 11,
-            'num_format': '0.00%'
-        })
-        
-        date_format = workbook.add_format({
-            'border': 1,
-            'font_size': 11,
-            'num_format': 'dd-mm-yyyy'
-        })
-        
-        # Set column widths
-        for i, col in enumerate(export_df.columns):
-            max_len = max(
-                export_df[col].astype(str).map(len).max(),
-                len(str(col))
-            ) + 2
-            worksheet.set_column(i, i, max_len)
-        
-        # Apply formats to header and all cells
-        for col_num, value in enumerate(export_df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-        
-        # Apply number format to numeric columns
-        for row_num in range(1, len(export_df) + 1):
-            for col_num, col in enumerate(export_df.columns):
-                cell_value = export_df.iloc[row_num-1, col_num]
-                
-                if col in ['received', 'paid', 'interest', 'running_balance']:
-                    worksheet.write(row_num, col_num, cell_value if not pd.isna(cell_value) else 0, number_format)
-                elif col == 'interest_rate':
-                    # Convert percentage value to decimal for Excel's percentage format
-                    rate_value = cell_value if not pd.isna(cell_value) else 0
-                    worksheet.write(row_num, col_num, rate_value / 100, percentage_format)
-                elif col == 'date':
-                    worksheet.write(row_num, col_num, cell_value, date_format)
-                else:
-                    worksheet.write(row_num, col_num, cell_value if not pd.isna(cell_value) else "", cell_format)
-    
-    # Reset pointer to the start
-    output.seek(0)
-    
-    return output
+    import xlsxwriter
+    
+    export_df = prepare_export_frame(df)
+    columns = list(export_df.columns)
+    
+    # Column widths come from the values as they appear before number conversion
+    widths = [sample_column_width(export_df[col], col) for col in columns]
+    
+    # Convert whole columns to the values written to the cells
+    cell_values = {}
+    for col in columns:
+        if col in EXPORT_MONEY_COLUMNS:
+            cell_values[col] = export_df[col].fillna(0)
+        elif col == 'interest_rate':
+            # Convert percentage value to decimal for Excel's percentage format
+            cell_values[col] = export_df[col].fillna(0) / 100
+        else:
+            cell_values[col] = export_df[col].astype(object).where(export_df[col].notna(), "")
+    rows = pd.DataFrame(cell_values, columns=columns).itertuples(index=False, name=None)
+    
+    target = output if output is not None else BytesIO()
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True, 'nan_inf_to_errors': True})
+    worksheet = workbook.add_worksheet('Transactions')
+    
+    # Define formats
+    header_format = workbook.add_format({
+        'bold': True,
+        'bg_color': '#f2f2f2',
+        'border': 1,
+        'font_size': 12
+    })
+    
+    cell_format = workbook.add_format({
+        'border': 1,
+        'font_size': 11
+    })
+    
+    number_format = workbook.add_format({
+        'border': 1,
+        'font_size': 11,
+        'num_format': '₹#,##0.00'
+    })
+    
+    percentage_format = workbook.add_format({
+        'border': 1,
+        'font_size': 11,
+        'num_format': '0.00%'
+    })
+    
+    date_format = workbook.add_format({
+        'border': 1,
+        'font_size': 11,
+        'num_format': 'dd-mm-yyyy'
+    })
+    
+    # Set column widths and formats; cells written without a format use the column's
+    for i, col in enumerate(columns):
+        if col in EXPORT_MONEY_COLUMNS:
+            column_format = number_format
+        elif col == 'interest_rate':
+            column_format = percentage_format
+        elif col == 'date':
+            column_format = date_format
+        else:
+            column_format = cell_format
+        worksheet.set_column(i, i, widths[i], column_format)
+    
+    worksheet.write_row(0, 0, columns, header_format)
+    for row_num, row in enumerate(rows, start=1):
+        worksheet.write_row(row_num, 0, row)
+    
+    workbook.close()
+    
+    if output is None:
+        # Reset pointer to the start
+        target.seek(0)
+    
+    return target
+
+def export_to_csv(df):
+    """
+    Export a DataFrame to CSV for download; used for exports too large for Excel.
+    
+    Args:
+        df: DataFrame with transaction data
+        
+    Returns:
+        bytes: CSV file contents
+    """
+    # utf-8-sig so Excel opens the file with the right encoding
+    return prepare_export_frame(df).to_csv(index=False).encode('utf-8-sig')
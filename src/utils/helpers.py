@@ -1,11 +1,12 @@
-import streamlit as st
 import base64
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
+from .styles import register_style
 
-def load_custom_css():
-    """Apply custom CSS styling to the Streamlit app with light theme."""
-    st.markdown("""
+# Light theme styling shared by every page
+register_style("base", """
     <style>
     /* Import Geist Mono font */
     @import url('https://fonts.googleapis.com/css2?family=Geist+Mono:wght@300;400;500;600;700&display=swap');
@@ -680,7 +681,116 @@ def load_custom_css():
         color: var(--error-color) !important;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
+
+# Tab styling shared by the clients and transactions pages
+register_style("tabs", """
+    <style>
+    /* Fix for duplicate highlight bars - explicitly target and hide all */
+    .stTabs [data-baseweb="tab-highlight"] {
+        display: none !important;
+    }
+    
+    /* Add a custom border-bottom to the selected tab to replace the highlight */
+    .stTabs [data-baseweb="tab"][aria-selected="true"] {
+        background-color: #ffffff !important;
+        color: #4b6bfb !important;
+        font-weight: 700 !important; /* Increased weight for selected tab */
+        border-bottom: 3px solid #4b6bfb !important; /* Blue highlight */
+        box-shadow: 0 -10px 20px rgba(75, 107, 251, 0.1) !important;
+        transition: all 0.3s ease !important;
+    }
+    
+    /* Style for all tabs to make them more visible */
+    .stTabs [data-baseweb="tab"] {
+        padding: 10px 20px !important;
+        border-radius: 5px 5px 0 0 !important;
+        margin-right: 5px !important;
+        border: 1px solid rgba(75, 107, 251, 0.1) !important;
+        border-bottom: none !important;
+        background-color: #f5f7fa !important;
+        transition: all 0.2s ease !important;
+        font-weight: 600 !important; /* Make all tab text bold */
+        font-size: 1.05rem !important; /* Slightly larger font size */
+        color: #485b73 !important;
+    }
+    
+    /* More specific rules for the tab text to ensure it's bold */
+    .stTabs [data-baseweb="tab"] div[data-testid="stMarkdownContainer"] p,
+    .stTabs [data-baseweb="tab"] div,
+    .stTabs [data-baseweb="tab"] span {
+        font-weight: 700 !important; /* Definitely bold */
+        font-family: 'Geist Mono', monospace !important; /* Consistent font */
+    }
+    
+    /* Explicitly target the text elements inside tabs */
+    .stTabs button[role="tab"] span,
+    .stTabs button[role="tab"] p {
+        font-weight: 800 !important; /* Extra bold */
+        letter-spacing: 0.02em !important; /* Slightly increase letter spacing */
+        color: inherit !important;
+    }
+    
+    /* Hover effect for tabs */
+    .stTabs [data-baseweb="tab"]:hover:not([aria-selected="true"]) {
+        background-color: #ffffff !important;
+        color: #3a5ae8 !important;
+        border-bottom: 1px solid rgba(75, 107, 251, 0.3) !important;
+    }
+    
+    /* Ensure no extra borders around tabs */
+    .stTabs [data-baseweb="tab-list"] {
+        border-bottom: 1px solid #e0e6ef !important;
+        padding-bottom: 0 !important;
+        margin-bottom: 20px !important;
+    }
+    
+    /* Add a subtle glow to active tab */
+    .stTabs [data-baseweb="tab"][aria-selected="true"]::after {
+        content: "";
+        position: absolute;
+        bottom: -3px;
+        left: 0;
+        right: 0;
+        height: 3px;
+        background: linear-gradient(90deg, rgba(75, 107, 251, 0.3), rgba(75, 107, 251, 0.8), rgba(75, 107, 251, 0.3));
+        border-radius: 3px;
+    }
+    
+    /* Transaction table styles */
+    div.transaction-table table {
+        background-color: #ffffff !important;
+        border-radius: 0.8rem !important;
+        overflow: hidden !important;
+        border-collapse: separate !important;
+        border-spacing: 0 !important;
+        box-shadow: 0 4px 12px rgba(58, 90, 232, 0.08) !important;
+    }
+    
+    div.transaction-table th {
+        background-color: #f5f7fa !important;
+        color: #2c3e50 !important;
+        font-weight: 700 !important;
+        border-bottom: 2px solid #e0e6ef !important;
+        padding: 12px 16px !important;
+    }
+    
+    div.transaction-table td {
+        padding: 12px 16px !important;
+        border-bottom: 1px solid #e0e6ef !important;
+        color: #2c3e50 !important;
+        font-weight: 500 !important;
+    }
+    
+    div.transaction-table tr:nth-child(even) {
+        background-color: #f8f9fb !important;
+    }
+    
+    div.transaction-table tr:hover {
+        background-color: rgba(75, 107, 251, 0.05) !important;
+    }
+    </style>
+    """, pages=["clients", "transactions"])
 
 def img_to_base64(img_path):
     """Convert an image file to base64 encoding."""
@@ -768,9 +878,53 @@ def sanitize_html(html_content, is_html=False):
         html_content = re.sub(r'>\s+<', '><', html_content.strip())
         return html_content
 
+_UNITS = ['', 'One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten',
+          'Eleven', 'Twelve', 'Thirteen', 'Fourteen', 'Fifteen', 'Sixteen', 'Seventeen', 'Eighteen', 'Nineteen']
+_TENS = ['', '', 'Twenty', 'Thirty', 'Forty', 'Fifty', 'Sixty', 'Seventy', 'Eighty', 'Ninety']
+
+def _below_thousand_words(n):
+    """Words for 0-999, used to build the lookup table."""
+    if n < 20:
+        return _UNITS[n]
+    elif n < 100:
+        return _TENS[n // 10] + (' ' + _UNITS[n % 10] if n % 10 != 0 else '')
+    else:
+        return _UNITS[n // 100] + ' Hundred' + (' and ' + _below_thousand_words(n % 100) if n % 100 != 0 else '')
+
+# Words for every number below a thousand, so larger numbers only split into groups
+_BELOW_THOUSAND_WORDS = [_below_thousand_words(n) for n in range(1000)]
+
+def _integer_words(n):
+    """Words for a whole number in the Indian system of thousands, lakhs and crores."""
+    if n < 1000:
+        return _BELOW_THOUSAND_WORDS[n]
+    elif n < 100000:
+        return _BELOW_THOUSAND_WORDS[n // 1000] + ' Thousand' + (' ' + _BELOW_THOUSAND_WORDS[n % 1000] if n % 1000 != 0 else '')
+    elif n < 10000000:
+        return _BELOW_THOUSAND_WORDS[n // 100000] + ' Lakh' + (' ' + _integer_words(n % 100000) if n % 100000 != 0 else '')
+    else:
+        return _integer_words(n // 10000000) + ' Crore' + (' ' + _integer_words(n % 10000000) if n % 10000000 != 0 else '')
+
+@lru_cache(maxsize=8192)
+def _rupees_paise_words(rupees, paise):
+    """Words for an amount split into whole rupees and paise."""
+    rupees_text = _integer_words(rupees) + " Rupees" if rupees > 0 else ""
+    paise_text = _integer_words(paise) + " Paise" if paise > 0 else ""
+    
+    # Combine rupees and paise
+    if rupees > 0 and paise > 0:
+        return f"{rupees_text} and {paise_text} Only"
+    elif rupees > 0:
+        return f"{rupees_text} Only"
+    elif paise > 0:
+        return f"{paise_text} Only"
+    else:
+        return "Zero Rupees Only"
+
 def num_to_words_rupees(number):
     """
     Convert a number to words in Indian currency format (Rupees).
+    Results are cached by rupees and paise, so repeated amounts are only spelled out once.
     
     Args:
         number (float): The amount to convert to words
@@ -778,24 +932,6 @@ def num_to_words_rupees(number):
     Returns:
         str: The amount in words with "Rupees" and "Paise" labels
     """
-    def get_words(n):
-        units = ['', 'One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten', 
-                'Eleven', 'Twelve', 'Thirteen', 'Fourteen', 'Fifteen', 'Sixteen', 'Seventeen', 'Eighteen', 'Nineteen']
-        tens = ['', '', 'Twenty', 'Thirty', 'Forty', 'Fifty', 'Sixty', 'Seventy', 'Eighty', 'Ninety']
-        
-        if n < 20:
-            return units[n]
-        elif n < 100:
-            return tens[n // 10] + (' ' + units[n % 10] if n % 10 != 0 else '')
-        elif n < 1000:
-            return units[n // 100] + ' Hundred' + (' and ' + get_words(n % 100) if n % 100 != 0 else '')
-        elif n < 100000:
-            return get_words(n // 1000) + ' Thousand' + (' ' + get_words(n % 1000) if n % 1000 != 0 else '')
-        elif n < 10000000:
-            return get_words(n // 100000) + ' Lakh' + (' ' + get_words(n % 100000) if n % 100000 != 0 else '')
-        else:
-            return get_words(n // 10000000) + ' Crore' + (' ' + get_words(n % 10000000) if n % 10000000 != 0 else '')
-    
     # Handle negative numbers
     if number < 0:
         return "Minus " + num_to_words_rupees(abs(number))
@@ -804,18 +940,37 @@ def num_to_words_rupees(number):
     rupees = int(number)
     paise = int(round((number - rupees) * 100))
     
-    rupees_text = get_words(rupees) + " Rupees" if rupees > 0 else ""
-    paise_text = get_words(paise) + " Paise" if paise > 0 else ""
+    return _rupees_paise_words(rupees, paise)
+
+def num_to_words_rupees_batch(amounts):
+    """
+    Convert a whole column of amounts to words at once, e.g. for imports and exports.
+    The amounts are split into rupees and paise with array operations and each
+    distinct amount is spelled out once.
     
-    # Combine rupees and paise
-    if rupees > 0 and paise > 0:
-        return f"{rupees_text} and {paise_text} Only"
-    elif rupees > 0:
-        return f"{rupees_text} Only"
-    elif paise > 0:
-        return f"{paise_text} Only"
-    else:
-        return "Zero Rupees Only"
+    Args:
+        amounts: Sequence, Series or array of amounts
+        
+    Returns:
+        list: The amounts in words, in the same order, with "" for missing amounts
+    """
+    values = np.asarray(amounts, dtype=float)
+    missing = np.isnan(values)
+    negative = values < 0
+    
+    # The same split as num_to_words_rupees: truncate to rupees, round the rest to paise
+    magnitude = np.abs(np.where(missing, 0.0, values))
+    rupees = np.trunc(magnitude)
+    paise = np.rint((magnitude - rupees) * 100)
+    
+    # Paise can round up to 100, so pack the pair with a factor of 101 to keep it unique
+    codes, unique_keys = pd.factorize(rupees * 101 + paise)
+    unique_words = [_rupees_paise_words(*divmod(int(key), 101)) for key in unique_keys.tolist()]
+    
+    return [
+        "" if is_missing else ("Minus " + unique_words[code] if is_negative else unique_words[code])
+        for code, is_missing, is_negative in zip(codes.tolist(), missing.tolist(), negative.tolist())
+    ]
 
 def render_html_safely(html_content):
     """
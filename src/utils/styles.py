@@ -0,0 +1,176 @@
+"""
+Stylesheet management for the Interest Calendar Ledger application.
+Modules register their CSS fragments once, when they are imported. Each
+fragment is cleaned up and scoped once per process. apply_styles() adds the
+fragments to the page's <head> until the browser reports them present, so
+reruns after that send no CSS to the browser.
+"""
+
+import re
+import hashlib
+import threading
+import streamlit as st
+
+# Registered fragments: name -> (stylesheet text, digest), in registration order
+_fragments = {}
+_fragments_lock = threading.Lock()
+
+# Session state key holding the digests of the fragments the browser reports present
+_APPLIED_KEY = "_applied_styles"
+
+# Key of the component that adds the fragments to the page
+_LOADER_KEY = "_style_loader"
+
+# Writes each fragment sent into a <style> element in the page's <head>, then
+# reports every fragment the <head> holds with its digest
+_LOADER_JS = """
+export default function(component) {
+    const { data, setTriggerValue } = component;
+    for (const [name, fragment] of Object.entries(data || {})) {
+        const id = `ledger-style-${name}`;
+        let style = document.getElementById(id);
+        if (!style) {
+            style = document.createElement("style");
+            style.id = id;
+            document.head.appendChild(style);
+        }
+        style.textContent = fragment.css;
+        style.dataset.digest = fragment.digest;
+    }
+    const present = {};
+    for (const style of document.head.querySelectorAll("style[id^='ledger-style-']")) {
+        present[style.id.slice("ledger-style-".length)] = style.dataset.digest;
+    }
+    setTriggerValue("applied", present);
+}
+"""
+
+_STYLE_TAG = re.compile(r"</?style[^>]*>", re.IGNORECASE)
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+_AROUND_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+
+
+def page_key(page):
+    """
+    Get the container key the app renders a page's content under.
+
+    Streamlit gives a keyed container the CSS class 'st-key-<key>', which
+    fragments scoped to the page use as the ancestor of their selectors.
+
+    Args:
+        page: Page name, e.g. 'transactions'
+
+    Returns:
+        str: The container key
+    """
+    return f"page-{page}"
+
+
+def _minify(css):
+    """Strip style tags, comments and surplus whitespace from CSS."""
+    css = _COMMENT.sub("", _STYLE_TAG.sub("", css))
+    css = _AROUND_PUNCTUATION.sub(r"\1", _WHITESPACE.sub(" ", css))
+    return css.replace(";}", "}").strip()
+
+
+def _scope_selectors(selectors, prefixes):
+    """Put every selector of a rule under each of the prefixes."""
+    return ",".join(f"{prefix} {selector}" for prefix in prefixes for selector in selectors.split(","))
+
+
+def _scope(css, prefixes):
+    """
+    Restrict minified CSS to elements under the given ancestor selectors.
+
+    Rules inside @media and @supports blocks are scoped as well; other at-rules
+    such as @import, @font-face and @keyframes are left as they are.
+    """
+    scoped = []
+    position = 0
+    while position < len(css):
+        brace = css.find("{", position)
+        semicolon = css.find(";", position)
+        if brace == -1:
+            scoped.append(css[position:])
+            break
+        if css.startswith("@", position) and semicolon != -1 and semicolon < brace:
+            # A statement at-rule such as @import
+            scoped.append(css[position:semicolon + 1])
+            position = semicolon + 1
+            continue
+
+        # Find the end of this block, allowing for nested blocks
+        depth = 0
+        end = brace
+        while end < len(css):
+            if css[end] == "{":
+                depth += 1
+            elif css[end] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+            end += 1
+
+        head, body = css[position:brace], css[brace + 1:end]
+        if head.startswith(("@media", "@supports")):
+            scoped.append(f"{head}{{{_scope(body, prefixes)}}}")
+        elif head.startswith("@"):
+            scoped.append(f"{head}{{{body}}}")
+        else:
+            scoped.append(f"{_scope_selectors(head, prefixes)}{{{body}}}")
+        position = end + 1
+    return "".join(scoped)
+
+
+def register_style(name, css, pages=None):
+    """
+    Register a CSS fragment for the app.
+
+    Registering the same name again replaces the fragment. Sessions that
+    already have the old fragment get the new one at their next apply_styles().
+
+    Args:
+        name: Unique name of the fragment, e.g. 'transaction_table'
+        css: The CSS, with or without surrounding <style> tags
+        pages: Page name or list of page names to limit the fragment to, or
+            None to apply it on every page
+    """
+    stylesheet = _minify(css)
+    if pages is not None:
+        pages = [pages] if isinstance(pages, str) else pages
+        stylesheet = _scope(stylesheet, [f".st-key-{page_key(page)}" for page in pages])
+
+    digest = hashlib.sha1(stylesheet.encode("utf-8")).hexdigest()
+    with _fragments_lock:
+        _fragments[name] = (stylesheet, digest)
+
+
+def _record_applied():
+    """Remember the fragments the browser reported present in the page."""
+    reported = st.session_state[_LOADER_KEY].get("applied") or {}
+    st.session_state[_APPLIED_KEY] = dict(reported)
+
+
+def apply_styles():
+    """
+    Add the registered fragments the browser hasn't reported yet to the page.
+
+    The fragments go into <style> elements in the page's <head>, which stay in
+    place across reruns. The page reports back which fragments it holds, which
+    reruns the app once; a fragment is sent again on every rerun until it is
+    reported, so a rerun with nothing new registered sends nothing.
+
+    Call it once per run, after the page is rendered, so the fragments its
+    modules register are included; put it in a placeholder at the top of the
+    page to keep it out of the layout.
+    """
+    applied = st.session_state.setdefault(_APPLIED_KEY, {})
+    with _fragments_lock:
+        pending = {name: {"css": css, "digest": digest} for name, (css, digest) in _fragments.items()
+                   if applied.get(name) != digest}
+    if pending:
+        # Registered with the running server on every call, as components are
+        # per server; registering it again only replaces the same definition
+        style_loader = st.components.v2.component("ledger_style_loader", js=_LOADER_JS)
+        style_loader(key=_LOADER_KEY, data=pending, on_applied_change=_record_applied)
@@ -28,6 +28,15 @@ hiddenimports += [
     'xlsxwriter'
 ]
 
+# Page modules are imported by src/app.py on first navigation, out of sight of the analysis
+hiddenimports += [
+    'src.ui.dashboard',
+    'src.ui.client_view',
+    'src.ui.transaction_view',
+    'src.ui.calendar_view',
+    'src.ui.report_view'
+]
+
 # Collect all Streamlit files
 streamlit_a, streamlit_b, streamlit_c = collect_all('streamlit')
 datas += streamlit_a